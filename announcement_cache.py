@@ -0,0 +1,115 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+DEFAULT_AUDIO_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".meeting_timer", "audio")
+
+
+class AnnouncementCache:
+    """磁盘上的预渲染播报音频缓存，按总大小做 LRU 淘汰
+
+    文件名由文本、语音、语速和音量的哈希决定；最近使用顺序保存在内存中，
+    并通过文件修改时间持久化，下次启动时按修改时间恢复。
+    """
+
+    def __init__(self, directory: str = DEFAULT_AUDIO_CACHE_DIR, max_bytes: int = 50 * 1024 * 1024,
+                 extension: str = ".wav"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()    # 键 -> 文件大小，越靠后越近使用
+        self._total = 0
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def make_key(text: str, voice: Optional[str], rate, volume) -> str:
+        """由播报文本和语音参数生成缓存键"""
+        raw = "\x1f".join((text, str(voice), str(rate), str(volume)))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.extension)
+
+    def temp_path(self, key: str) -> str:
+        """渲染用的临时文件路径，渲染完成后通过 put 放入缓存"""
+        return os.path.join(self.directory, key + ".tmp" + self.extension)
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: str) -> Optional[str]:
+        """查找缓存的音频文件，命中时更新最近使用顺序"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except OSError:
+            # 文件被外部删除
+            with self._lock:
+                self._total -= self._entries.pop(key, 0)
+            return None
+        return path
+
+    def put(self, key: str, rendered_path: str):
+        """把渲染好的文件放入缓存并按需淘汰最久未用的文件"""
+        try:
+            size = os.path.getsize(rendered_path)
+        except OSError:
+            return
+        if size == 0:
+            os.remove(rendered_path)
+            return
+        os.replace(rendered_path, self.path_for(key))
+        with self._lock:
+            self._total -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._total += size
+            evicted = []
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                old_key, old_size = self._entries.popitem(last=False)
+                self._total -= old_size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self.path_for(old_key))
+            except OSError as e:
+                logging.warning(f"播报缓存淘汰失败: {e}")
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total
+
+    def _load(self):
+        """按修改时间恢复已有缓存文件的最近使用顺序，清理残留的临时文件"""
+        files = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(".tmp" + self.extension):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            if not name.endswith(self.extension):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, name[:-len(self.extension)], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total += size
@@ -0,0 +1,247 @@
+import asyncio
+import inspect
+import math
+from typing import Optional
+from task_list import TaskList
+from voice_service import MEETING_END_MESSAGE, TASK_BOUNDARY_KEY, VoiceService
+
+
+class AsyncCountdownTimer:
+    """CountdownTimer 的 asyncio 版本
+
+    所有状态只在事件循环线程中修改，不需要锁，也不占用额外线程；
+    可以和其他 I/O 一起嵌入 asyncio 服务。回调既可以是普通函数，
+    也可以是协程函数（会被 await）。
+    """
+
+    def __init__(self, task_list: TaskList, voice_service: Optional[VoiceService] = None):
+        self.task_list = task_list
+        self.voice_service = voice_service
+        self.current_task_index = 0
+        self.is_running = False
+        self.is_paused = False
+        self._deadline = None            # 当前任务的截止时刻（事件循环时钟）
+        self._paused_remaining = 0.0
+        self._elapsed_base = 0.0
+        self._segment_start = None
+        self._skip_requested = False
+        self._wakeup = None              # 倒计时等待中的 Future，命令到达时完成
+        self._runner = None              # 运行会议的 asyncio.Task
+
+    @staticmethod
+    def _now() -> float:
+        return asyncio.get_running_loop().time()
+
+    @property
+    def remaining_time(self) -> int:
+        """当前任务剩余秒数（向上取整）"""
+        if self._deadline is None:
+            return 0
+        if self.is_paused:
+            return math.ceil(self._paused_remaining)
+        return math.ceil(max(0.0, self._deadline - self._now()))
+
+    @property
+    def total_elapsed_time(self) -> int:
+        """会议实际已用秒数（不含暂停时间）"""
+        elapsed = self._elapsed_base
+        if self._segment_start is not None:
+            elapsed += self._now() - self._segment_start
+        return int(elapsed)
+
+    async def start_meeting(self, on_timer_update, on_task_complete, on_meeting_end) -> bool:
+        """开始会议倒计时，会议在后台任务中运行，本协程立即返回"""
+        tasks = self.task_list.get_all()
+        if not tasks:
+            return False
+
+        if self._runner is not None and not self._runner.done():
+            self._runner.cancel()
+
+        self.current_task_index = 0
+        self.is_running = True
+        self.is_paused = False
+        self._skip_requested = False
+        self._elapsed_base = 0.0
+        self._segment_start = self._now()
+        # 立即设置第一个任务的截止时间：本协程返回后、后台任务开始运行前，
+        # 暂停与加时就可能到达
+        self._deadline = self._segment_start + tasks[0].minutes * 60
+
+        # 播报会议开始
+        if self.voice_service:
+            self.voice_service.announce_meeting_start(len(tasks), self.task_list.get_total_time())
+
+        self._runner = asyncio.create_task(
+            self._run_meeting(tasks, on_timer_update, on_task_complete, on_meeting_end))
+        return True
+
+    async def wait_finished(self):
+        """等待当前会议结束（正常结束或被停止）"""
+        runner = self._runner
+        if runner is None:
+            return
+        try:
+            # shield：等待方被取消时不连带取消会议任务
+            await asyncio.shield(runner)
+        except asyncio.CancelledError:
+            # 只忽略会议任务自身被取消（被新会议取代）；等待方被取消时继续传播
+            current = asyncio.current_task()
+            cancelling = getattr(current, "cancelling", None)  # Python 3.11+
+            if not runner.cancelled() or (cancelling is not None and cancelling()):
+                raise
+
+    async def pause_timer(self):
+        """暂停计时器"""
+        if self.is_running and not self.is_paused:
+            now = self._now()
+            self._paused_remaining = max(0.0, self._deadline - now)
+            self._close_segment(now)
+            self.is_paused = True
+            self._wake()
+
+    async def resume_timer(self):
+        """恢复计时器"""
+        if self.is_running and self.is_paused:
+            now = self._now()
+            self._deadline = now + self._paused_remaining
+            self._segment_start = now
+            self.is_paused = False
+            self._wake()
+
+    async def stop_timer(self):
+        """停止计时器"""
+        if self.is_running:
+            self._close_segment(self._now())
+            self._deadline = None
+            self.is_running = False
+            self.is_paused = False
+            self._wake()
+
+    async def add_time_to_current_task(self, minutes: int) -> bool:
+        """为当前任务增加时间"""
+        if self.is_running and not self.is_paused:
+            self._deadline += minutes * 60
+            self._wake()
+            return True
+        return False
+
+    async def skip_current_task(self) -> bool:
+        """跳过当前任务"""
+        if not self.is_running:
+            return False
+        if self.is_paused:
+            self._segment_start = self._now()
+            self.is_paused = False
+        self._skip_requested = True
+        self._wake()
+        return True
+
+    def _wake(self):
+        """唤醒正在等待的倒计时，让命令立即生效"""
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _wait(self, timeout: Optional[float]):
+        """等待至多 timeout 秒或直到有命令到达，None 表示一直等待"""
+        loop = asyncio.get_running_loop()
+        self._wakeup = loop.create_future()
+        handle = None
+        if timeout is not None:
+            handle = loop.call_later(timeout, self._wake)
+        try:
+            await self._wakeup
+        finally:
+            if handle is not None:
+                handle.cancel()
+            self._wakeup = None
+
+    @staticmethod
+    async def _call(callback, *args):
+        """调用回调，返回值可等待时 await 它"""
+        if callback:
+            result = callback(*args)
+            if inspect.isawaitable(result):
+                await result
+
+    def _close_segment(self, now: float):
+        """结束当前计时段，把其时长计入已用时间"""
+        if self._segment_start is not None:
+            self._elapsed_base += now - self._segment_start
+            self._segment_start = None
+
+    async def _run_meeting(self, tasks, on_timer_update, on_task_complete, on_meeting_end):
+        """依次运行议程中的任务"""
+        deadline = None
+        first = True  # 第一个任务的截止时间由 start_meeting 设置，其间的暂停与加时保持有效
+        while self.is_running and self.current_task_index < len(tasks):
+            current_task = tasks[self.current_task_index]
+            if first:
+                first = False
+            else:
+                duration = current_task.minutes * 60
+                now = self._now()
+                if self.is_paused:
+                    self._paused_remaining = float(duration)
+                # 紧接上一任务的截止时间开始，切换开销不会累积到会议总时长
+                start = deadline if deadline is not None and not self.is_paused else now
+                self._deadline = start + duration
+
+            if not await self._run_countdown(current_task, on_timer_update):
+                return
+
+            if self._skip_requested:
+                # 跳过的任务不播报完成，尚未播出的上一条切换播报也已过时
+                if self.voice_service:
+                    self.voice_service.discard(TASK_BOUNDARY_KEY)
+                # 下一任务从当前时刻开始
+                self._skip_requested = False
+                deadline = None
+                self.current_task_index += 1
+                continue
+
+            deadline = self._deadline
+            next_task = None
+            if self.current_task_index + 1 < len(tasks):
+                next_task = tasks[self.current_task_index + 1].name
+
+            # 播报任务完成
+            if self.voice_service:
+                self.voice_service.announce_task_completion(current_task.name, next_task)
+            await self._call(on_task_complete, current_task.name)
+
+            self.current_task_index += 1
+
+        if self.is_running:
+            self._close_segment(self._now())
+            self._deadline = None
+            self.is_running = False
+            await self._call(on_meeting_end, self.total_elapsed_time)
+
+            # 播报会议结束
+            if self.voice_service:
+                self.voice_service.speak(MEETING_END_MESSAGE)
+
+    async def _run_countdown(self, task, on_timer_update) -> bool:
+        """运行单个任务的倒计时，走完或被跳过返回 True，被停止返回 False"""
+        while self.is_running and not self._skip_requested:
+            if self.is_paused:
+                await self._wait(None)
+                continue
+            remaining = self._deadline - self._now()
+            if remaining <= 0:
+                return True
+
+            shown = math.ceil(remaining)
+            await self._call(on_timer_update, task.name, shown // 60, shown % 60,
+                             self.current_task_index + 1)
+
+            if not self.is_running or self.is_paused or self._skip_requested:
+                continue
+            # 回调期间可能有加时，按最新截止时间计算
+            remaining = self._deadline - self._now()
+            # 有显示回调时等到显示值下一次变化，否则直接等到截止时刻
+            timeout = remaining - (math.ceil(remaining) - 1) if on_timer_update else remaining
+            if timeout > 0:
+                await self._wait(timeout)
+        return self.is_running
@@ -0,0 +1,59 @@
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Tuple
+
+
+class BackgroundJob:
+    """在后台线程中运行的一次性任务（导入、导出等），界面线程轮询进度
+
+    func 以关键字参数 progress 和 cancel_event 调用：前者由工作线程报告
+    (已完成量, 总量)，后者用于请求取消。结果或异常通过 future 交给界面线程。
+    """
+
+    def __init__(self, func: Callable, *args, name: str = "BackgroundJob", **kwargs):
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self.name = name
+        self.cancel_event = threading.Event()
+        self.future: Future = Future()
+        self._progress: Tuple[int, int] = (0, 0)
+        self._thread = None
+
+    def start(self) -> "BackgroundJob":
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self._func(*self._args, progress=self._report,
+                                cancel_event=self.cancel_event, **self._kwargs)
+        except BaseException as e:
+            logging.warning(f"{self.name} 失败: {e}")
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+
+    def _report(self, done: int, total: int):
+        # 元组赋值是原子的，界面线程读取时不需要加锁
+        self._progress = (done, total)
+
+    @property
+    def progress(self) -> Tuple[int, int]:
+        """最近一次报告的 (已完成量, 总量)"""
+        return self._progress
+
+    def fraction(self) -> float:
+        done, total = self._progress
+        return done / total if total else 0.0
+
+    def cancel(self):
+        """请求取消，工作函数在下一个检查点返回"""
+        self.cancel_event.set()
+
+    def done(self) -> bool:
+        return self.future.done()
@@ -0,0 +1,93 @@
+"""asyncio 计时器与线程计时器对比基准测试
+
+分别用 AsyncCountdownTimer（单个事件循环）和 CountdownTimer（每个计时器一个线程）
+同时运行多场会议，比较显示刷新的准时程度、CPU 开销和线程数。
+
+用法: python benchmarks/bench_async_timer.py [--meetings 1000] [--seconds 10]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from async_countdown_timer import AsyncCountdownTimer  # noqa: E402
+from countdown_timer import CountdownTimer  # noqa: E402
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+from voice_service import VoiceService  # noqa: E402
+
+
+def _agenda() -> TaskList:
+    task_list = TaskList()
+    task_list.add(Task(name="议题", minutes=1))
+    return task_list
+
+
+def _make_recorder(start: float, lateness: list):
+    """显示值为 v 的刷新应发生在 start + 60 - v，记录实际延迟"""
+    def on_timer_update(task_name, minutes, seconds, index):
+        shown = minutes * 60 + seconds
+        lateness.append(time.monotonic() - (start + 60 - shown))
+    return on_timer_update
+
+
+def run_threaded(meetings: int, seconds: float):
+    lateness = []
+    timers = []
+    cpu_start = time.process_time()
+    for _ in range(meetings):
+        timer = CountdownTimer(_agenda(), VoiceService(enabled=False))
+        timer.start_meeting(_make_recorder(time.monotonic(), lateness), None, None)
+        timers.append(timer)
+    time.sleep(seconds)
+    threads = threading.active_count()
+    cpu = time.process_time() - cpu_start
+    for timer in timers:
+        timer.stop_timer()
+    return lateness, cpu, threads
+
+
+async def _run_async(meetings: int, seconds: float):
+    lateness = []
+    timers = []
+    cpu_start = time.process_time()
+    for _ in range(meetings):
+        timer = AsyncCountdownTimer(_agenda(), VoiceService(enabled=False))
+        await timer.start_meeting(_make_recorder(time.monotonic(), lateness), None, None)
+        timers.append(timer)
+    await asyncio.sleep(seconds)
+    threads = threading.active_count()
+    cpu = time.process_time() - cpu_start
+    for timer in timers:
+        await timer.stop_timer()
+    await asyncio.gather(*(timer.wait_finished() for timer in timers))
+    return lateness, cpu, threads
+
+
+def _report(name: str, lateness: list, cpu: float, threads: int, seconds: float):
+    lateness.sort()
+    n = len(lateness)
+    p50 = lateness[n // 2] * 1e3
+    p99 = lateness[int(n * 0.99)] * 1e3
+    worst = lateness[-1] * 1e3
+    print(f"{name:<10}{n:>10}{p50:>10.2f}{p99:>10.2f}{worst:>10.2f}{cpu / seconds:>10.1%}{threads:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meetings", type=int, default=1000, help="并发会议数")
+    parser.add_argument("--seconds", type=float, default=10.0, help="运行时长（秒，需小于60）")
+    args = parser.parse_args()
+
+    print(f"并发会议 {args.meetings}，运行 {args.seconds:g} 秒；延迟单位 ms")
+    print(f"{'实现':<10}{'刷新次数':>10}{'p50':>10}{'p99':>10}{'最大':>10}{'CPU':>10}{'线程':>8}")
+    _report("asyncio", *asyncio.run(_run_async(args.meetings, args.seconds)), args.seconds)
+    _report("threaded", *run_threaded(args.meetings, args.seconds), args.seconds)
+
+
+if __name__ == "__main__":
+    main()
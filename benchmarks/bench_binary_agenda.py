@@ -0,0 +1,80 @@
+"""二进制议程与CSV加载时间对比
+
+在不同任务数量下生成 任务名称,时长(分钟),笔记 格式的CSV并转换为 .agenda，
+比较：CSV 全量解析（stream_tasks）、MappedAgenda 打开并读取首屏 50 行与总时长
+（启动时真正需要的数据），以及 MappedAgenda 完整遍历全部任务的耗时。
+
+用法: python benchmarks/bench_binary_agenda.py [--sizes 10000 100000 1000000]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from binary_agenda import MappedAgenda, csv_to_agenda  # noqa: E402
+from task import Task  # noqa: E402
+from task_csv import MINUTES_COLUMN, NAME_COLUMN, NOTES_COLUMN, stream_tasks  # noqa: E402
+
+FIRST_SCREEN = 50
+
+
+def write_csv(path, size):
+    with open(path, "w", encoding="utf-8-sig", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow([NAME_COLUMN, MINUTES_COLUMN, NOTES_COLUMN])
+        writer.writerows((f"任务{i} 讨论议题", 1 + i % 60, f"第{i}项的会议笔记" if i % 3 else "")
+                         for i in range(size))
+
+
+def load_csv(path):
+    result = stream_tasks(path, task_factory=Task)
+    return len(result.tasks)
+
+
+def open_agenda(path):
+    with MappedAgenda(path) as agenda:
+        first = [agenda[i] for i in range(min(FIRST_SCREEN, len(agenda)))]
+        agenda.get_total_time()
+        return len(first)
+
+
+def scan_agenda(path):
+    with MappedAgenda(path) as agenda:
+        return sum(1 for _ in agenda)
+
+
+def best_of(func, path, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'任务数':>10}{'CSV(MB)':>9}{'agenda(MB)':>12}{'CSV解析(ms)':>14}"
+          f"{'mmap打开+首屏(ms)':>20}{'mmap全遍历(ms)':>17}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            csv_path = os.path.join(tmp, f"{size}.csv")
+            agenda_path = os.path.join(tmp, f"{size}.agenda")
+            write_csv(csv_path, size)
+            csv_to_agenda(csv_path, agenda_path)
+            csv_t = best_of(load_csv, csv_path, repeat=1 if size >= 1_000_000 else 3)
+            open_t = best_of(open_agenda, agenda_path)
+            scan_t = best_of(scan_agenda, agenda_path, repeat=1)
+            print(f"{size:>10}{os.path.getsize(csv_path) / 2**20:>9.1f}{os.path.getsize(agenda_path) / 2**20:>12.1f}"
+                  f"{csv_t * 1e3:>14.1f}{open_t * 1e3:>20.3f}{scan_t * 1e3:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
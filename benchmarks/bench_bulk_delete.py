@@ -0,0 +1,64 @@
+"""批量删除基准测试
+
+对比旧版 _delete_selected（逐个 delete，每次 pop 和一次通知）与 delete_many
+（一次 O(n) 重建、一次通知）在删除大量选中任务时的耗时与通知次数。
+
+用法: python benchmarks/bench_bulk_delete.py [--size 100000] [--selected 1000 10000 50000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from compact_task_list import CompactTaskList  # noqa: E402
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+
+
+def fill(cls, size):
+    task_list = cls()
+    task_list.insert_many(0, [Task(name=f"任务{i}", minutes=1 + i % 60) for i in range(size)])
+    return task_list
+
+
+def legacy_delete(task_list, selected):
+    for index in reversed(selected):
+        task_list.delete(index)
+
+
+def bulk_delete(task_list, selected):
+    task_list.delete_many(selected)
+
+
+def measure(cls, size, selected, func):
+    task_list = fill(cls, size)
+    notifications = []
+    task_list.add_listener(notifications.append)
+    start = time.perf_counter()
+    func(task_list, selected)
+    elapsed = time.perf_counter() - start
+    assert task_list.get_task_count() == size - len(selected)
+    return elapsed, len(notifications)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--selected", type=int, nargs="+", default=[1000, 10_000, 50_000])
+    args = parser.parse_args()
+
+    print(f"{'实现':>16}{'选中数':>8}{'逐个删除(ms)':>16}{'批量删除(ms)':>16}{'加速比':>8}{'通知次数':>14}")
+    for cls in (TaskList, CompactTaskList):
+        for count in args.selected:
+            selected = sorted(random.Random(count).sample(range(args.size), count))
+            old_t, old_n = measure(cls, args.size, selected, legacy_delete)
+            new_t, new_n = measure(cls, args.size, selected, bulk_delete)
+            print(f"{cls.__name__:>16}{count:>8}{old_t * 1e3:>16.1f}{new_t * 1e3:>16.1f}"
+                  f"{old_t / new_t:>8.0f}x{f'{old_n} -> {new_n}':>14}")
+
+
+if __name__ == "__main__":
+    main()
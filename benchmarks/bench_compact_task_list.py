@@ -0,0 +1,89 @@
+"""数组存储 TaskList 内存与吞吐基准测试
+
+分别用 dataclass 版 TaskList 与数组版 CompactTaskList 载入生成的大型议程
+（例如全会场的分会场日程，议题名称大量重复），报告内存占用以及
+添加、统计、遍历、导出的吞吐。每个组合在独立子进程中运行，互不影响。
+
+用法: python benchmarks/bench_compact_task_list.py [--sizes 10000 1000000 10000000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from compact_task_list import CompactTaskList  # noqa: E402
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+
+BACKENDS = {"dataclass": TaskList, "compact": CompactTaskList}
+
+
+def _rows(size: int):
+    """模拟逐行解析CSV：每行都是新的字符串对象"""
+    for i in range(size):
+        yield f"分会场{i % 40} 议题{i % 5000}", 5 + i % 55
+
+
+def run_case(backend: str, size: int) -> dict:
+    """在当前进程中测量一个组合"""
+    cls = BACKENDS[backend]
+    tracemalloc.start()
+    start = time.perf_counter()
+    task_list = cls()
+    for name, minutes in _rows(size):
+        task_list.add(Task(name, minutes))
+    add_time = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    total = task_list.get_total_time() + task_list.get_task_count()
+    stats_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for task in task_list:
+        total += task.minutes
+    iter_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exported = task_list.export_to_list()
+    export_time = time.perf_counter() - start
+    del exported
+
+    return {"memory": memory, "add": add_time, "stats": stats_time,
+            "iter": iter_time, "export": export_time}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--case", nargs=2, metavar=("BACKEND", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case[0], int(args.case[1]))))
+        return
+
+    print(f"{'规模':>10}{'实现':>11}{'内存(MB)':>10}{'字节/任务':>10}"
+          f"{'添加(万/秒)':>12}{'统计(µs)':>10}{'遍历(万/秒)':>12}{'导出(万/秒)':>12}")
+    for size in args.sizes:
+        for backend in BACKENDS:
+            output = subprocess.run([sys.executable, __file__, "--case", backend, str(size)],
+                                    capture_output=True, text=True)
+            if output.returncode != 0:
+                print(f"{size:>10}{backend:>11}  失败（可能内存不足）")
+                continue
+            r = json.loads(output.stdout)
+            print(f"{size:>10}{backend:>11}{r['memory'] / 2 ** 20:>10.1f}{r['memory'] / size:>10.1f}"
+                  f"{size / r['add'] / 1e4:>12.1f}{r['stats'] * 1e6:>10.2f}"
+                  f"{size / r['iter'] / 1e4:>12.1f}{size / r['export'] / 1e4:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""控制命令延迟基准测试
+
+在人为 CPU 负载下反复对运行中的 CountdownTimer 发送暂停、继续、加时、
+跳过和停止命令，报告每种命令从投递到生效的延迟；
+并在无负载时测量暂停状态下整个进程的 CPU 占用。
+
+用法: python benchmarks/bench_control_latency.py [--rounds 200] [--load 4]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from countdown_timer import CountdownTimer  # noqa: E402
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+from voice_service import VoiceService  # noqa: E402
+
+
+def _cpu_load(stop: threading.Event):
+    """纯 Python 忙循环，与计时线程争抢 GIL 和 CPU"""
+    x = 0
+    while not stop.is_set():
+        for i in range(10000):
+            x += i * i
+
+
+def _wait_for(predicate, timeout=1.0):
+    end = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < end:
+        time.sleep(0.0005)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200, help="暂停/继续/加时轮数")
+    parser.add_argument("--load", type=int, default=4, help="CPU 负载线程数")
+    parser.add_argument("--idle", type=float, default=3.0, help="暂停状态 CPU 采样秒数")
+    args = parser.parse_args()
+
+    task_list = TaskList()
+    for i in range(args.rounds + 2):
+        task_list.add(Task(name=f"议题{i + 1}", minutes=60))
+
+    timer = CountdownTimer(task_list, VoiceService(enabled=False))
+    ended = threading.Event()
+    timer.start_meeting(lambda *a: None, None, lambda total: ended.set())
+    _wait_for(lambda: timer.remaining_time > 0)
+
+    # 暂停状态下的 CPU 占用（无负载）
+    timer.pause_timer()
+    _wait_for(lambda: timer.is_paused)
+    cpu_start = time.process_time()
+    time.sleep(args.idle)
+    idle_cpu = time.process_time() - cpu_start
+    timer.resume_timer()
+    _wait_for(lambda: not timer.is_paused)
+
+    stop = threading.Event()
+    loaders = [threading.Thread(target=_cpu_load, args=(stop,), daemon=True) for _ in range(args.load)]
+    for t in loaders:
+        t.start()
+    try:
+        for _ in range(args.rounds):
+            timer.pause_timer()
+            _wait_for(lambda: timer.is_paused)
+            timer.resume_timer()
+            _wait_for(lambda: not timer.is_paused)
+            timer.add_time_to_current_task(1)
+            index = timer.current_task_index
+            timer.skip_current_task()
+            _wait_for(lambda: timer.current_task_index != index)
+        timer.stop_timer()
+        _wait_for(lambda: not timer.is_running)
+    finally:
+        stop.set()
+
+    print(f"负载线程 {args.load}, 轮数 {args.rounds}")
+    print(f"{'命令':<10}{'次数':>8}{'平均(ms)':>12}{'最大(ms)':>12}")
+    for command, stats in sorted(timer.get_command_latency_stats().items()):
+        print(f"{command:<10}{stats['count']:>8}{stats['avg'] * 1e3:>12.3f}{stats['max'] * 1e3:>12.3f}")
+    print(f"暂停 {args.idle:g} 秒期间进程 CPU 时间: {idle_cpu * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""CSV 导出吞吐量基准测试
+
+对比旧版 _export_csv（DictWriter.writerow 逐行写入，每行构造字典）与 write_tasks
+（attrgetter 生成元组、分批 writerows、临时文件加原子替换）及其 gzip 模式的耗时与文件大小。
+
+用法: python benchmarks/bench_csv_export.py [--sizes 100000 1000000]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from task import Task  # noqa: E402
+from task_csv import write_tasks  # noqa: E402
+
+
+def legacy_export(file_path, tasks):
+    """旧版 _export_csv 的写入循环"""
+    with open(file_path, mode='w', encoding='utf-8-sig', newline='') as file:
+        fieldnames = ['任务名称', '时长(分钟)']
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+
+        writer.writeheader()
+        for task in tasks:
+            writer.writerow({'任务名称': task.name, '时长(分钟)': task.minutes})
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'任务数':>10}{'实现':>14}{'耗时(s)':>10}{'行/秒':>14}{'文件(MB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            tasks = [Task(name=f"任务{i} 讨论议题", minutes=1 + i % 60) for i in range(size)]
+            for name, path, func in (("DictWriter", "legacy.csv", legacy_export),
+                                     ("writerows", "batched.csv", write_tasks),
+                                     ("writerows+gz", "batched.csv.gz", write_tasks)):
+                path = os.path.join(tmp, path)
+                elapsed = timed(func, path, tasks)
+                size_mb = os.path.getsize(path) / 1024 / 1024
+                print(f"{size:>10}{name:>14}{elapsed:>10.2f}{size / elapsed:>14.0f}{size_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""CSV 流式导入基准测试
+
+生成指定大小的议程CSV（含一定比例的无效行），对比旧版 _import_csv 的解析循环
+（DictReader 逐行构造字典，去掉逐条弹窗）与 stream_tasks 在后台线程中的吞吐量，
+并测量进度回调次数与取消请求的响应延迟。
+
+用法: python benchmarks/bench_csv_import.py [--megabytes 200] [--bad-ratio 0.001]
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from background_job import BackgroundJob  # noqa: E402
+from task import Task  # noqa: E402
+from task_csv import MINUTES_COLUMN, NAME_COLUMN, stream_tasks  # noqa: E402
+
+
+def write_agenda(path, megabytes, bad_ratio):
+    """写入约 megabytes 大小的CSV，返回行数"""
+    rng = random.Random(0)
+    target = megabytes * 1024 * 1024
+    rows = 0
+    with open(path, "w", encoding="utf-8-sig", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow([NAME_COLUMN, MINUTES_COLUMN])
+        while file.tell() < target:
+            batch = []
+            for _ in range(10000):
+                rows += 1
+                if rng.random() < bad_ratio:
+                    batch.append(("" if rng.random() < 0.5 else f"任务{rows}", "abc"))
+                else:
+                    batch.append((f"任务{rows} 讨论议题", 1 + rows % 60))
+            writer.writerows(batch)
+    return rows
+
+
+def legacy_parse(file_path):
+    """旧版 _import_csv 的解析循环（去掉了逐条 messagebox）"""
+    with open(file_path, mode='r', encoding='utf-8-sig', newline='') as file:
+        reader = csv.DictReader(file)
+        imported_tasks = []
+        errors = []
+        line_number = 2
+        for row in reader:
+            task_name = row['任务名称'].strip()
+            duration_str = row['时长(分钟)'].strip()
+            if not task_name:
+                errors.append(line_number)
+                line_number += 1
+                continue
+            try:
+                duration = int(duration_str)
+                if duration <= 0:
+                    raise ValueError
+            except ValueError:
+                errors.append(line_number)
+                line_number += 1
+                continue
+            imported_tasks.append(Task(task_name, duration))
+            line_number += 1
+    return imported_tasks, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=int, default=200)
+    parser.add_argument("--bad-ratio", type=float, default=0.001)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "agenda.csv")
+        rows = write_agenda(path, args.megabytes, args.bad_ratio)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"测试文件: {size_mb:.0f} MB, {rows} 行")
+
+        start = time.perf_counter()
+        tasks, errors = legacy_parse(path)
+        legacy_t = time.perf_counter() - start
+        legacy_count = len(tasks)
+        del tasks, errors
+
+        calls = []
+        job = BackgroundJob(stream_tasks, path)
+        job._report = lambda done, total: calls.append(done)
+        start = time.perf_counter()
+        result = job.start().future.result()
+        stream_t = time.perf_counter() - start
+        assert len(result.tasks) == legacy_count
+
+        print(f"{'实现':>12}{'耗时(s)':>10}{'吞吐(MB/s)':>12}")
+        print(f"{'旧版解析':>12}{legacy_t:>10.2f}{size_mb / legacy_t:>12.1f}")
+        print(f"{'流式解析':>12}{stream_t:>10.2f}{size_mb / stream_t:>12.1f}")
+        print(f"有效任务 {len(result.tasks)}，无效行 {result.error_count}（报告保留 {len(result.errors)} 条），"
+              f"进度回调 {len(calls)} 次")
+        del result
+
+        # 取消延迟：解析进行到一半时请求取消
+        job = BackgroundJob(stream_tasks, path).start()
+        time.sleep(stream_t / 2)
+        requested = time.perf_counter()
+        job.cancel()
+        cancelled = job.future.result()
+        latency = time.perf_counter() - requested
+        print(f"取消响应延迟: {latency * 1e3:.1f} ms（cancelled={cancelled.cancelled}）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""倒计时漂移基准测试
+
+在人为 CPU 负载下，以时间压缩的方式运行一个数小时的模拟议程，
+比较旧版 sleep(1) 计数实现与基于 monotonic 截止时间实现的累计误差。
+
+用法: python benchmarks/bench_drift.py [--hours 2] [--scale 200] [--load 4]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from countdown_timer import CountdownTimer  # noqa: E402
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+from voice_service import VoiceService  # noqa: E402
+
+
+class ScaledTime:
+    """把真实时间放大 scale 倍的时钟：虚拟1秒 = 真实 1/scale 秒"""
+
+    def __init__(self, scale: float):
+        self.scale = scale
+        self._origin = time.monotonic()
+
+    def monotonic(self) -> float:
+        return self._origin + (time.monotonic() - self._origin) * self.scale
+
+    def time(self) -> float:
+        return self.monotonic()
+
+    def sleep(self, seconds: float):
+        time.sleep(max(0.0, seconds) / self.scale)
+
+    def wait(self, cond: threading.Condition, timeout):
+        """按时间压缩倍数缩短命令通道上的等待"""
+        cond.wait(None if timeout is None else timeout / self.scale)
+
+
+def _cpu_load(stop: threading.Event):
+    """纯 Python 忙循环，与计时线程争抢 GIL 和 CPU"""
+    x = 0
+    while not stop.is_set():
+        for i in range(10000):
+            x += i * i
+
+
+def _build_agenda(hours: float) -> TaskList:
+    task_list = TaskList()
+    remaining = int(hours * 60)
+    i = 1
+    while remaining > 0:
+        minutes = min(remaining, 5 + (i * 7) % 20)
+        task_list.add(Task(name=f"议题{i}", minutes=minutes))
+        remaining -= minutes
+        i += 1
+    return task_list
+
+
+def run_legacy(task_list: TaskList, clock: ScaledTime) -> float:
+    """旧实现：每个任务 remaining 次 sleep(1)，返回虚拟实际用时"""
+    start = clock.monotonic()
+    for task in task_list.get_all():
+        remaining = task.minutes * 60
+        while remaining > 0:
+            # 与旧版 _run_countdown 一样在每次 tick 中做一次显示回调
+            _ = f"{task.name} {remaining // 60:02d}:{remaining % 60:02d}"
+            clock.sleep(1)
+            remaining -= 1
+    return clock.monotonic() - start
+
+
+def run_deadline(task_list: TaskList, clock: ScaledTime):
+    """新实现：驱动真实的 CountdownTimer，返回 (虚拟实际用时, total_elapsed_time)"""
+    timer = CountdownTimer(task_list, VoiceService(enabled=False), clock)
+    done = threading.Event()
+    result = {}
+
+    def on_meeting_end(total_seconds):
+        result["elapsed"] = total_seconds
+        done.set()
+
+    start = clock.monotonic()
+    timer.start_meeting(lambda *a: None, None, on_meeting_end)
+    done.wait()
+    return clock.monotonic() - start, result["elapsed"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=2.0, help="模拟议程时长（小时）")
+    parser.add_argument("--scale", type=float, default=200.0, help="时间压缩倍数")
+    parser.add_argument("--load", type=int, default=4, help="CPU 负载线程数")
+    args = parser.parse_args()
+
+    task_list = _build_agenda(args.hours)
+    planned = task_list.get_total_time() * 60
+    print(f"议程: {task_list.get_task_count()} 个任务, 计划 {planned} 秒, "
+          f"压缩 {args.scale:g} 倍, 负载线程 {args.load}")
+
+    stop = threading.Event()
+    loaders = [threading.Thread(target=_cpu_load, args=(stop,), daemon=True) for _ in range(args.load)]
+    for t in loaders:
+        t.start()
+    try:
+        legacy = run_legacy(task_list, ScaledTime(args.scale))
+        actual, elapsed = run_deadline(task_list, ScaledTime(args.scale))
+    finally:
+        stop.set()
+
+    print(f"{'实现':<12}{'实际用时(s)':>14}{'累计误差(s)':>14}{'相对误差':>10}")
+    for name, value in (("sleep(1)", legacy), ("deadline", actual)):
+        error = value - planned
+        print(f"{name:<12}{value:>14.1f}{error:>14.1f}{error / planned:>10.2%}")
+    print(f"deadline 实现报告的 total_elapsed_time: {elapsed} 秒")
+
+
+if __name__ == "__main__":
+    main()
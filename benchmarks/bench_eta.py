@@ -0,0 +1,130 @@
+"""预计时间索引微基准测试
+
+对比每次刷新都遍历任务列表累加时长（O(n)）与 EtaIndex 的树状数组（O(log n)）：
+    刷新  计时每秒一次：重新锚定、计算会议预计结束时间、为表格可见的 --rows 行生成预计时间
+    加时  为当前任务加5分钟后刷新
+    修改  修改一个任务的时长后刷新
+    查询  给定时刻正在进行的是哪个任务
+可见行位于列表中部，当前任务位于列表前四分之一处。
+
+用法: python benchmarks/bench_eta.py [--sizes 1000 100000 1000000] [--rows 20]
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from eta_index import EtaIndex  # noqa: E402
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+
+
+class LinearEta:
+    """对照组：每次需要时遍历列表求累计时长"""
+
+    def __init__(self, task_list):
+        self.task_list = task_list
+        self.extra = {}
+        self.origin = 0.0
+
+    def _durations(self):
+        extra = self.extra
+        return [task.minutes * 60 + extra.get(i, 0) for i, task in enumerate(self.task_list)]
+
+    def set_progress(self, task_index, remaining, now):
+        self.origin = now - (sum(self._durations()[:task_index + 1]) - remaining)
+
+    def extend(self, task_index, seconds):
+        self.extra[task_index] = self.extra.get(task_index, 0) + seconds
+
+    def refresh(self, top, rows):
+        durations = self._durations()
+        start = self.origin + sum(durations[:top])
+        etas = []
+        for i in range(top, min(top + rows, len(durations))):
+            etas.append((start, start + durations[i]))
+            start += durations[i]
+        return etas, self.origin + sum(durations)
+
+    def task_at(self, when):
+        offset = when - self.origin
+        for i, duration in enumerate(self._durations()):
+            if offset < duration:
+                return i
+            offset -= duration
+        return len(self.task_list)
+
+
+class IndexedEta:
+    def __init__(self, task_list):
+        self.eta = EtaIndex(task_list)
+
+    def set_progress(self, task_index, remaining, now):
+        self.eta.set_progress(task_index, remaining, now)
+
+    def extend(self, task_index, seconds):
+        self.eta.extend(task_index, seconds)
+
+    def refresh(self, top, rows):
+        eta = self.eta
+        etas = [(eta.start_of(i), eta.end_of(i)) for i in range(top, min(top + rows, len(eta.index)))]
+        return etas, eta.meeting_end()
+
+    def task_at(self, when):
+        return self.eta.task_at(when)
+
+
+def _per_call(func) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def measure(impl, task_list, rows):
+    size = len(task_list)
+    current, top = size // 4, size // 2
+    now = time.time()
+    impl.set_progress(current, 90, now)
+
+    def tick():
+        impl.set_progress(current, 90, now)
+        impl.refresh(top, rows)
+
+    def add_time():
+        impl.extend(current, 300)
+        tick()
+
+    def edit():
+        task_list.update(top, Task("修改", 15))
+        tick()
+
+    return {
+        "刷新": _per_call(tick),
+        "加时": _per_call(add_time),
+        "修改": _per_call(edit),
+        "查询": _per_call(lambda: impl.task_at(now + 3600)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    parser.add_argument("--rows", type=int, default=20, help="表格可见行数")
+    args = parser.parse_args()
+
+    print(f"{'规模':>10}{'操作':>6}{'遍历累加(µs)':>16}{'树状数组(µs)':>16}{'加速比':>10}")
+    for size in args.sizes:
+        task_list = TaskList()
+        task_list.insert_many(0, [Task(f"议题{i}", 5 + i % 20) for i in range(size)])
+        linear = measure(LinearEta(task_list), task_list, args.rows)
+        indexed = measure(IndexedEta(task_list), task_list, args.rows)
+        for name, legacy in linear.items():
+            new = indexed[name]
+            print(f"{size:>10}{name:>6}{legacy * 1e6:>16.1f}{new * 1e6:>16.1f}{legacy / new:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""无界面引擎层导入开销基准测试
+
+在全新解释器中导入引擎层模块（Task、TaskList、CountdownTimer、VoiceService
+及命令行入口），报告导入耗时、新增模块数，并确认没有导入 tkinter。
+
+用法: python benchmarks/bench_headless_import.py [--repeat 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+PROBE = """
+import sys, time
+baseline = set(sys.modules)
+start = time.perf_counter()
+import {modules}
+elapsed = time.perf_counter() - start
+added = set(sys.modules) - baseline
+print(elapsed, len(added), int(any(m == 'tkinter' or m.startswith('tkinter.') for m in added)))
+"""
+
+TARGETS = {
+    "引擎层": "task, task_list, countdown_timer, voice_service",
+    "命令行入口": "meeting_cli",
+    "图形界面 main1": "main1",
+}
+
+
+def _probe(modules: str):
+    output = subprocess.run([sys.executable, "-c", PROBE.format(modules=modules)],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+    return float(output[0]), int(output[1]), bool(int(output[2]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="每项重复次数（取中位数）")
+    args = parser.parse_args()
+
+    print(f"{'目标':<16}{'导入耗时(ms)':>14}{'新增模块':>10}{'tkinter':>10}")
+    for name, modules in TARGETS.items():
+        runs = sorted(_probe(modules) for _ in range(args.repeat))
+        elapsed, added, has_tk = runs[len(runs) // 2]
+        print(f"{name:<16}{elapsed * 1e3:>14.2f}{added:>10}{'是' if has_tk else '否':>10}")
+
+
+if __name__ == "__main__":
+    main()
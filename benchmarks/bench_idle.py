@@ -0,0 +1,87 @@
+"""空闲模式唤醒次数基准测试
+
+1. 以时间压缩的方式运行 --minutes 分钟的议程，分别在显示开启（窗口可见）和显示关闭
+   （窗口隐藏，set_display_active(False)）时统计计时线程每分钟醒来的次数与显示回调次数。
+   界面线程的渲染循环只在有新状态发布时醒来（每个显示回调至多一次），隐藏时完全暂停。
+2. 追赶延迟：隐藏状态下重新开启显示，到第一次显示回调之间的真实耗时。
+
+不需要图形显示。
+用法: python benchmarks/bench_idle.py [--minutes 60] [--scale 120] [--catch-up 20]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_drift import ScaledTime  # noqa: E402
+from countdown_timer import CountdownTimer  # noqa: E402
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+from voice_service import VoiceService  # noqa: E402
+
+
+def build_agenda(minutes):
+    task_list = TaskList()
+    task_list.insert_many(0, [Task(f"议题{i}", 2) for i in range(max(1, minutes // 2))])
+    return task_list
+
+
+def run_meeting(task_list, scale, display):
+    """返回 (计时线程醒来次数, 显示回调次数, 虚拟会议分钟数)"""
+    timer = CountdownTimer(task_list, VoiceService(enabled=False), ScaledTime(scale))
+    timer.set_display_active(display)
+    done = threading.Event()
+    updates = []
+    timer.start_meeting(lambda *state: updates.append(state), None, lambda total: done.set())
+    done.wait()
+    return timer.wakeups, len(updates), task_list.get_total_time()
+
+
+def measure_catch_up(rounds):
+    """隐藏 -> 可见后，到第一次显示回调的真实延迟（秒）"""
+    task_list = TaskList()
+    task_list.add(Task("长议题", 60))
+    timer = CountdownTimer(task_list, VoiceService(enabled=False))
+    shown = threading.Event()
+    timer.start_meeting(lambda *state: shown.set(), None, None)
+    delays = []
+    try:
+        for _ in range(rounds):
+            timer.set_display_active(False)
+            time.sleep(0.05)
+            shown.clear()
+            start = time.perf_counter()
+            timer.set_display_active(True)
+            shown.wait()
+            delays.append(time.perf_counter() - start)
+    finally:
+        timer.stop_timer()
+    return delays
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=int, default=60, help="模拟议程时长（分钟，每个议题2分钟）")
+    parser.add_argument("--scale", type=float, default=120.0, help="时间压缩倍数")
+    parser.add_argument("--catch-up", type=int, default=20, help="测量追赶延迟的次数")
+    args = parser.parse_args()
+
+    task_list = build_agenda(args.minutes)
+    print(f"议程 {task_list.get_task_count()} 个议题，共 {task_list.get_total_time()} 分钟，压缩 {args.scale:g} 倍")
+    print(f"{'状态':>6}{'计时线程唤醒/分钟':>20}{'显示回调/分钟':>16}{'界面唤醒/分钟':>16}")
+    for label, display in (("可见", True), ("隐藏", False)):
+        wakeups, updates, minutes = run_meeting(task_list, args.scale, display)
+        # 渲染循环由发布唤醒：可见时每个显示回调至多唤醒界面线程一次，隐藏时不唤醒
+        ui_wakeups = updates / minutes if display else 0
+        print(f"{label:>6}{wakeups / minutes:>20.1f}{updates / minutes:>16.1f}{ui_wakeups:>16.1f}")
+
+    delays = measure_catch_up(args.catch_up)
+    print(f"重新可见后的追赶延迟：平均 {sum(delays) / len(delays) * 1e3:.2f} ms，"
+          f"最长 {max(delays) * 1e3:.2f} ms（{len(delays)} 次）")
+
+
+if __name__ == "__main__":
+    main()
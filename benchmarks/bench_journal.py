@@ -0,0 +1,103 @@
+"""自动保存日志基准测试
+
+1. 每次编辑的额外开销：对比有无 TaskJournal 时执行同一批编辑（add/update/move/delete）的耗时，
+   并统计组提交合并后的 fsync 次数。
+2. 恢复时间：写入 --ops 条记录的日志后重新打开，分别测量不生成快照（全部重放）
+   与按默认间隔生成快照（只重放最后一代）时 recover() 的耗时。
+
+用法: python benchmarks/bench_journal.py [--ops 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from task import Task  # noqa: E402
+from task_journal import TaskJournal  # noqa: E402
+from task_list import TaskList  # noqa: E402
+
+
+def make_edits(ops, seed=0):
+    """生成可重复的编辑序列：(操作, 参数...)，索引相对于当时的列表长度按比例给出"""
+    rng = random.Random(seed)
+    edits = []
+    for i in range(ops):
+        r = rng.random()
+        if r < 0.5:
+            edits.append(("add", Task(f"任务{i}", 1 + i % 60)))
+        elif r < 0.7:
+            edits.append(("update", rng.random(), Task(f"修改{i}", 5)))
+        elif r < 0.85:
+            edits.append(("move", rng.random(), rng.random()))
+        else:
+            edits.append(("delete", rng.random()))
+    return edits
+
+
+def apply_edits(task_list, edits):
+    for edit in edits:
+        size = len(task_list)
+        op = edit[0]
+        if op == "add":
+            task_list.add(edit[1])
+        elif not size:
+            continue
+        elif op == "update":
+            task_list.update(int(edit[1] * size), edit[2])
+        elif op == "move":
+            task_list.move(int(edit[1] * size), int(edit[2] * size))
+        else:
+            task_list.delete(int(edit[1] * size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=1_000_000)
+    parser.add_argument("--overhead-ops", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        edits = make_edits(args.overhead_ops)
+        plain = TaskList()
+        start = time.perf_counter()
+        apply_edits(plain, edits)
+        plain_t = time.perf_counter() - start
+
+        journaled = TaskList()
+        journal = TaskJournal(os.path.join(tmp, "overhead"))
+        journal.recover(journaled)
+        journal.attach(journaled)
+        start = time.perf_counter()
+        apply_edits(journaled, edits)
+        journaled_t = time.perf_counter() - start
+        journal.close()
+        per_edit = (journaled_t - plain_t) / len(edits) * 1e6
+        print(f"{len(edits)} 次编辑：无日志 {plain_t:.2f} s，有日志 {journaled_t:.2f} s，"
+              f"每次编辑额外 {per_edit:.1f} µs；fsync {journal.fsyncs} 次，"
+              f"日志 {journal.bytes_written / 2**20:.1f} MB")
+
+        edits = make_edits(args.ops, seed=1)
+        for label, snapshot_every in (("不生成快照", args.ops + 1), ("默认快照间隔", 100_000)):
+            directory = os.path.join(tmp, label)
+            task_list = TaskList()
+            journal = TaskJournal(directory, snapshot_every=snapshot_every)
+            journal.recover(task_list)
+            journal.attach(task_list)
+            apply_edits(task_list, edits)
+            journal.close()
+
+            recovered = TaskList()
+            start = time.perf_counter()
+            replayed = TaskJournal(directory).recover(recovered)
+            elapsed = time.perf_counter() - start
+            assert recovered.get_all() == task_list.get_all()
+            print(f"{label}：{args.ops} 次操作后恢复 {len(recovered)} 个任务，"
+                  f"重放 {replayed} 条记录，耗时 {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
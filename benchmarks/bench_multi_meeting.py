@@ -0,0 +1,80 @@
+"""多会议调度基准测试
+
+用一个 MeetingScheduler 线程同时驱动上万场会议（每场每秒刷新一次显示），
+报告触发抖动、每秒回调吞吐、CPU 占用以及每场会议的内存开销。
+
+用法: python benchmarks/bench_multi_meeting.py [--meetings 10000] [--seconds 20]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from meeting_scheduler import MeetingScheduler  # noqa: E402
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meetings", type=int, default=10_000, help="并发会议数")
+    parser.add_argument("--seconds", type=float, default=20.0, help="运行时长（秒）")
+    parser.add_argument("--tick", type=float, default=0.05, help="时间轮刻度（秒）")
+    args = parser.parse_args()
+
+    agendas = []
+    for room in range(args.meetings):
+        task_list = TaskList()
+        for i in range(3):
+            task_list.add(Task(name=f"会议室{room} 议题{i + 1}", minutes=1 + (room + i) % 3))
+        agendas.append(task_list)
+
+    updates = [0]
+    completed = [0]
+    ended = [0]
+    lock = threading.Lock()
+
+    def on_timer_update(task_name, minutes, seconds, index):
+        updates[0] += 1
+
+    def on_task_complete(task_name):
+        completed[0] += 1
+
+    def on_meeting_end(total_seconds):
+        with lock:
+            ended[0] += 1
+
+    scheduler = MeetingScheduler(tick_interval=args.tick)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    meetings = [scheduler.start_meeting(a, on_timer_update, on_task_complete, on_meeting_end)
+                for a in agendas]
+    per_meeting = (tracemalloc.get_traced_memory()[0] - before) / args.meetings
+    tracemalloc.stop()
+
+    threads_before = threading.active_count()
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    time.sleep(args.seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.monotonic() - wall_start
+
+    stats = scheduler.get_jitter_stats()
+    print(f"会议数: {args.meetings}, 刻度 {args.tick * 1e3:g} ms, 运行 {wall:.1f} 秒, "
+          f"线程数 {threads_before}")
+    print(f"显示回调: {updates[0]} ({updates[0] / wall:.0f}/秒), 完成任务 {completed[0]}, 结束会议 {ended[0]}")
+    print(f"触发抖动: 平均 {stats['avg'] * 1e3:.2f} ms, 最大 {stats['max'] * 1e3:.2f} ms "
+          f"({stats['count']} 次触发)")
+    print(f"CPU 占用: {cpu / wall:.1%}")
+    print(f"每场会议调度内存: {per_meeting:.0f} 字节")
+    for meeting in meetings:
+        meeting.stop_timer()
+    scheduler.shutdown()
+
+
+if __name__ == "__main__":
+    main()
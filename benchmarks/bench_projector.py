@@ -0,0 +1,108 @@
+"""投影模式渲染基准测试
+
+以 --hz 刷新率显示到十分之一秒的倒计时，运行 --seconds 秒，对比：
+    字体标签  一个大号字体的 tk.Label，每帧设置整串 "MM:SS.t" 文本
+    字形缓存  ProjectorView：预渲染的七段数码管图像，只替换变化的字符
+报告每帧耗时（含 Tk 重绘）、实际帧率与进程 CPU 占用。
+
+需要图形显示，无显示器的主机请用 xvfb-run 运行：
+    xvfb-run python benchmarks/bench_projector.py [--hz 10 30 60] [--seconds 5]
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import tkinter as tk  # noqa: E402
+from countdown_timer import TimerProgress  # noqa: E402
+from projector_view import ProjectorView  # noqa: E402
+
+
+class ClockProgress:
+    """按真实时间流逝的计时进度，代替正在运行的 CountdownTimer"""
+
+    def __init__(self, task_seconds=600, meeting_seconds=3600):
+        self.start = time.perf_counter()
+        self.task_seconds = task_seconds
+        self.meeting_seconds = meeting_seconds
+
+    def progress(self):
+        elapsed = time.perf_counter() - self.start
+        remaining = max(0.0, self.task_seconds - elapsed)
+        return TimerProgress(True, False, "季度规划", 2, 6, remaining, float(self.task_seconds),
+                             elapsed, remaining + self.meeting_seconds - self.task_seconds)
+
+
+def run_label(root, hz, seconds):
+    """对照组：大号字体标签每帧整串重设文本"""
+    window = tk.Toplevel(root, background="black")
+    window.geometry("1280x720")
+    label = tk.Label(window, font=("Arial", 220, "bold"), foreground="green", background="black")
+    label.pack(expand=True)
+    clock = ClockProgress()
+    costs = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        tenths = math.ceil(clock.progress().remaining * 10)
+        label.configure(text=f"{tenths // 600:02d}:{tenths // 10 % 60:02d}.{tenths % 10}")
+        window.update_idletasks()
+        costs.append(time.perf_counter() - start)
+        wait_until(root, start + 1 / hz)
+    window.destroy()
+    return costs
+
+
+def run_projector(root, hz, seconds):
+    view = ProjectorView(root, ClockProgress(), hz=hz, cpu_budget=1.0)
+    view.attributes("-fullscreen", False)
+    view.geometry("1280x720")
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        root.update()
+        time.sleep(0.001)
+    stats = view.get_stats()
+    view.close()
+    return stats
+
+
+def wait_until(root, deadline):
+    while time.perf_counter() < deadline:
+        root.update()
+        time.sleep(0.001)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hz", type=int, nargs="+", default=[10, 30, 60])
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"无法打开显示器（{e}），请使用 xvfb-run 运行本基准测试")
+    root.withdraw()
+
+    print(f"{'方式':>10}{'目标Hz':>8}{'实际帧率':>10}{'每帧平均(ms)':>14}{'每帧最长(ms)':>14}{'CPU':>8}")
+    for hz in args.hz:
+        cpu = time.process_time()
+        costs = run_label(root, hz, args.seconds)
+        cpu = (time.process_time() - cpu) / args.seconds
+        print(f"{'字体标签':>10}{hz:>8}{len(costs) / args.seconds:>10.1f}"
+              f"{sum(costs) / len(costs) * 1e3:>14.2f}{max(costs) * 1e3:>14.2f}{cpu:>8.0%}")
+
+        cpu = time.process_time()
+        stats = run_projector(root, hz, args.seconds)
+        cpu = (time.process_time() - cpu) / args.seconds
+        print(f"{'字形缓存':>10}{hz:>8}{stats['frames'] / args.seconds:>10.1f}"
+              f"{stats['avg'] * 1e3:>14.2f}{stats['max'] * 1e3:>14.2f}{cpu:>8.0%}"
+              f"  （替换字形 {stats['glyph_swaps']} 次）")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
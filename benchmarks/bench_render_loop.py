@@ -0,0 +1,161 @@
+"""倒计时渲染基准测试
+
+后台线程以 --rate 次/秒发布计时状态，界面线程每隔一秒卡顿 --stall 毫秒（模拟
+Tk 被其他工作阻塞）。对比两种方式：
+    逐次回调  每个状态 root.after(0, update_ui)，每次都 configure 全部控件
+    渲染循环  LatestSlot + RenderLoop，按帧只渲染最新状态、只更新变化的控件
+报告执行的回调/帧数、configure 次数、卡顿恢复后单次集中重放的最大回调数，
+以及最后一个状态发布后到显示出来的延迟。
+
+需要图形显示，无显示器的主机请用 xvfb-run 运行：
+    xvfb-run python benchmarks/bench_render_loop.py [--rate 100] [--seconds 5] [--stall 300]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import tkinter as tk  # noqa: E402
+from tkinter import ttk  # noqa: E402
+from render_loop import LatestSlot, RenderLoop  # noqa: E402
+
+
+def make_labels(root):
+    frame = ttk.Frame(root)
+    frame.pack()
+    labels = [ttk.Label(frame, text="") for _ in range(3)]
+    for label in labels:
+        label.pack()
+    return frame, labels
+
+
+def state_at(i, rate):
+    """第 i 个状态：任务名每 60 秒变化一次，剩余秒数每秒变化一次"""
+    elapsed = i // rate
+    remaining = 3600 - elapsed
+    return f"任务{elapsed // 60}", remaining // 60, remaining % 60, 1 + elapsed // 60
+
+
+def colour_of(minutes, seconds):
+    if minutes == 0 and seconds <= 30:
+        return "red"
+    return "orange" if minutes < 2 else "green"
+
+
+def publisher(rate, seconds, publish, done):
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    for i in range(rate * seconds):
+        delay = start + i * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        publish(i)
+    done.append(time.perf_counter())
+
+
+def stall_every_second(root, stall_ms, stop):
+    def stall():
+        if stop:
+            return
+        time.sleep(stall_ms / 1000)
+        root.after(1000, stall)
+    root.after(1000, stall)
+
+
+def run_legacy(root, rate, seconds, stall_ms):
+    frame, (task_label, time_label, progress_label) = make_labels(root)
+    counters = {"callbacks": 0, "configures": 0, "burst": 0, "max_burst": 0, "last": 0.0, "shown": -1}
+    window = [0.0]
+
+    def publish(i):
+        name, minutes, secs, num = state_at(i, rate)
+
+        def update_ui():
+            now = time.perf_counter()
+            if now - window[0] < 0.005:
+                counters["burst"] += 1
+            else:
+                counters["burst"] = 1
+            window[0] = now
+            counters["max_burst"] = max(counters["max_burst"], counters["burst"])
+            task_label.config(text=f"当前任务: {name}")
+            time_label.config(text=f"{minutes:02d}:{secs:02d}", foreground=colour_of(minutes, secs))
+            progress_label.config(text=f"任务进度: {num}/60")
+            counters["callbacks"] += 1
+            counters["configures"] += 4
+            counters["shown"] = i
+            counters["last"] = now
+        root.after(0, update_ui)
+
+    result = drive(root, rate, seconds, stall_ms, publish, lambda: counters["shown"])
+    frame.destroy()
+    return counters["callbacks"], counters["configures"], counters["max_burst"], result, counters["last"]
+
+
+def run_loop(root, rate, seconds, stall_ms):
+    frame, (task_label, time_label, progress_label) = make_labels(root)
+    slot = LatestSlot()
+    shown = [-1, 0.0]
+
+    def render(i):
+        name, minutes, secs, num = state_at(i, rate)
+        shown[0], shown[1] = i, time.perf_counter()
+        return {
+            task_label: {"text": f"当前任务: {name}"},
+            time_label: {"text": f"{minutes:02d}:{secs:02d}", "foreground": colour_of(minutes, secs)},
+            progress_label: {"text": f"任务进度: {num}/60"},
+        }
+
+    loop = RenderLoop(root, slot, render)
+    loop.start()
+    result = drive(root, rate, seconds, stall_ms, slot.publish, lambda: shown[0])
+    stats = loop.get_stats()
+    loop.stop()
+    frame.destroy()
+    return stats["frames"], stats["configures"], 1, result, shown[1], stats
+
+
+def drive(root, rate, seconds, stall_ms, publish, last_shown):
+    """运行发布线程，直到最后一个状态显示出来；返回最后一个状态发布的时刻"""
+    done = []
+    stop = []
+    stall_every_second(root, stall_ms, stop)
+    thread = threading.Thread(target=publisher, args=(rate, seconds, publish, done), daemon=True)
+    thread.start()
+    final = rate * seconds - 1
+    while not done or last_shown() != final:
+        root.update()
+        time.sleep(0.001)
+    stop.append(True)
+    return done[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=int, default=100, help="每秒发布的状态数")
+    parser.add_argument("--seconds", type=int, default=5)
+    parser.add_argument("--stall", type=int, default=300, help="界面线程每秒卡顿的毫秒数")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"无法打开显示器（{e}），请使用 xvfb-run 运行本基准测试")
+
+    published = args.rate * args.seconds
+    print(f"发布 {published} 个状态（{args.rate}/s），界面线程每秒卡顿 {args.stall} ms")
+    print(f"{'方式':>10}{'回调/帧':>10}{'configure':>12}{'最大集中重放':>14}{'末状态延迟(ms)':>16}")
+    callbacks, configures, burst, finished, last = run_legacy(root, args.rate, args.seconds, args.stall)
+    print(f"{'逐次回调':>10}{callbacks:>10}{configures:>12}{burst:>14}{(last - finished) * 1e3:>16.1f}")
+    frames, configures, burst, finished, last, stats = run_loop(root, args.rate, args.seconds, args.stall)
+    print(f"{'渲染循环':>10}{frames:>10}{configures:>12}{burst:>14}{(last - finished) * 1e3:>16.1f}")
+    print(f"渲染循环丢弃过期状态 {stats['dropped']} 个，省略 configure {stats['unchanged']} 次，"
+          f"每帧平均 {stats['avg'] * 1e6:.0f} µs、最长 {stats['max'] * 1e6:.0f} µs")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""会议快进模拟基准测试
+
+在虚拟时钟上运行 --hours 小时的议程，脚本每隔一段时间暂停/继续、加时或跳过：
+1. 分别在包含/不包含每秒显示回调时测量真实耗时与轨迹长度，并重复运行确认轨迹完全一致；
+2. 用按字数耗时的模拟语音引擎（见 bench_voice_queue）承接快进时密集到达的播报，
+   观察队列深度和被合并的过时播报数。
+
+用法: python benchmarks/bench_simulation.py [--hours 8] [--repeat 3] [--char-time 0.001]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_voice_queue import SimulatedVoiceService  # noqa: E402
+from meeting_simulation import COMMAND, MeetingSimulation  # noqa: E402
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+
+
+def build_agenda(hours: float) -> TaskList:
+    task_list = TaskList()
+    remaining = int(hours * 60)
+    i = 1
+    while remaining > 0:
+        minutes = min(remaining, 5 + (i * 7) % 20)
+        task_list.add(Task(name=f"议题{i}", minutes=minutes))
+        remaining -= minutes
+        i += 1
+    return task_list
+
+
+def build_simulation(task_list, hours, display, voice_service=None):
+    """每小时：第10分钟暂停2分钟，第30分钟加时5分钟，第50分钟跳过当前任务"""
+    simulation = MeetingSimulation(task_list, voice_service, display=display)
+    for hour in range(int(hours)):
+        base = hour * 3600
+        simulation.at(base + 600, "pause").at(base + 720, "resume")
+        simulation.at(base + 1800, "add_time", 5).at(base + 3000, "skip")
+    return simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=8.0, help="模拟议程时长（小时）")
+    parser.add_argument("--repeat", type=int, default=3, help="重复运行次数（检查轨迹一致）")
+    parser.add_argument("--char-time", type=float, default=0.001, help="模拟语音每个字的合成耗时（秒）")
+    args = parser.parse_args()
+
+    task_list = build_agenda(args.hours)
+    print(f"议程 {task_list.get_task_count()} 个议题，共 {task_list.get_total_time() / 60:.1f} 小时")
+    print(f"{'显示回调':>8}{'轨迹事件':>10}{'脚本命令':>10}{'会议时长(h)':>12}{'真实耗时(ms)':>14}{'轨迹一致':>10}")
+    for display in (False, True):
+        traces, walls = [], []
+        for _ in range(args.repeat):
+            simulation = build_simulation(task_list, args.hours, display)
+            start = time.perf_counter()
+            traces.append(simulation.run())
+            walls.append(time.perf_counter() - start)
+        trace = traces[0]
+        commands = sum(1 for event in trace if event.kind == COMMAND)
+        same = all(other == trace for other in traces[1:])
+        print(f"{'是' if display else '否':>8}{len(trace):>10}{commands:>10}{trace[-1].at / 3600:>12.2f}"
+              f"{min(walls) * 1e3:>14.1f}{'是' if same else '否':>10}")
+
+    voice = SimulatedVoiceService(args.char_time)
+    start = time.perf_counter()
+    build_simulation(task_list, args.hours, False, voice).run()
+    wall = time.perf_counter() - start
+    voice.speak("模拟结束", async_mode=False)
+    drained = time.perf_counter() - start
+    m = voice.get_metrics()
+    print(f"模拟语音：模拟耗时 {wall * 1e3:.1f} ms，播报队列排空 {drained * 1e3:.0f} ms；"
+          f"已播报 {m['spoken']} 条，合并/丢弃过时播报 {m['coalesced']} 条，最大队列深度 {m['max_queue_depth']}")
+    voice.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""SqliteTaskList 与内存 TaskList 吞吐量对比
+
+在不同规模下测量：批量导入（insert_many，一个事务）、逐个 add（每次一个事务）、
+随机移动（move，只改一行排序键）、总时长与按时长/名称的索引查询，以及重新打开数据库的耗时。
+
+用法: python benchmarks/bench_sqlite_task_list.py [--sizes 10000 100000] [--ops 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sqlite_task_list import SqliteTaskList  # noqa: E402
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(task_list, tasks, ops, rng):
+    """返回各项操作的每秒次数"""
+    results = {}
+    results["批量导入(行/s)"] = len(tasks) / timed(lambda: task_list.insert_many(0, tasks))
+    extra = [Task(f"追加{i}", 5) for i in range(ops)]
+    results["逐个add(次/s)"] = ops / timed(lambda: [task_list.add(task) for task in extra])
+    size = len(task_list)
+    moves = [(rng.randrange(size), rng.randrange(size)) for _ in range(ops)]
+    results["move(次/s)"] = ops / timed(lambda: [task_list.move(a, b) for a, b in moves])
+    results["总时长(次/s)"] = ops / timed(lambda: [task_list.get_total_time() for _ in range(ops)])
+    if isinstance(task_list, SqliteTaskList):
+        by_minutes = lambda: task_list.find_by_minutes(59, 60)  # noqa: E731
+        by_name = lambda: task_list.find_by_name("任务123")  # noqa: E731
+    else:
+        by_minutes = lambda: [t for t in task_list if 59 <= t.minutes <= 60]  # noqa: E731
+        by_name = lambda: [t for t in task_list if t.name.startswith("任务123")]  # noqa: E731
+    queries = max(1, ops // 100)
+    results["按时长查询(次/s)"] = queries / timed(lambda: [by_minutes() for _ in range(queries)])
+    results["按名称查询(次/s)"] = queries / timed(lambda: [by_name() for _ in range(queries)])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--ops", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            tasks = [Task(name=f"任务{i}", minutes=1 + i % 60) for i in range(size)]
+            memory = run(TaskList(), tasks, args.ops, random.Random(size))
+            path = os.path.join(tmp, f"{size}.db")
+            db = SqliteTaskList(path)
+            sqlite = run(db, tasks, args.ops, random.Random(size))
+            db.close()
+            reopen = timed(lambda: SqliteTaskList(path).close())
+
+            print(f"\n任务数 {size}")
+            print(f"{'操作':<16}{'内存TaskList':>16}{'SqliteTaskList':>16}")
+            for name in memory:
+                print(f"{name:<16}{memory[name]:>16.0f}{sqlite[name]:>16.0f}")
+            print(f"重新打开数据库: {reopen * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""TaskList 统计与刷新路径微基准测试
+
+对比界面原来的写法（get_all() 复制列表后再求长度/求和）与增量聚合、只读视图的写法，
+在不同列表规模下测量单次调用耗时，确认统计与每秒刷新路径不再随列表规模增长。
+
+用法: python benchmarks/bench_task_list.py [--sizes 1000 100000 1000000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+
+
+def legacy_stats(task_list: TaskList):
+    """旧版 _update_stats"""
+    total_tasks = len(task_list.get_all())
+    total_time = sum(task.minutes for task in task_list.get_all())
+    return total_tasks, total_time
+
+
+def new_stats(task_list: TaskList):
+    return task_list.get_task_count(), task_list.get_total_time()
+
+
+def legacy_tick(task_list: TaskList):
+    """旧版 _on_timer_update 每秒一次的进度计算"""
+    return len(task_list.get_all())
+
+
+def new_tick(task_list: TaskList):
+    return task_list.get_task_count()
+
+
+def legacy_lookup(task_list: TaskList, index: int):
+    """旧版 _edit_task 取单个任务"""
+    return task_list.get_all()[index]
+
+
+def new_lookup(task_list: TaskList, index: int):
+    return task_list[index]
+
+
+def _per_call(func, *args) -> float:
+    timer = timeit.Timer(lambda: func(*args))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'规模':>10}{'路径':>10}{'旧写法(µs)':>14}{'新写法(µs)':>14}{'加速比':>10}")
+    for size in args.sizes:
+        task_list = TaskList()
+        for i in range(size):
+            task_list.add(Task(name=f"任务{i}", minutes=1 + i % 60))
+        assert legacy_stats(task_list) == new_stats(task_list)
+        for name, legacy, new, extra in (("统计", legacy_stats, new_stats, ()),
+                                         ("刷新", legacy_tick, new_tick, ()),
+                                         ("取任务", legacy_lookup, new_lookup, (size // 2,))):
+            old_t = _per_call(legacy, task_list, *extra) * 1e6
+            new_t = _per_call(new, task_list, *extra) * 1e6
+            print(f"{size:>10}{name:>10}{old_t:>14.2f}{new_t:>14.3f}{old_t / new_t:>10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""长议程任务切换基准测试
+
+用大量 1 分钟短任务（例如自动生成的站会轮换）驱动 CountdownTimer，
+检查栈深度和线程数保持恒定，并报告任务切换延迟。
+等待被替换为直接推进虚拟时间，因此议程可以远快于真实时间跑完。
+
+用法: python benchmarks/bench_transitions.py [--tasks 100000]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from countdown_timer import CountdownTimer  # noqa: E402
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+from voice_service import VoiceService  # noqa: E402
+
+
+class SkipAheadTime:
+    """真实时间加上被"跳过"的等待时间：有超时的等待不阻塞，直接把时钟推进到截止时刻"""
+
+    def __init__(self):
+        self._offset = 0.0
+
+    def monotonic(self) -> float:
+        return time.monotonic() + self._offset
+
+    def time(self) -> float:
+        return time.time() + self._offset
+
+    def sleep(self, seconds: float):
+        self._offset += max(0.0, seconds)
+
+    def wait(self, cond: threading.Condition, timeout):
+        if timeout is None:
+            cond.wait()
+        else:
+            self.sleep(timeout)
+
+
+def _stack_depth() -> int:
+    depth = 0
+    frame = sys._getframe()
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000, help="议程任务数")
+    args = parser.parse_args()
+
+    task_list = TaskList()
+    for i in range(args.tasks):
+        task_list.add(Task(name=f"成员{i % 12 + 1} 汇报", minutes=1))
+
+    depths = set()
+    thread_counts = set()
+    done = threading.Event()
+    completed = [0]
+
+    def on_task_complete(task_name):
+        completed[0] += 1
+        if completed[0] % 1000 == 1:
+            depths.add(_stack_depth())
+            thread_counts.add(threading.active_count())
+
+    timer = CountdownTimer(task_list, VoiceService(enabled=False), SkipAheadTime())
+    start = time.perf_counter()
+    timer.start_meeting(None, on_task_complete, lambda total: done.set())
+    done.wait()
+    wall = time.perf_counter() - start
+
+    stats = timer.get_transition_stats()
+    print(f"任务数: {args.tasks}, 完成: {completed[0]}, 真实耗时: {wall:.2f} 秒")
+    print(f"回调栈深度: {sorted(depths)}")
+    print(f"活动线程数: {sorted(thread_counts)}")
+    print(f"任务切换延迟: 次数 {stats['count']}, 平均 {stats['avg'] * 1e6:.1f} µs, "
+          f"最大 {stats['max'] * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
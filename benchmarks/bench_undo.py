@@ -0,0 +1,125 @@
+"""撤销历史基准测试
+
+1. 快照成本：对比 UndoHistory（持久化序列，O(1) 快照）与每次编辑前复制整个列表
+   的朴素做法，在 --size 个任务的列表上执行 --edits 次单个编辑的耗时与历史占用内存。
+2. 撤销/重做耗时：添加、删除、批量删除、修改、清空、导入（清空 + 插入）各一步。
+
+用法: python benchmarks/bench_undo.py [--size 1000000] [--edits 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+from undo_history import UndoHistory  # noqa: E402
+
+
+def fill(size):
+    task_list = TaskList()
+    task_list.insert_many(0, [Task(name=f"任务{i}", minutes=1 + i % 60) for i in range(size)])
+    return task_list
+
+
+def edit(task_list, rng, i):
+    size = len(task_list)
+    r = rng.random()
+    if r < 0.4:
+        task_list.update(rng.randrange(size), Task(f"修改{i}", 5))
+    elif r < 0.7:
+        task_list.insert(rng.randrange(size), Task(f"新增{i}", 3))
+    else:
+        task_list.delete(rng.randrange(size))
+
+
+class CopyHistory:
+    """朴素撤销：每次修改前复制整个列表"""
+
+    def __init__(self, task_list, max_steps=100):
+        self.task_list = task_list
+        self.max_steps = max_steps
+        self.snapshots = []
+
+    def record(self):
+        self.snapshots.append(self.task_list.get_all())
+        del self.snapshots[:-self.max_steps]
+
+
+def run_edits(task_list, edits, history):
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for i in range(edits):
+        if isinstance(history, CopyHistory):
+            history.record()
+        edit(task_list, rng, i)
+    return time.perf_counter() - start
+
+
+def measure_edits(size, edits, make_history):
+    """返回 (耗时, 历史占用内存)；内存单独再跑一遍，避免 tracemalloc 拖慢计时"""
+    task_list = fill(size)
+    elapsed = run_edits(task_list, edits, make_history(task_list))
+    task_list = fill(size)
+    tracemalloc.start()
+    history = make_history(task_list)
+    run_edits(task_list, edits, history)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, memory
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--edits", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"列表 {args.size} 个任务，{args.edits} 次单个编辑（历史上限 100 步）")
+    print(f"{'方式':>12}{'耗时(s)':>10}{'每次编辑(µs)':>16}{'历史内存(MB)':>16}")
+    for label, make_history in (("无撤销", lambda task_list: None), ("持久化序列", UndoHistory),
+                                ("每次复制", CopyHistory)):
+        elapsed, memory = measure_edits(args.size, args.edits, make_history)
+        print(f"{label:>12}{elapsed:>10.2f}{elapsed / args.edits * 1e6:>16.1f}{memory / 2**20:>16.1f}")
+
+    task_list = fill(args.size)
+    history = UndoHistory(task_list)
+    rng = random.Random(1)
+    steps = [
+        ("添加", lambda: task_list.add(Task("新任务", 5))),
+        ("删除", lambda: task_list.delete(len(task_list) // 2)),
+        ("批量删除 1%", lambda: task_list.delete_many(rng.sample(range(len(task_list)), len(task_list) // 100))),
+        ("修改", lambda: task_list.update(len(task_list) // 3, Task("改名", 7))),
+        ("清空", task_list.clear),
+    ]
+
+    def import_csv():
+        with history.group():
+            task_list.clear()
+            task_list.insert_many(0, [Task(f"导入{i}", 10) for i in range(args.size)])
+    steps.append(("导入", import_csv))
+
+    print(f"\n{'操作':>12}{'执行(ms)':>12}{'撤销(ms)':>12}{'重做(ms)':>12}")
+    for label, func in steps:
+        expected = task_list.get_all()
+        do_t = timed(func)
+        after = task_list.get_all()
+        undo_t = timed(history.undo)
+        assert task_list.get_all() == expected
+        redo_t = timed(history.redo)
+        assert task_list.get_all() == after
+        print(f"{label:>12}{do_t:>12.1f}{undo_t:>12.1f}{redo_t:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
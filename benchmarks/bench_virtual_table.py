@@ -0,0 +1,62 @@
+"""虚拟滚动任务表格基准测试
+
+在不同列表规模下测量 VirtualTaskTable 的首次渲染、单次滚动重绘耗时，
+以及 Treeview 中实际创建的条目数量，确认两者都不随任务数量增长。
+
+需要图形显示，无显示器的主机请用 xvfb-run 运行：
+    xvfb-run python benchmarks/bench_virtual_table.py [--sizes 1000 100000 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import tkinter as tk  # noqa: E402
+from task import Task  # noqa: E402
+from task_list import TaskList  # noqa: E402
+from virtual_task_table import VirtualTaskTable  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    parser.add_argument("--scrolls", type=int, default=200, help="每种规模随机滚动的次数")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"无法打开显示器（{e}），请使用 xvfb-run 运行本基准测试")
+    root.geometry("500x400")
+
+    print(f"{'规模':>10}{'首次渲染(ms)':>16}{'滚动平均(ms)':>16}{'滚动最长(ms)':>16}{'Tk条目数':>10}")
+    for size in args.sizes:
+        task_list = TaskList()
+        for i in range(size):
+            task_list.add(Task(name=f"任务{i}", minutes=1 + i % 60))
+
+        start = time.perf_counter()
+        table = VirtualTaskTable(root, task_list)
+        table.pack(fill="both", expand=True)
+        root.update()
+        first = time.perf_counter() - start
+
+        rng = random.Random(size)
+        costs = []
+        for _ in range(args.scrolls):
+            start = time.perf_counter()
+            table._on_scrollbar("moveto", rng.random())
+            root.update_idletasks()
+            costs.append(time.perf_counter() - start)
+        items = len(table.tree.get_children())
+        print(f"{size:>10}{first * 1e3:>16.1f}{sum(costs) / len(costs) * 1e3:>16.3f}"
+              f"{max(costs) * 1e3:>16.3f}{items:>10}")
+        table.destroy()
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""语音播报队列基准测试
+
+模拟一场任务切换频繁、不断有人跳过任务的会议：播报请求到达得比合成更快，
+观察单一语音工作线程下的队列深度、排队等待时间、合成时间和被合并的过时播报数。
+合成由按字数耗时的模拟引擎完成，因此无需声卡即可运行。
+
+用法: python benchmarks/bench_voice_queue.py [--boundaries 200] [--interval 0.05]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from voice_service import PRIORITY_LOW, TASK_BOUNDARY_KEY, VoiceService  # noqa: E402
+
+
+class SimulatedEngine:
+    """按字数耗时的模拟 TTS 引擎，并检查是否被多个线程同时使用"""
+
+    def __init__(self, seconds_per_char: float):
+        self.seconds_per_char = seconds_per_char
+        self._text = ""
+        self._busy = threading.Lock()
+        self.collisions = 0
+
+    def say(self, text):
+        self._text = text
+
+    def runAndWait(self):
+        if not self._busy.acquire(blocking=False):
+            self.collisions += 1
+            return
+        try:
+            time.sleep(len(self._text) * self.seconds_per_char)
+        finally:
+            self._busy.release()
+
+    def stop(self):
+        pass
+
+
+class SimulatedVoiceService(VoiceService):
+    def __init__(self, seconds_per_char: float):
+        self._engine_factory = lambda: SimulatedEngine(seconds_per_char)
+        super().__init__(cache_path=None, audio_cache_dir=None)
+
+    def _initialize_engine(self):
+        self.engine = self._engine_factory()
+        self.ready.set_result(True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--boundaries", type=int, default=200, help="任务切换次数")
+    parser.add_argument("--interval", type=float, default=0.05, help="任务切换间隔（秒）")
+    parser.add_argument("--skip-ratio", type=float, default=0.3, help="被跳过的任务比例")
+    parser.add_argument("--char-time", type=float, default=0.01, help="每个字的合成耗时（秒）")
+    args = parser.parse_args()
+
+    random.seed(1)
+    voice = SimulatedVoiceService(args.char_time)
+    voice.announce_meeting_start(args.boundaries, args.boundaries * 5)
+    for i in range(args.boundaries):
+        if random.random() < args.skip_ratio:
+            voice.discard(TASK_BOUNDARY_KEY)
+        else:
+            voice.announce_task_completion(f"议题{i}", f"议题{i + 1}")
+        if i % 25 == 0:
+            voice.speak("这是一次语音功能测试！", priority=PRIORITY_LOW)
+        time.sleep(args.interval)
+    voice.speak("会议已结束，辛苦了！", async_mode=False)
+
+    m = voice.get_metrics()
+    print(f"任务切换 {args.boundaries} 次，间隔 {args.interval * 1e3:g} ms，跳过比例 {args.skip_ratio:.0%}")
+    print(f"已播报 {m['spoken']} 条，合并/丢弃过时播报 {m['coalesced']} 条，"
+          f"最大队列深度 {m['max_queue_depth']}，引擎并发冲突 {voice.engine.collisions} 次")
+    print(f"排队等待: 平均 {m['avg_wait'] * 1e3:.1f} ms, 最大 {m['max_wait'] * 1e3:.1f} ms")
+    print(f"合成耗时: 平均 {m['avg_synthesis'] * 1e3:.1f} ms, 最大 {m['max_synthesis'] * 1e3:.1f} ms")
+    voice.shutdown()
+
+
+if __name__ == "__main__":
+    main()
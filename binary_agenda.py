@@ -0,0 +1,301 @@
+"""内存映射的二进制议程格式
+
+文件布局（小端序）：
+    文件头      64 字节：魔数、版本、标志位、任务数、总时长、字符串堆大小
+    时长列      任务数 × uint32
+    偏移表      (2 × 任务数 + 1) × uint32，8 字节对齐；第 2i、2i+1 项分别是
+                第 i 个任务名称和笔记在字符串堆中的起始偏移，下一项即结束偏移；
+                字符串堆超过 4 GiB 时改用 uint64，并在文件头标志位中注明
+    字符串堆    UTF-8 编码的名称与笔记，依次紧密排列
+
+打开时只做 mmap 和文件头校验，时长与偏移表通过 memoryview 直接读取映射内存，
+名称和笔记在访问时才解码，加载时间与任务数量无关。
+
+用法: python -m binary_agenda 输入.csv 输出.agenda   （或反向转换）
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Sequence
+from operator import attrgetter
+from typing import Callable, Iterator, List, Optional
+from task import Task
+from task_csv import (MINUTES_COLUMN, NAME_COLUMN, NOTES_COLUMN, CsvFormatError, ExportResult,
+                      ImportResult, stream_tasks, write_tasks)
+
+AGENDA_EXTENSION = ".agenda"
+MAGIC = b"MTAGENDA"
+VERSION = 1
+HEADER = struct.Struct("<8sHHQQQ")  # 魔数、版本、标志位、任务数、总时长、字符串堆大小
+HEADER_SIZE = 64
+FLAG_WIDE_OFFSETS = 0x1             # 偏移表使用 uint64
+
+
+class AgendaFormatError(ValueError):
+    """文件不是有效的二进制议程"""
+
+
+def _layout(count: int, offset_width: int):
+    """返回 (时长列偏移, 偏移表偏移, 字符串堆偏移)"""
+    minutes_at = HEADER_SIZE
+    offsets_at = (minutes_at + 4 * count + 7) & ~7
+    heap_at = offsets_at + offset_width * (2 * count + 1)
+    return minutes_at, offsets_at, heap_at
+
+
+def _to_little_endian(column: array) -> array:
+    if sys.byteorder != "little":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def _record(name: str, minutes: int, notes: str = "") -> tuple:
+    return name, minutes, notes
+
+
+def write_agenda(file_path: str, records, row: Callable[[object], tuple] = tuple,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 cancel_event: Optional[threading.Event] = None,
+                 chunk_size: int = 10000) -> ExportResult:
+    """把任务写入二进制议程文件
+
+    row 把每个元素转换为 (名称, 时长[, 笔记]) 元组，默认元素本身就是这样的序列。
+    与 write_tasks 一样先写临时文件，完成后原子替换目标文件。
+    """
+    total = len(records)
+    minutes = array('I')
+    offsets = array('Q', [0])
+    heap = bytearray()
+    for index, record in enumerate(records, 1):
+        fields = row(record)
+        minutes.append(fields[1])
+        heap += fields[0].encode("utf-8")
+        offsets.append(len(heap))
+        if len(fields) > 2 and fields[2]:
+            heap += fields[2].encode("utf-8")
+        offsets.append(len(heap))
+        if index % chunk_size == 0:
+            if cancel_event is not None and cancel_event.is_set():
+                return ExportResult(file_path, 0, cancelled=True)
+            if progress is not None:
+                progress(index, total)
+
+    count = len(minutes)
+    flags = 0
+    if len(heap) >= 1 << 32:
+        flags |= FLAG_WIDE_OFFSETS
+    else:
+        offsets = array('I', offsets)
+    minutes_at, offsets_at, heap_at = _layout(count, offsets.itemsize)
+    temp_path = file_path + ".tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            header = HEADER.pack(MAGIC, VERSION, flags, count, sum(minutes), len(heap))
+            file.write(header.ljust(HEADER_SIZE, b"\0"))
+            file.write(_to_little_endian(minutes).tobytes())
+            file.write(b"\0" * (offsets_at - minutes_at - 4 * count))
+            file.write(_to_little_endian(offsets).tobytes())
+            file.write(heap)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    if progress is not None:
+        progress(total, total)
+    return ExportResult(file_path, count)
+
+
+class _RecordView(Sequence):
+    """MappedAgenda 的 (名称, 时长, 笔记) 元组视图"""
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: "MappedAgenda"):
+        self._owner = owner
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._owner.record(i) for i in range(*index.indices(len(self)))]
+        return self._owner.record(index)
+
+    def __len__(self) -> int:
+        return len(self._owner)
+
+
+class MappedAgenda:
+    """以 mmap 方式打开的只读议程，提供 TaskList 的只读接口
+
+    可以直接交给 CountdownTimer 使用；需要编辑时先复制到 TaskList 或 CompactTaskList。
+    使用完毕后调用 close()（或使用 with 语句）释放映射。
+    """
+
+    def __init__(self, file_path: str):
+        self.path = file_path
+        self._file = open(file_path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < HEADER_SIZE:
+                raise AgendaFormatError(f"文件过短，不是二进制议程: {file_path}")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+        magic, version, flags, count, total_minutes, heap_size = HEADER.unpack_from(self._mmap, 0)
+        offset_type = 'Q' if flags & FLAG_WIDE_OFFSETS else 'I'
+        minutes_at, offsets_at, heap_at = _layout(count, array(offset_type).itemsize)
+        if magic != MAGIC or version != VERSION or heap_at + heap_size != size:
+            self._mmap.close()
+            self._file.close()
+            raise AgendaFormatError(f"无效或已损坏的二进制议程: {file_path}")
+
+        self._count = count
+        self._total_minutes = total_minutes
+        self._buffer = memoryview(self._mmap)
+        if sys.byteorder == "little":
+            self._minutes = self._buffer[minutes_at:minutes_at + 4 * count].cast('I')
+            self._offsets = self._buffer[offsets_at:heap_at].cast(offset_type)
+        else:
+            # 大端机器上无法零拷贝，读入后转换字节序
+            self._minutes = _to_little_endian(array('I', self._buffer[minutes_at:minutes_at + 4 * count]))
+            self._offsets = _to_little_endian(array(offset_type, self._buffer[offsets_at:heap_at]))
+        self._heap = self._buffer[heap_at:]
+
+    def close(self):
+        if self._buffer is None:
+            return
+        for view in (self._minutes, self._offsets, self._heap, self._buffer):
+            if isinstance(view, memoryview):
+                view.release()
+        self._buffer = None
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedAgenda":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("任务索引超出范围")
+        return index
+
+    def _string(self, slot: int) -> str:
+        offsets = self._offsets
+        return str(self._heap[offsets[slot]:offsets[slot + 1]], "utf-8")
+
+    def name(self, index: int) -> str:
+        return self._string(2 * self._index(index))
+
+    def notes(self, index: int) -> str:
+        return self._string(2 * self._index(index) + 1)
+
+    def minutes(self, index: int) -> int:
+        return self._minutes[self._index(index)]
+
+    def record(self, index: int) -> tuple:
+        """(名称, 时长, 笔记)"""
+        index = self._index(index)
+        return self._string(2 * index), self._minutes[index], self._string(2 * index + 1)
+
+    def records(self) -> _RecordView:
+        return _RecordView(self)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        index = self._index(index)
+        return Task(self._string(2 * index), self._minutes[index])
+
+    def __iter__(self) -> Iterator[Task]:
+        for index in range(self._count):
+            yield Task(self._string(2 * index), self._minutes[index])
+
+    def get_all(self) -> List[Task]:
+        return list(self)
+
+    def view(self) -> "MappedAgenda":
+        """本身就是只读的，直接返回自身"""
+        return self
+
+    def get_total_time(self) -> int:
+        """获取总时长（O(1)，保存在文件头中）"""
+        return self._total_minutes
+
+    def get_task_count(self) -> int:
+        return self._count
+
+    def export_to_list(self) -> List[dict]:
+        return [{"name": task.name, "minutes": task.minutes} for task in self]
+
+    # 只读议程不会变化，保留订阅接口以便与 TaskList 互换
+    def add_listener(self, listener):
+        pass
+
+    def remove_listener(self, listener):
+        pass
+
+
+def csv_to_agenda(csv_path: str, agenda_path: str,
+                  progress: Optional[Callable[[int, int], None]] = None,
+                  cancel_event: Optional[threading.Event] = None) -> ImportResult:
+    """把 任务名称,时长(分钟)[,笔记] 格式的CSV转换为二进制议程，无效行按导入规则跳过"""
+    result = stream_tasks(csv_path, task_factory=_record, extra_columns=(NOTES_COLUMN,),
+                          progress=progress, cancel_event=cancel_event)
+    if not result.cancelled:
+        write_agenda(agenda_path, result.tasks)
+    return result
+
+
+def agenda_to_csv(agenda_path: str, csv_path: str,
+                  progress: Optional[Callable[[int, int], None]] = None,
+                  cancel_event: Optional[threading.Event] = None) -> ExportResult:
+    """把二进制议程转换为 任务名称,时长(分钟),笔记 格式的CSV"""
+    with MappedAgenda(agenda_path) as agenda:
+        return write_tasks(csv_path, agenda.records(), columns=(NAME_COLUMN, MINUTES_COLUMN, NOTES_COLUMN),
+                           row=tuple, progress=progress, cancel_event=cancel_event)
+
+
+def write_task_list(file_path: str, task_list) -> ExportResult:
+    """把 TaskList / CompactTaskList 保存为二进制议程（没有笔记）"""
+    return write_agenda(file_path, task_list.view(), row=attrgetter("name", "minutes"))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m binary_agenda",
+                                     description="在CSV与二进制议程之间转换")
+    parser.add_argument("source", help="输入文件（.csv 或 .agenda）")
+    parser.add_argument("target", help="输出文件")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.source.endswith(AGENDA_EXTENSION):
+            result = agenda_to_csv(args.source, args.target)
+            print(f"已写入 {result.rows} 个任务到 {args.target}")
+        else:
+            result = csv_to_agenda(args.source, args.target)
+            for error in result.errors:
+                print(error, file=sys.stderr)
+            print(f"已写入 {len(result.tasks)} 个任务到 {args.target}，跳过 {result.error_count} 行")
+    except (OSError, CsvFormatError, AgendaFormatError) as e:
+        print(f"转换失败: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""计时器使用的时钟
+
+CountdownTimer 只通过时钟读取时间（monotonic）和等待（wait），不直接调用 time 模块：
+    SystemClock   真实时间，wait 就是条件变量上的超时等待
+    VirtualClock  虚拟时间，wait 不阻塞，直接把时钟推进到超时时刻或下一个预定事件，
+                  配合 CountdownTimer.run_meeting 可以在几毫秒内快进跑完整场会议
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class SystemClock:
+    """真实的单调时钟"""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def wait(self, cond: threading.Condition, timeout: Optional[float]):
+        """在条件变量上等待至多 timeout 秒，None 表示一直等到被唤醒（调用方需持有锁）"""
+        cond.wait(timeout)
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+class VirtualClock:
+    """单线程快进用的虚拟时钟
+
+    call_at/call_later 预定的事件按（时刻, 预定顺序）依次执行，同样的预定总是得到
+    同样的执行顺序。wait 在调用方线程中执行到期事件：事件可以调用计时器的控制方法
+    （锁是可重入的），投递的命令在 wait 返回后由计时器立即处理。
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self._events: List[Tuple[float, int, Callable[[], None]]] = []
+        self._seq = itertools.count()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def call_at(self, when: float, func: Callable[[], None]):
+        heapq.heappush(self._events, (when, next(self._seq), func))
+
+    def call_later(self, delay: float, func: Callable[[], None]):
+        self.call_at(self.now + delay, func)
+
+    def advance(self, seconds: float):
+        """推进 seconds 秒，途中到期的事件按顺序执行"""
+        target = self.now + max(0.0, seconds)
+        while self._events and self._events[0][0] <= target:
+            self._run_next()
+        self.now = target
+
+    def wait(self, cond: threading.Condition, timeout: Optional[float]):
+        """推进到超时时刻；其间有预定事件时只推进到该事件并执行，随后返回（相当于被唤醒）"""
+        target = None if timeout is None else self.now + max(0.0, timeout)
+        if self._events and (target is None or self._events[0][0] <= target):
+            self._run_next()
+        elif target is None:
+            raise RuntimeError("虚拟时钟上无限期等待，但没有预定事件可以唤醒（例如暂停后没有继续）")
+        else:
+            self.now = target
+
+    def _run_next(self):
+        when, _, func = heapq.heappop(self._events)
+        self.now = max(self.now, when)
+        func()
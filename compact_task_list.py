@@ -0,0 +1,183 @@
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Tuple
+from task import Task
+from task_list import INSERTED, MOVED, REMOVED, RESET, UPDATED, ChangeNotifier, _kept_runs, _valid_indices
+
+
+class CompactTaskListView(Sequence):
+    """CompactTaskList 的只读视图，访问时才生成 Task 对象"""
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: "CompactTaskList"):
+        self._owner = owner
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._owner[i] for i in range(*index.indices(len(self)))]
+        return self._owner[index]
+
+    def __len__(self) -> int:
+        return len(self._owner)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._owner)
+
+
+class CompactTaskList(ChangeNotifier):
+    """数组存储的 TaskList，接口与 TaskList 相同，用于数百万行的大型议程
+
+    时长存放在无符号整型 array 中，任务名称存入驻留字符串表，
+    每个任务只占两个整数（约 8 字节），没有逐个 Task 对象和 __dict__ 的开销；
+    Task 对象只在读取时临时生成。名称表只增不减，删除任务不会回收名称。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._minutes = array('I')
+        self._name_ids = array('I')
+        self._names: List[str] = []            # 名称 id -> 名称
+        self._name_index: Dict[str, int] = {}  # 名称 -> 名称 id
+        self._total_minutes = 0
+
+    def _intern(self, name: str) -> int:
+        name_id = self._name_index.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._names.append(name)
+            self._name_index[name] = name_id
+        return name_id
+
+    def add(self, task: Task):
+        self._minutes.append(task.minutes)
+        self._name_ids.append(self._intern(task.name))
+        self._total_minutes += task.minutes
+        self._notify(INSERTED, len(self._minutes) - 1)
+
+    def insert(self, index: int, task: Task):
+        """在指定位置插入任务"""
+        index = max(0, min(index, len(self._minutes)))
+        self._minutes.insert(index, task.minutes)
+        self._name_ids.insert(index, self._intern(task.name))
+        self._total_minutes += task.minutes
+        self._notify(INSERTED, index)
+
+    def insert_many(self, index: int, tasks: Iterable[Task]):
+        """在指定位置一次插入多个任务，只发出一次通知"""
+        tasks = list(tasks)
+        if not tasks:
+            return
+        index = max(0, min(index, len(self._minutes)))
+        minutes = array('I', (task.minutes for task in tasks))
+        self._minutes[index:index] = minutes
+        self._name_ids[index:index] = array('I', (self._intern(task.name) for task in tasks))
+        self._total_minutes += sum(minutes)
+        self._notify(INSERTED, index, len(tasks))
+
+    def move(self, index: int, new_index: int):
+        """把任务从 index 移动到 new_index"""
+        if 0 <= index < len(self._minutes) and 0 <= new_index < len(self._minutes) and index != new_index:
+            self._minutes.insert(new_index, self._minutes.pop(index))
+            self._name_ids.insert(new_index, self._name_ids.pop(index))
+            self._notify(MOVED, index, 1, new_index)
+
+    def get_all(self) -> List[Task]:
+        return list(self)
+
+    def view(self) -> CompactTaskListView:
+        """返回只读视图（不复制），随列表变化而变化"""
+        return CompactTaskListView(self)
+
+    def __iter__(self) -> Iterator[Task]:
+        names = self._names
+        for name_id, minutes in zip(self._name_ids, self._minutes):
+            yield Task(names[name_id], minutes)
+
+    def __len__(self) -> int:
+        return len(self._minutes)
+
+    def __getitem__(self, index: int) -> Task:
+        return Task(self._names[self._name_ids[index]], self._minutes[index])
+
+    def delete(self, index: int):
+        """删除指定索引的任务"""
+        if 0 <= index < len(self._minutes):
+            self._total_minutes -= self._minutes.pop(index)
+            self._name_ids.pop(index)
+            self._notify(REMOVED, index)
+
+    def delete_many(self, indices: Iterable[int]):
+        """一次删除多个任务（O(n)），只发出一次通知"""
+        indices = _valid_indices(indices, len(self._minutes))
+        if not indices:
+            return
+        self._total_minutes -= sum(self._minutes[i] for i in indices)
+        first, last = indices[0], indices[-1]
+        if last - first + 1 == len(indices):
+            # 连续区间直接切片删除
+            del self._minutes[first:last + 1]
+            del self._name_ids[first:last + 1]
+        else:
+            minutes, name_ids = array('I'), array('I')
+            for start, end in _kept_runs(indices, len(self._minutes)):
+                minutes += self._minutes[start:end]
+                name_ids += self._name_ids[start:end]
+            self._minutes, self._name_ids = minutes, name_ids
+        self._notify(REMOVED, indices[0], len(indices), indices=tuple(indices))
+
+    def clear(self):
+        """清空所有任务"""
+        self._minutes = array('I')
+        self._name_ids = array('I')
+        self._names.clear()
+        self._name_index.clear()
+        self._total_minutes = 0
+        self._notify(RESET)
+
+    def update(self, index: int, updated_task: Task):
+        """更新指定索引的任务"""
+        if 0 <= index < len(self._minutes):
+            self._total_minutes += updated_task.minutes - self._minutes[index]
+            self._minutes[index] = updated_task.minutes
+            self._name_ids[index] = self._intern(updated_task.name)
+            self._notify(UPDATED, index)
+
+    def update_many(self, updates: Iterable[Tuple[int, Task]]):
+        """一次修改多个任务，updates 为 (索引, 新任务) 序列，只发出一次通知"""
+        size = len(self._minutes)
+        changed = {}
+        for index, task in updates:
+            if 0 <= index < size:
+                changed[index] = task
+        if not changed:
+            return
+        for index, task in changed.items():
+            self._total_minutes += task.minutes - self._minutes[index]
+            self._minutes[index] = task.minutes
+            self._name_ids[index] = self._intern(task.name)
+        indices = tuple(sorted(changed))
+        self._notify(UPDATED, indices[0], len(indices), indices=indices)
+
+    def get_total_time(self) -> int:
+        """获取总时长（O(1)）"""
+        return self._total_minutes
+
+    def get_task_count(self) -> int:
+        """获取任务数量（O(1)）"""
+        return len(self._minutes)
+
+    def export_to_list(self) -> List[dict]:
+        """导出为字典列表（用于CSV导出）"""
+        names = self._names
+        return [{"name": names[name_id], "minutes": minutes}
+                for name_id, minutes in zip(self._name_ids, self._minutes)]
+
+    def import_from_list(self, data: List[dict]):
+        """从字典列表导入"""
+        self._names.clear()
+        self._name_index.clear()
+        intern = self._intern
+        self._minutes = array('I', (item["minutes"] for item in data))
+        self._name_ids = array('I', (intern(item["name"]) for item in data))
+        self._total_minutes = sum(self._minutes)
+        self._notify(RESET)
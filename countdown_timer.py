@@ -1,131 +1,445 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
+import logging
+import math
 import threading
-import time
-from datetime import datetime, timedelta
+from collections import deque
+from typing import NamedTuple
+from clock import SYSTEM_CLOCK
 from task_list import TaskList
-from voice_service import VoiceService
+from voice_service import MEETING_END_MESSAGE, TASK_BOUNDARY_KEY, VoiceService
+
+
+class TimerProgress(NamedTuple):
+    """某一时刻的计时进度（秒为浮点数），供高刷新率显示读取"""
+    running: bool
+    paused: bool
+    task_name: str
+    task_number: int          # 从 1 开始
+    task_count: int
+    remaining: float          # 当前任务剩余秒数
+    task_duration: float      # 当前任务总秒数（含加时）
+    meeting_elapsed: float    # 会议已用秒数（不含暂停）
+    meeting_remaining: float  # 当前任务剩余 + 之后各任务的时长
 
 
 class CountdownTimer:
-    def __init__(self, task_list: TaskList, voice_service: VoiceService):
+    # 提前预渲染多少个任务的完成播报
+    PRERENDER_AHEAD = 10
+
+    # 控制命令：暂停、继续、加时和停止在调用方线程中持锁立即生效，
+    # 跳过需要工作线程切换任务，经命令队列投递
+    CMD_PAUSE = "pause"
+    CMD_RESUME = "resume"
+    CMD_SKIP = "skip"
+    CMD_STOP = "stop"
+    CMD_ADD_TIME = "add_time"
+
+    def __init__(self, task_list: TaskList, voice_service: VoiceService, clock=SYSTEM_CLOCK):
         self.task_list = task_list
         self.voice_service = voice_service
+        # 所有读时间与等待都经过时钟，VirtualClock 可以快进模拟整场会议
+        self.clock = clock
         self.current_task_index = 0
         self.is_running = False
         self.is_paused = False
-        self.remaining_time = 0
-        self.total_elapsed_time = 0
+        # 基于 clock.monotonic() 的绝对截止时间：剩余时间总是由截止时间推算，
+        # 每次刷新只负责显示，不会因回调或调度延迟而累积误差
+        self._lock = threading.RLock()
+        self._deadline = None            # 当前任务的截止时刻（单调时钟）
+        self._paused_remaining = 0.0     # 暂停时冻结的剩余秒数
+        self._elapsed_base = 0.0         # 已结束的计时段累计秒数
+        self._segment_start = None       # 当前计时段开始时刻，暂停/停止时为 None
+        self._task_name = ""
+        self._task_duration = 0.0        # 当前任务总秒数（含加时）
+        self._task_count = 0
+        self._remaining_after = 0        # 当前任务之后各任务的总秒数
+        # 窗口不可见时关闭显示刷新，工作线程只在任务边界或命令到达时醒来
+        self._display_active = True
+        self._wakeups = 0                # 工作线程从等待中醒来的次数
+
+        # 常驻工作线程：每个计时器只有一个，迭代地遍历议程
+        # 命令通道与状态共用同一把锁，工作线程在条件变量上等待，
+        # 命令到达或显示值需要变化时才被唤醒，暂停期间不占用CPU
+        self._cond = threading.Condition(self._lock)
+        self._worker = None
+        self._pending = None             # 待运行的会议参数
+        self._generation = 0             # 会议代号，新会议开始后旧会议自动退出
+        self._commands = deque()         # 待工作线程处理的 (命令, 投递时刻)
+        self._changes = 0                # 控制命令改变计时状态的次数，工作线程据此重新计算等待
+        self._transition_count = 0
+        self._transition_total = 0.0
+        self._transition_max = 0.0
+        self._command_latency = {}       # 命令 -> [次数, 总延迟, 最大延迟]
+
+    @property
+    def remaining_time(self) -> int:
+        """当前任务剩余秒数（向上取整）"""
+        return math.ceil(self._remaining_seconds())
+
+    @property
+    def total_elapsed_time(self) -> int:
+        """会议实际已用秒数（不含暂停时间）"""
+        with self._lock:
+            elapsed = self._elapsed_base
+            if self._segment_start is not None:
+                elapsed += self.clock.monotonic() - self._segment_start
+        return int(elapsed)
+
+    def _remaining_seconds(self) -> float:
+        """由截止时间推算当前任务的剩余秒数"""
+        with self._lock:
+            if self._deadline is None:
+                return 0.0
+            if self.is_paused:
+                return self._paused_remaining
+            return max(0.0, self._deadline - self.clock.monotonic())
+
+    def progress(self) -> TimerProgress:
+        """读取当前进度（界面线程按帧调用，只在锁内做几次加减）"""
+        with self._lock:
+            remaining = self._remaining_seconds()
+            elapsed = self._elapsed_base
+            if self._segment_start is not None:
+                elapsed += self.clock.monotonic() - self._segment_start
+            return TimerProgress(self.is_running, self.is_paused, self._task_name,
+                                 self.current_task_index + 1, self._task_count, remaining,
+                                 self._task_duration, elapsed, remaining + self._remaining_after)
+
+    @property
+    def wakeups(self) -> int:
+        """工作线程累计醒来次数（用于统计每分钟唤醒次数）"""
+        return self._wakeups
+
+    def set_display_active(self, active: bool):
+        """开启/关闭显示刷新
+
+        关闭后不再调用 on_timer_update，工作线程直接等到任务截止（语音播报都在任务
+        边界）；重新开启时立即唤醒工作线程发布当前剩余时间。
+        """
+        with self._cond:
+            if self._display_active != active:
+                self._display_active = active
+                self._cond.notify_all()
 
     def start_meeting(self, on_timer_update, on_task_complete, on_meeting_end):
-        """开始会议倒计时"""
+        """开始会议倒计时（在常驻工作线程中运行）"""
+        meeting = self._prepare_meeting(on_timer_update, on_task_complete, on_meeting_end)
+        if meeting is None:
+            return False
+
+        # 把本场会议交给常驻工作线程
+        with self._cond:
+            self._pending = meeting
+            self._cond.notify_all()
+        self._ensure_worker()
+        return True
+
+    def run_meeting(self, on_timer_update, on_task_complete, on_meeting_end):
+        """在调用方线程中同步运行整场会议，会议结束（或被停止）后返回
+
+        配合 VirtualClock 使用：等待不阻塞，议程以 CPU 允许的最快速度跑完。
+        """
+        meeting = self._prepare_meeting(on_timer_update, on_task_complete, on_meeting_end)
+        if meeting is None:
+            return False
+        self._run_meeting(*meeting)
+        return True
+
+    def _prepare_meeting(self, on_timer_update, on_task_complete, on_meeting_end):
+        """重置状态并播报会议开始，返回交给 _run_meeting 的参数；没有任务时返回 None"""
         tasks = self.task_list.get_all()
         if not tasks:
-            messagebox.showwarning("警告", "没有任务可以开始计时！")
-            return False
+            # 引擎层不依赖 tkinter，由调用方根据返回值提示用户
+            logging.warning("没有任务可以开始计时！")
+            return None
 
-        self.current_task_index = 0
-        self.is_running = True
-        self.is_paused = False
-        self.total_elapsed_time = 0
+        with self._cond:
+            # 先让仍在运行的旧会议失效，再重置状态
+            self._generation += 1
+            generation = self._generation
+            self._commands.clear()
+            self.current_task_index = 0
+            self.is_running = True
+            self.is_paused = False
+            self._elapsed_base = 0.0
+            self._segment_start = self.clock.monotonic()
+            # 立即设置第一个任务的截止时间：本方法返回后、工作线程开始运行前，
+            # 暂停与加时就可能到达
+            first_duration = tasks[0].minutes * 60
+            self._deadline = self._segment_start + first_duration
+            self._task_name = tasks[0].name
+            self._task_duration = float(first_duration)
+            self._task_count = len(tasks)
+            self._remaining_after = sum(task.minutes for task in tasks) * 60 - first_duration
+            self._transition_count = 0
+            self._transition_total = 0.0
+            self._transition_max = 0.0
+            self._command_latency.clear()
 
         # 播报会议开始
         total_minutes = self.task_list.get_total_time()
         self.voice_service.announce_meeting_start(len(tasks), total_minutes)
 
-        # 开始第一个任务
-        self._start_current_task(on_timer_update, on_task_complete, on_meeting_end)
-        return True
+        # 在后台预渲染接下来的任务完成播报，任务切换时可以立即播放
+        for index in range(min(len(tasks), self.PRERENDER_AHEAD)):
+            self._prerender_completion(tasks, index)
+        self.voice_service.prerender(MEETING_END_MESSAGE)
+        return generation, tasks, on_timer_update, on_task_complete, on_meeting_end
 
-    def _start_current_task(self, on_timer_update, on_task_complete, on_meeting_end):
-        """开始当前任务的倒计时"""
-        if not self.is_running:
-            return
+    def _ensure_worker(self):
+        """按需启动常驻工作线程（每个计时器只有一个）"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._worker_loop, name="CountdownTimer", daemon=True)
+            self._worker.start()
+
+    def _worker_loop(self):
+        """工作线程主循环：等待新会议并逐个运行"""
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                meeting = self._pending
+                self._pending = None
+            self._run_meeting(*meeting)
+
+    def _is_current(self, generation: int) -> bool:
+        """该会议是否仍在运行（未被停止或被新会议取代）"""
+        return self.is_running and self._generation == generation
+
+    def _run_meeting(self, generation, tasks, on_timer_update, on_task_complete, on_meeting_end):
+        """迭代遍历议程，栈深度与线程数不随任务数增长"""
+        deadline = None
+        first = True  # 第一个任务的截止时间由 _prepare_meeting 设置，其间的暂停与加时保持有效
+        while self._is_current(generation) and self.current_task_index < len(tasks):
+            current_task = tasks[self.current_task_index]
+            duration = current_task.minutes * 60  # 转换为秒
+            with self._lock:
+                # 旧会议在这里被新会议取代时不能覆盖新会议已经设置的截止时间
+                if not self._is_current(generation):
+                    return
+                if first:
+                    first = False
+                else:
+                    now = self.clock.monotonic()
+                    if deadline is not None:
+                        # 记录上一任务截止到本任务开始之间的切换延迟
+                        latency = max(0.0, now - deadline)
+                        self._transition_count += 1
+                        self._transition_total += latency
+                        self._transition_max = max(self._transition_max, latency)
+                    if self.is_paused:
+                        self._paused_remaining = float(duration)
+                    # 紧接上一任务的截止时间开始，切换开销不会累积到会议总时长
+                    start = deadline if deadline is not None and not self.is_paused else now
+                    self._deadline = start + duration
+                    self._task_name = current_task.name
+                    self._task_duration = float(duration)
+                    self._remaining_after -= duration
+
+            outcome = self._run_countdown(generation, current_task, on_timer_update)
+            if outcome == self.CMD_STOP:
+                return
+
+            with self._cond:
+                # 从等待中返回后，会议可能已被停止并由新会议取代：
+                # 过期的运行不能再修改任务索引，也不能触发回调和播报
+                if not self._is_current(generation):
+                    return
+                if outcome == self.CMD_SKIP:
+                    self.current_task_index += 1
+                else:
+                    deadline = self._deadline
+
+            if outcome == self.CMD_SKIP:
+                # 跳过的任务不播报完成，尚未播出的上一条切换播报也已过时
+                self.voice_service.discard(TASK_BOUNDARY_KEY)
+                # 下一任务从当前时刻开始
+                deadline = None
+                continue
 
-        tasks = self.task_list.get_all()
-        if self.current_task_index >= len(tasks):
-            self._end_meeting(on_meeting_end)
-            return
-
-        current_task = tasks[self.current_task_index]
-        self.remaining_time = current_task.minutes * 60  # 转换为秒
-
-        # 在新线程中运行倒计时
-        thread = threading.Thread(
-            target=self._run_countdown,
-            args=(current_task, on_timer_update, on_task_complete, on_meeting_end),
-            daemon=True
-        )
-        thread.start()
-
-    def _run_countdown(self, task, on_timer_update, on_task_complete, on_meeting_end):
-        """运行倒计时"""
-        start_time = time.time()
-
-        while self.remaining_time > 0 and self.is_running:
-            if not self.is_paused:
-                # 更新UI
-                if on_timer_update:
-                    minutes = self.remaining_time // 60
-                    seconds = self.remaining_time % 60
-                    on_timer_update(task.name, minutes, seconds, self.current_task_index + 1)
-
-                time.sleep(1)
-                self.remaining_time -= 1
-                self.total_elapsed_time += 1
-            else:
-                time.sleep(0.1)  # 暂停时降低CPU占用
-
-        if self.is_running and self.remaining_time <= 0:
             # 任务完成
-            tasks = self.task_list.get_all()
             next_task = None
             if self.current_task_index + 1 < len(tasks):
                 next_task = tasks[self.current_task_index + 1].name
 
             # 播报任务完成
-            self.voice_service.announce_task_completion(task.name, next_task)
+            self.voice_service.announce_task_completion(current_task.name, next_task)
+            self._prerender_completion(tasks, self.current_task_index + self.PRERENDER_AHEAD)
 
             if on_task_complete:
-                on_task_complete(task.name)
+                on_task_complete(current_task.name)
 
             # 移动到下一个任务
-            self.current_task_index += 1
-            self._start_current_task(on_timer_update, on_task_complete, on_meeting_end)
+            with self._cond:
+                if not self._is_current(generation):
+                    return
+                self.current_task_index += 1
+
+        if self._is_current(generation):
+            self._end_meeting(on_meeting_end)
+
+    def _prerender_completion(self, tasks, index: int):
+        """预渲染第 index 个任务的完成播报"""
+        if index < len(tasks):
+            next_task = tasks[index + 1].name if index + 1 < len(tasks) else None
+            self.voice_service.prerender_task_completion(tasks[index].name, next_task)
+
+    def _run_countdown(self, generation, task, on_timer_update) -> str:
+        """运行单个任务的倒计时
+
+        Returns:
+            "done" 正常走完；CMD_SKIP 被跳过；CMD_STOP 被停止或被新会议取代
+        """
+        while True:
+            with self._cond:
+                outcome = self._apply_commands()
+                if outcome is not None:
+                    return outcome
+                if not self._is_current(generation):
+                    return self.CMD_STOP
+                if self.is_paused:
+                    # 暂停时无超时等待，直到有命令到达
+                    self._wait(None)
+                    continue
+                changes = self._changes
+                remaining = self._deadline - self.clock.monotonic()
+            if remaining <= 0:
+                return "done"
+
+            # 更新UI（显示关闭时跳过）
+            display = on_timer_update is not None and self._display_active
+            shown = math.ceil(remaining)
+            if display:
+                on_timer_update(task.name, shown // 60, shown % 60, self.current_task_index + 1)
+
+            with self._cond:
+                if self._changes != changes or not self._is_current(generation):
+                    continue  # 显示期间有命令改变了计时状态，重新计算
+                if display != (on_timer_update is not None and self._display_active):
+                    continue  # 显示状态刚刚切换，重新计算
+                remaining = self._deadline - self.clock.monotonic()
+                # 显示开启时等到显示值下一次变化，否则直接等到截止时刻
+                timeout = remaining - (shown - 1) if display else remaining
+                if timeout > 0:
+                    self._wait(timeout)
+
+    def _wait(self, timeout):
+        """在命令通道上等待至多 timeout 秒，None 表示一直等到有命令（调用方需持有锁）"""
+        self.clock.wait(self._cond, timeout)
+        self._wakeups += 1
+
+    def _send(self, command: str, argument=None):
+        """应用一条控制命令并唤醒工作线程（调用方需持有锁）
+
+        状态在调用方线程中立即改变，不必等工作线程在负载下抢到 GIL；
+        工作线程醒来后只按新状态重新安排等待。跳过还需要工作线程切换任务，放入命令队列。
+        """
+        now = self.clock.monotonic()
+        if command == self.CMD_PAUSE and not self.is_paused:
+            self._paused_remaining = max(0.0, self._deadline - now)
+            self._close_segment(now)
+            self.is_paused = True
+        elif command == self.CMD_RESUME and self.is_paused:
+            self._deadline = now + self._paused_remaining
+            self._segment_start = now
+            self.is_paused = False
+        elif command == self.CMD_ADD_TIME:
+            self._task_duration += argument
+            self._deadline += argument
+        elif command == self.CMD_SKIP and self.is_paused:
+            # 跳过后自动恢复计时
+            self._segment_start = now
+            self.is_paused = False
+        elif command == self.CMD_STOP:
+            self._close_segment(now)
+            self.is_running = False
+            self.is_paused = False
+        if command == self.CMD_SKIP:
+            self._commands.append((command, now))
+        else:
+            self._record_latency(command, self.clock.monotonic() - now)
+        self._changes += 1
+        self._cond.notify_all()
+
+    def _apply_commands(self):
+        """在工作线程中取出待切换任务的命令（调用方需持有锁），返回 CMD_SKIP 或 None"""
+        if self._commands:
+            command, issued = self._commands.popleft()
+            self._record_latency(command, self.clock.monotonic() - issued)
+            return command
+        return None
+
+    def _record_latency(self, command: str, latency: float):
+        """记录命令从投递到生效的延迟（调用方需持有锁）"""
+        stats = self._command_latency.setdefault(command, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += latency
+        stats[2] = max(stats[2], latency)
+
+    def get_transition_stats(self) -> dict:
+        """获取任务切换延迟统计（秒）"""
+        with self._lock:
+            count = self._transition_count
+            return {
+                "count": count,
+                "avg": self._transition_total / count if count else 0.0,
+                "max": self._transition_max,
+            }
+
+    def get_command_latency_stats(self) -> dict:
+        """获取各控制命令从投递到生效的延迟统计（秒）"""
+        with self._lock:
+            return {
+                command: {"count": count, "avg": total / count, "max": worst}
+                for command, (count, total, worst) in self._command_latency.items()
+            }
 
     def pause_timer(self):
         """暂停计时器"""
-        self.is_paused = True
+        with self._cond:
+            if self.is_running and not self.is_paused:
+                self._send(self.CMD_PAUSE)
 
     def resume_timer(self):
         """恢复计时器"""
-        self.is_paused = False
+        with self._cond:
+            if self.is_running and self.is_paused:
+                self._send(self.CMD_RESUME)
 
     def stop_timer(self):
         """停止计时器"""
-        self.is_running = False
-        self.is_paused = False
+        with self._cond:
+            if self.is_running:
+                self._send(self.CMD_STOP)
 
     def add_time_to_current_task(self, minutes: int):
         """为当前任务增加时间"""
-        if self.is_running and not self.is_paused:
-            self.remaining_time += minutes * 60
-            return True
+        with self._cond:
+            if self.is_running and not self.is_paused:
+                self._send(self.CMD_ADD_TIME, minutes * 60)
+                return True
         return False
 
     def skip_current_task(self):
         """跳过当前任务"""
-        if self.is_running:
-            self.current_task_index += 1
-            self.is_paused = False
-            return True
+        with self._cond:
+            if self.is_running:
+                self._send(self.CMD_SKIP)
+                return True
         return False
 
+    def _close_segment(self, now: float):
+        """结束当前计时段，把其时长计入已用时间（调用方需持有锁）"""
+        if self._segment_start is not None:
+            self._elapsed_base += now - self._segment_start
+            self._segment_start = None
+
     def _end_meeting(self, on_meeting_end):
         """结束会议"""
-        self.is_running = False
+        with self._lock:
+            self._close_segment(self.clock.monotonic())
+            self._deadline = None
+            self.is_running = False
+        # 先排队会议结束播报再回调：调用方可能在回调后等待播报队列排空并退出
+        self.voice_service.speak(MEETING_END_MESSAGE)
         if on_meeting_end:
             on_meeting_end(self.total_elapsed_time)
-
-        # 播报会议结束
-        self.voice_service.speak("会议已结束，辛苦了！")
\ No newline at end of file
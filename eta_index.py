@@ -0,0 +1,200 @@
+"""任务预计开始/结束时间索引
+
+PrefixSumIndex 是任务时长（秒）上的树状数组（Fenwick 树）：单点修改、前缀和
+以及“偏移 T 处是哪个任务”的查找都是 O(log n)，末尾追加 O(log n)、截断 O(1)。
+EtaIndex 跟随 TaskList 的变更通知维护该索引，并以会议进度为锚点把时间轴换算成
+墙上时间，表格只为可见行查询，计时刷新时不再遍历整个议程累加时长。
+"""
+import time
+from typing import Iterable, List, Optional
+from task_list import INSERTED, MOVED, REMOVED, UPDATED, TaskListChange
+
+
+class PrefixSumIndex:
+    """非负整数序列上的树状数组"""
+
+    def __init__(self, values: Iterable[int] = ()):
+        self.rebuild(values)
+
+    def rebuild(self, values: Iterable[int]):
+        """O(n) 重建：每个节点把自己的部分和加到父节点"""
+        self._values: List[int] = list(values)
+        size = len(self._values)
+        tree = [0] + self._values
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._total = sum(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index: int) -> int:
+        return self._values[index]
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    def add(self, index: int, delta: int):
+        """第 index 项加上 delta"""
+        self._values[index] += delta
+        self._total += delta
+        tree = self._tree
+        i = index + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def set(self, index: int, value: int):
+        self.add(index, value - self._values[index])
+
+    def append(self, value: int):
+        """在末尾追加一项：新节点覆盖的区间和由两次前缀和求得"""
+        i = len(self._values) + 1
+        self._tree.append(value + self.prefix(i - 1) - self.prefix(i - (i & -i)))
+        self._values.append(value)
+        self._total += value
+
+    def truncate(self, size: int):
+        """只保留前 size 项；剩余节点覆盖的区间都在 size 之内，无需修改"""
+        self._total -= sum(self._values[size:])
+        del self._values[size:]
+        del self._tree[size + 1:]
+
+    def prefix(self, count: int) -> int:
+        """前 count 项之和"""
+        tree = self._tree
+        result = 0
+        i = min(count, len(self._values))
+        while i > 0:
+            result += tree[i]
+            i -= i & -i
+        return result
+
+    def find(self, offset: int) -> int:
+        """满足 prefix(i) <= offset < prefix(i + 1) 的 i，即偏移 offset 处的项
+
+        offset 为负时返回 -1，不小于总和时返回 len(self)。
+        """
+        if offset < 0:
+            return -1
+        tree = self._tree
+        size = len(self._values)
+        pos = 0
+        step = 1 << size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= size and tree[nxt] <= offset:
+                pos = nxt
+                offset -= tree[nxt]
+            step >>= 1
+        return pos
+
+
+class EtaIndex:
+    """跟随任务列表的预计时间索引
+
+    时间轴以秒为单位，第 i 个任务占据 [prefix(i), prefix(i + 1))。会议进行中
+    由 set_progress 给出当前任务及其剩余秒数，把时间轴锚定到墙上时间；未开会时
+    时间轴从当前时刻开始。加时通过 extend 单点修改，O(log n)；之后被编辑、移动或
+    重建到的任务恢复为计划时长。
+    """
+
+    def __init__(self, task_list):
+        self.task_list = task_list
+        self.index = PrefixSumIndex()
+        self._origin: Optional[float] = None  # 时间轴零点对应的墙上时间，None 表示“现在”
+        task_list.add_listener(self._on_change)
+        self.reset()
+
+    def detach(self):
+        """停止跟随任务列表的变化"""
+        self.task_list.remove_listener(self._on_change)
+
+    def reset(self):
+        """按任务列表的计划时长重建（会议开始/结束时丢弃加时），并解除锚定"""
+        self.index.rebuild(task.minutes * 60 for task in self.task_list)
+        self._origin = None
+
+    # ---- 会议进度 ----
+
+    def set_progress(self, task_index: int, remaining: float, now: Optional[float] = None) -> bool:
+        """以第 task_index 个任务还剩 remaining 秒为锚点
+
+        Returns:
+            以分钟显示的预计时间是否可能变化（时间轴零点跨过了分钟边界）
+        """
+        if now is None:
+            now = time.time()
+        old = self._origin
+        self._origin = now - (self.index.prefix(task_index + 1) - remaining)
+        return old is None or int(old // 60) != int(self._origin // 60)
+
+    def clear_progress(self):
+        """会议结束或停止：时间轴回到从当前时刻开始"""
+        self._origin = None
+
+    def extend(self, task_index: int, seconds: int):
+        """为第 task_index 个任务加时"""
+        if 0 <= task_index < len(self.index):
+            self.index.add(task_index, seconds)
+
+    # ---- 查询 ----
+
+    def origin(self) -> float:
+        return time.time() if self._origin is None else self._origin
+
+    def start_of(self, task_index: int) -> float:
+        """第 task_index 个任务的预计开始时间（time.time() 秒）"""
+        return self.origin() + self.index.prefix(task_index)
+
+    def end_of(self, task_index: int) -> float:
+        """第 task_index 个任务的预计结束时间"""
+        return self.origin() + self.index.prefix(task_index + 1)
+
+    def meeting_end(self) -> float:
+        """整场会议的预计结束时间"""
+        return self.origin() + self.index.total
+
+    def task_at(self, when: float) -> int:
+        """when 时刻正在进行的任务索引；开始前为 -1，结束后为任务数"""
+        return self.index.find(int(when - self.origin()))
+
+    def format_eta(self, task_index: int) -> str:
+        """表格中显示的“开始–结束”"""
+        if not 0 <= task_index < len(self.index):
+            return ""
+        start = self.start_of(task_index)
+        return f"{time.strftime('%H:%M', time.localtime(start))}–" \
+               f"{time.strftime('%H:%M', time.localtime(start + self.index[task_index]))}"
+
+    # ---- 跟随任务列表 ----
+
+    def _on_change(self, change: TaskListChange):
+        index = self.index
+        task_list = self.task_list
+        if change.kind == INSERTED and change.index == len(index):
+            for i in range(change.index, change.index + change.count):
+                index.append(task_list[i].minutes * 60)
+        elif change.kind == REMOVED and change.index + change.count == len(index) \
+                and (not change.indices or change.indices[-1] - change.indices[0] + 1 == change.count):
+            index.truncate(change.index)  # 删除的是末尾的连续区间
+        elif change.kind == UPDATED:
+            for i in change.indices or range(change.index, change.index + change.count):
+                index.set(i, task_list[i].minutes * 60)
+        elif change.kind == MOVED and self._cheap_move(change):
+            low, high = sorted((change.index, change.new_index))
+            for i in range(low, high + 1):
+                index.set(i, task_list[i].minutes * 60)
+        else:
+            # 中间插入/删除会平移之后所有项，树状数组只能 O(n) 重建（列表本身也是 O(n)）
+            index.rebuild(task.minutes * 60 for task in task_list)
+
+    def _cheap_move(self, change: TaskListChange) -> bool:
+        """移动距离较短时逐项单点修改比重建便宜"""
+        size = len(self.index)
+        distance = abs(change.new_index - change.index) + 1
+        return distance * max(1, size.bit_length()) < size
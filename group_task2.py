@@ -2,7 +2,9 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv
+from background_job import BackgroundJob
+from progress_dialog import ErrorReportDialog, ProgressDialog
+from task_csv import CsvFormatError, stream_tasks, write_tasks
 
 # 从项目一中复用Task 和 TaskList 
 class Task:
@@ -20,10 +22,18 @@ class TaskList:
     def add(self, task: Task):
         self._tasks.append(task)
 
+    def insert_many(self, index: int, tasks: list):
+        self._tasks[index:index] = tasks
+
     def delete(self, index: int):
         if 0 <= index < len(self._tasks):
             del self._tasks[index]
 
+    def delete_many(self, indices):
+        # 一次遍历删除多个任务，避免逐个删除的平方开销
+        removed = set(indices)
+        self._tasks[:] = [task for i, task in enumerate(self._tasks) if i not in removed]
+
     def update(self, index: int, new_task: Task):
         if 0 <= index < len(self._tasks):
             self._tasks[index] = new_task
@@ -154,9 +164,9 @@ class MainApp:
         selected = self.tree.selection()
         if not selected: return
         if messagebox.askyesno("确认", "确定删除选中任务?"):
-            for item in reversed(selected):
-                index = self.tree.index(item)
-                self.task_list.delete(index)
+            # 一次取出全部行并按选中集合过滤，避免逐行调用线性的 tree.index
+            selected = set(selected)
+            self.task_list.delete_many(i for i, item in enumerate(self.tree.get_children()) if item in selected)
             self._refresh_treeview()
             self._update_stats()
     def _clear_all(self):
@@ -221,60 +231,49 @@ class MainApp:
         if not file_path:
             return # 用户取消了选择
 
-        try:
-            with open(file_path, mode='r', encoding='utf-8-sig', newline='') as file:
-                reader = csv.DictReader(file)
-
-                # 验证CSV文件是否包含必要的列
-                required_columns = ['任务名称', '时长(分钟)']
-                if not all(col in reader.fieldnames for col in required_columns):
-                    messagebox.showerror("格式错误", f"CSV文件缺少必要的列！\n需要: {', '.join(required_columns)}", parent=self.root)
-                    return
-
-                imported_tasks = []
-                line_number = 2 # 从第二行开始计算（跳过表头）
-                for row in reader:
-                    task_name = row['任务名称'].strip()
-                    duration_str = row['时长(分钟)'].strip()
-
-                    # 数据验证
-                    if not task_name:
-                        messagebox.showwarning("数据警告", f"第 {line_number} 行：任务名称为空，已跳过。", parent=self.root)
-                        line_number += 1
-                        continue
-                    try:
-                        duration = int(duration_str)
-                        if duration <= 0:
-                            raise ValueError
-                    except ValueError:
-                        messagebox.showwarning("数据警告", f"第 {line_number} 行：时长 '{duration_str}' 不是有效的正整数，已跳过。", parent=self.root)
-                        line_number += 1
-                        continue
-
-                    imported_tasks.append(Task(task_name, duration))
-                    line_number += 1
-
-                if not imported_tasks:
-                    messagebox.showinfo("提示", "CSV文件中没有找到有效可导入的任务。", parent=self.root)
-                    return
-
-                # 询问用户是否清空现有任务
-                if self.task_list.get_all():
-                    if messagebox.askyesno("确认导入", f"即将导入 {len(imported_tasks)} 个任务。\n是否清空当前所有任务？", parent=self.root):
-                        self.task_list.clear()
-                
-                # 添加导入的任务
-                for task in imported_tasks:
-                    self.task_list.add(task)
-                
-                self._refresh_treeview()
-                self._update_stats()
-                messagebox.showinfo("成功", f"成功导入 {len(imported_tasks)} 个任务！", parent=self.root)
+        # 在后台线程中流式解析，界面保持响应并显示进度
+        job = BackgroundJob(stream_tasks, file_path, task_factory=Task, name="CsvImport")
+        ProgressDialog(self.root, "正在导入CSV", job,
+                       on_done=lambda future: self._on_csv_parsed(file_path, future))
 
+    def _on_csv_parsed(self, file_path, future):
+        try:
+            result = future.result()
+        except CsvFormatError as e:
+            messagebox.showerror("格式错误", str(e), parent=self.root)
+            return
         except FileNotFoundError:
             messagebox.showerror("错误", f"文件未找到: {file_path}", parent=self.root)
+            return
         except Exception as e:
             messagebox.showerror("导入失败", f"发生未知错误: {e}", parent=self.root)
+            return
+
+        if result.cancelled:
+            messagebox.showinfo("提示", "已取消导入。", parent=self.root)
+            return
+
+        if result.error_count:
+            ErrorReportDialog(self.root, "数据警告",
+                              f"共 {result.error_count} 行数据无效，已跳过"
+                              f"（显示前 {len(result.errors)} 条）：", result.errors)
+
+        imported_tasks = result.tasks
+        if not imported_tasks:
+            messagebox.showinfo("提示", "CSV文件中没有找到有效可导入的任务。", parent=self.root)
+            return
+
+        # 询问用户是否清空现有任务
+        if self.task_list.get_all():
+            if messagebox.askyesno("确认导入", f"即将导入 {len(imported_tasks)} 个任务。\n是否清空当前所有任务？", parent=self.root):
+                self.task_list.clear()
+
+        # 批量添加导入的任务
+        self.task_list.insert_many(len(self.task_list.get_all()), imported_tasks)
+
+        self._refresh_treeview()
+        self._update_stats()
+        messagebox.showinfo("成功", f"成功导入 {len(imported_tasks)} 个任务！", parent=self.root)
 
 #将当前所有任务导出到CSV文件
     def _export_csv(self):
@@ -286,7 +285,7 @@ class MainApp:
 
         file_path = filedialog.asksaveasfilename(
             title="保存任务到CSV文件",
-            filetypes=[("CSV 文件", "*.csv"), ("所有文件", "*.*")],
+            filetypes=[("CSV 文件", "*.csv"), ("GZIP 压缩的 CSV", "*.csv.gz"), ("所有文件", "*.*")],
             defaultextension=".csv",
             initialfile="会议任务导出.csv"
         )
@@ -294,19 +293,20 @@ class MainApp:
         if not file_path:
             return # 用户取消了选择
 
-        try:
-            with open(file_path, mode='w', encoding='utf-8-sig', newline='') as file:
-                fieldnames = ['任务名称', '时长(分钟)']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-
-                writer.writeheader() # 写入表头
-                for task in tasks:
-                    writer.writerow({'任务名称': task.name, '时长(分钟)': task.minutes})
-
-            messagebox.showinfo("成功", f"任务已成功导出到:\n{file_path}", parent=self.root)
+        # 在后台线程中分批写入临时文件，完成后原子替换；.gz 扩展名时直接写入 gzip
+        job = BackgroundJob(write_tasks, file_path, tasks, name="CsvExport")
+        ProgressDialog(self.root, "正在导出CSV", job, on_done=self._on_csv_exported)
 
+    def _on_csv_exported(self, future):
+        try:
+            result = future.result()
         except Exception as e:
             messagebox.showerror("导出失败", f"发生未知错误: {e}", parent=self.root)
+            return
+        if result.cancelled:
+            messagebox.showinfo("提示", "已取消导出，原文件未改动。", parent=self.root)
+            return
+        messagebox.showinfo("成功", f"任务已成功导出到:\n{result.path}", parent=self.root)
 
 
 # 程序入口
@@ -0,0 +1,88 @@
+"""窗口可见性跟踪与唤醒次数统计
+
+IdleMonitor 监听窗口的 <Map>、<Unmap> 和 <Visibility> 事件，窗口被最小化或完全
+遮挡时通知调用方进入空闲模式（暂停显示刷新），重新可见时立即恢复。
+同时按状态（可见/隐藏）累计各唤醒来源的次数和停留时间，报告每分钟唤醒次数。
+"""
+import time
+from typing import Callable, Dict
+
+VISIBLE = "visible"
+HIDDEN = "hidden"
+_STATE_NAMES = {VISIBLE: "可见", HIDDEN: "隐藏"}
+
+
+class IdleMonitor:
+    """跟踪 Tk 窗口是否可见，并按状态统计唤醒次数
+
+    on_change(visible) 在状态变化时于界面线程中调用。唤醒来源通过 add_source 注册，
+    读取函数返回该来源的累计唤醒次数。
+    """
+
+    def __init__(self, window, on_change: Callable[[bool], None]):
+        self.window = window
+        self.visible = True
+        self._on_change = on_change
+        self._sources: Dict[str, Callable[[], int]] = {}
+        self._marks: Dict[str, int] = {}
+        self._seconds = {VISIBLE: 0.0, HIDDEN: 0.0}
+        self._counts: Dict[str, Dict[str, int]] = {VISIBLE: {}, HIDDEN: {}}
+        self._since = time.monotonic()
+        window.bind("<Map>", self._on_map, add="+")
+        window.bind("<Unmap>", self._on_unmap, add="+")
+        window.bind("<Visibility>", self._on_visibility, add="+")
+
+    def add_source(self, name: str, read_count: Callable[[], int]):
+        self._sources[name] = read_count
+        self._marks[name] = read_count()
+
+    # 顶层窗口的绑定对其所有子控件生效，只处理窗口本身的事件
+    def _on_map(self, event):
+        if event.widget is self.window:
+            self._set_visible(True)
+
+    def _on_unmap(self, event):
+        if event.widget is self.window:
+            self._set_visible(False)
+
+    def _on_visibility(self, event):
+        if event.widget is self.window:
+            self._set_visible(event.state != "VisibilityFullyObscured")
+
+    def _set_visible(self, visible: bool):
+        if visible != self.visible:
+            self._account()
+            self.visible = visible
+            self._on_change(visible)
+
+    def _account(self):
+        """把上次结算以来的时间与唤醒次数计入当前状态"""
+        now = time.monotonic()
+        state = VISIBLE if self.visible else HIDDEN
+        self._seconds[state] += now - self._since
+        self._since = now
+        counts = self._counts[state]
+        for name, read_count in self._sources.items():
+            count = read_count()
+            counts[name] = counts.get(name, 0) + count - self._marks[name]
+            self._marks[name] = count
+
+    def get_stats(self) -> dict:
+        """{状态: {"seconds": 停留秒数, "per_minute": {来源: 每分钟唤醒次数}}}"""
+        self._account()
+        stats = {}
+        for state, seconds in self._seconds.items():
+            minutes = seconds / 60
+            stats[state] = {
+                "seconds": seconds,
+                "per_minute": {name: (self._counts[state].get(name, 0) / minutes if minutes else 0.0)
+                               for name in self._sources},
+            }
+        return stats
+
+    def report(self) -> str:
+        lines = []
+        for state, entry in self.get_stats().items():
+            rates = "，".join(f"{name} {rate:.1f}" for name, rate in entry["per_minute"].items())
+            lines.append(f"{_STATE_NAMES[state]} {entry['seconds']:.0f} 秒，每分钟唤醒：{rates}")
+        return "\n".join(lines)
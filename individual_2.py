@@ -7,7 +7,10 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from dataclasses import dataclass
 from typing import List
-import csv
+from operator import attrgetter
+from background_job import BackgroundJob
+from progress_dialog import ErrorReportDialog, ProgressDialog
+from task_csv import MINUTES_COLUMN, NAME_COLUMN, NOTES_COLUMN, CsvFormatError, stream_tasks, write_tasks
 
 # 任务数据类
 @dataclass
@@ -24,6 +27,9 @@ class TaskList:
     def add(self, task: Task):
         self._tasks.append(task)
 
+    def insert_many(self, index: int, tasks: List[Task]):
+        self._tasks[index:index] = tasks
+
     def get_all(self) -> List[Task]:
         return self._tasks.copy()
 
@@ -31,6 +37,11 @@ class TaskList:
         if 0 <= index < len(self._tasks):
             self._tasks.pop(index)
 
+    def delete_many(self, indices):
+        # 一次遍历删除多个任务，避免逐个删除的平方开销
+        removed = set(indices)
+        self._tasks[:] = [task for i, task in enumerate(self._tasks) if i not in removed]
+
     def clear(self):
         self._tasks.clear()
 
@@ -207,9 +218,9 @@ class MainApp:
             messagebox.showwarning("警告", "请先选择要删除的任务！")
             return
         if messagebox.askyesno("确认删除", "确定要删除选中的任务吗？"):
-            for item in reversed(selected):
-                index = self.tree.index(item)
-                self.task_list.delete(index)
+            # 一次取出全部行并按选中集合过滤，避免逐行调用线性的 tree.index
+            selected = set(selected)
+            self.task_list.delete_many(i for i, item in enumerate(self.tree.get_children()) if item in selected)
             self._refresh_treeview()
             self._update_stats()
 
@@ -302,45 +313,37 @@ class MainApp:
         )
         if not file_path:
             return
+        # 后台流式解析（兼容无笔记列的CSV），界面保持响应并显示进度
+        job = BackgroundJob(stream_tasks, file_path, task_factory=Task,
+                            extra_columns=(NOTES_COLUMN,), name="CsvImport")
+        ProgressDialog(self.root, "正在导入CSV", job, on_done=self._on_csv_parsed)
+
+    def _on_csv_parsed(self, future):
         try:
-            with open(file_path, mode='r', encoding='utf-8-sig', newline='') as file:
-                reader = csv.DictReader(file)
-                required_columns = ['任务名称', '时长(分钟)']
-                if not all(col in reader.fieldnames for col in required_columns):
-                    messagebox.showerror("格式错误", f"缺少必要列：{', '.join(required_columns)}")
-                    return
-                imported_tasks = []
-                line_num = 2
-                for row in reader:
-                    name = row['任务名称'].strip()
-                    dur_str = row['时长(分钟)'].strip()
-                    notes = row.get('笔记', '').strip()  # 兼容无笔记列的CSV
-                    if not name:
-                        messagebox.showwarning("警告", f"第{line_num}行：任务名称为空，已跳过")
-                        line_num += 1
-                        continue
-                    try:
-                        dur = int(dur_str)
-                        if dur <= 0:
-                            raise ValueError
-                    except ValueError:
-                        messagebox.showwarning("警告", f"第{line_num}行：时长无效，已跳过")
-                        line_num += 1
-                        continue
-                    imported_tasks.append(Task(name, dur, notes))
-                    line_num += 1
-                if not imported_tasks:
-                    messagebox.showinfo("提示", "无有效任务可导入")
-                    return
-                if self.task_list.get_all() and messagebox.askyesno("确认", "是否清空现有任务？"):
-                    self.task_list.clear()
-                for task in imported_tasks:
-                    self.task_list.add(task)
-                self._refresh_treeview()
-                self._update_stats()
-                messagebox.showinfo("成功", f"导入{len(imported_tasks)}个任务")
+            result = future.result()
+        except CsvFormatError as e:
+            messagebox.showerror("格式错误", str(e))
+            return
         except Exception as e:
             messagebox.showerror("错误", f"导入失败：{str(e)}")
+            return
+        if result.cancelled:
+            messagebox.showinfo("提示", "已取消导入")
+            return
+        if result.error_count:
+            ErrorReportDialog(self.root, "警告",
+                              f"共{result.error_count}行无效，已跳过（显示前{len(result.errors)}条）：",
+                              result.errors)
+        imported_tasks = result.tasks
+        if not imported_tasks:
+            messagebox.showinfo("提示", "无有效任务可导入")
+            return
+        if self.task_list.get_all() and messagebox.askyesno("确认", "是否清空现有任务？"):
+            self.task_list.clear()
+        self.task_list.insert_many(self.task_list.get_task_count(), imported_tasks)
+        self._refresh_treeview()
+        self._update_stats()
+        messagebox.showinfo("成功", f"导入{len(imported_tasks)}个任务")
 
     def _export_csv(self):
         tasks = self.task_list.get_all()
@@ -349,25 +352,28 @@ class MainApp:
             return
         file_path = filedialog.asksaveasfilename(
             title="保存CSV文件",
-            filetypes=[("CSV文件", "*.csv")],
+            filetypes=[("CSV文件", "*.csv"), ("GZIP压缩的CSV", "*.csv.gz")],
             defaultextension=".csv",
             initialfile="任务导出.csv"
         )
         if not file_path:
             return
+        # 后台分批写入临时文件，完成后原子替换；.gz 扩展名时直接写入 gzip
+        job = BackgroundJob(write_tasks, file_path, tasks,
+                            columns=(NAME_COLUMN, MINUTES_COLUMN, NOTES_COLUMN),
+                            row=attrgetter("name", "minutes", "notes"), name="CsvExport")
+        ProgressDialog(self.root, "正在导出CSV", job, on_done=self._on_csv_exported)
+
+    def _on_csv_exported(self, future):
         try:
-            with open(file_path, mode='w', encoding='utf-8-sig', newline='') as file:
-                writer = csv.DictWriter(file, fieldnames=['任务名称', '时长(分钟)', '笔记'])
-                writer.writeheader()
-                for task in tasks:
-                    writer.writerow({
-                        '任务名称': task.name,
-                        '时长(分钟)': task.minutes,
-                        '笔记': task.notes
-                    })
-            messagebox.showinfo("成功", f"导出到：{file_path}")
+            result = future.result()
         except Exception as e:
             messagebox.showerror("错误", f"导出失败：{str(e)}")
+            return
+        if result.cancelled:
+            messagebox.showinfo("提示", "已取消导出")
+            return
+        messagebox.showinfo("成功", f"导出到：{result.path}")
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -3,18 +3,39 @@ from tkinter import ttk, messagebox
 from task_list import TaskList
 from add_task_dialog import AddTaskDialog
 from task import Task
+from virtual_task_table import VirtualTaskTable
+from background_job import BackgroundJob
+from progress_dialog import ErrorReportDialog, ProgressDialog
+from task_csv import CsvFormatError, stream_tasks, write_tasks
+from task_journal import JournalLockedError, TaskJournal, journal_dir
+from undo_history import UndoHistory
 #新增2.CSV功能
 from tkinter import filedialog
-import csv
 
 
 class MainApp:
     def __init__(self, root_window: tk.Tk):  # 重命名参数避免隐藏
         self.root = root_window  # 使用不同的变量名
         root_window.title("团队会议倒计时器")
-        root_window.geometry("500x400")
+        root_window.geometry("660x400")
         self.task_list = TaskList()
 
+        # 自动保存：恢复上次的任务列表，之后的每次修改都追加到日志
+        self.journal = None
+        try:
+            self.journal = TaskJournal(journal_dir("main"))
+        except JournalLockedError:
+            messagebox.showwarning("自动保存", "另一个窗口正在使用自动保存，本窗口中的修改不会被保存。")
+        if self.journal is not None:
+            self.journal.recover(self.task_list)
+            self.journal.attach(self.task_list)
+        root_window.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # 撤销/重做历史：持久化序列记录每个版本，快照 O(1)
+        self.history = UndoHistory(self.task_list)
+        root_window.bind("<Control-z>", self._undo)
+        root_window.bind("<Control-y>", self._redo)
+
         # 顶部标题
         title_label = ttk.Label(root_window, text="团队会议任务管理器", font=("Arial", 16, "bold"))
         title_label.pack(pady=10)
@@ -26,6 +47,8 @@ class MainApp:
         ttk.Button(btn_frame, text="+ 添加任务", command=self._open_add_dialog).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="🗑️ 删除选中", command=self._delete_selected).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="🗑️ 清空所有", command=self._clear_all).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="↶ 撤销", command=self._undo).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="↷ 重做", command=self._redo).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="📊 统计信息", command=self._show_stats).pack(side="left", padx=5)
 # 新增2.CSV导入/导出按钮
         ttk.Button(btn_frame, text="📥 导入CSV", command=self._import_csv).pack(side="left", padx=5)
@@ -44,27 +67,19 @@ class MainApp:
         tree_frame = ttk.Frame(root_window)
         tree_frame.pack(fill="both", expand=True, padx=20, pady=10)
 
-        columns = ("#1", "#2", "#3")
-        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=12)
-
-        # 设置列
-        self.tree.heading("#1", text="序号")
-        self.tree.heading("#2", text="任务名称")
-        self.tree.heading("#3", text="时长(分钟)")
-
-        self.tree.column("#1", width=60, anchor="center")
-        self.tree.column("#2", width=250)
-        self.tree.column("#3", width=100, anchor="center")
-
-        # 滚动条
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-
-        self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        # 虚拟滚动表格：只渲染可见行，任务列表变更时自动刷新
+        self.task_table = VirtualTaskTable(tree_frame, self.task_list, height=12)
+        self.task_table.pack(fill="both", expand=True)
 
         # 绑定双击事件编辑任务
-        self.tree.bind("<Double-1>", self._edit_task)
+        self.task_table.bind_rows("<Double-1>", self._edit_task)
+        self._update_stats()
+
+    def _on_close(self):
+        """关闭窗口前提交自动保存日志"""
+        if self.journal is not None:
+            self.journal.close()
+        self.root.destroy()
 
     def _open_add_dialog(self):
         dialog = AddTaskDialog(self.root, on_ok=self._on_task_added)
@@ -72,57 +87,58 @@ class MainApp:
 
     def _on_task_added(self, task):
         self.task_list.add(task)
-        self._refresh_treeview()
         self._update_stats()
 
-    def _refresh_treeview(self):
-        """刷新Treeview显示"""
-        self.tree.delete(*self.tree.get_children())
-        tasks = self.task_list.get_all()
-
-        for i, task in enumerate(tasks, 1):
-            self.tree.insert("", "end", values=(i, task.name, task.minutes))
-
     def _update_stats(self):
         """更新统计信息"""
-        total_tasks = len(self.task_list.get_all())
-        total_time = sum(task.minutes for task in self.task_list.get_all())
+        total_tasks = self.task_list.get_task_count()
+        total_time = self.task_list.get_total_time()
 
         self.total_tasks_label.config(text=f"总任务数: {total_tasks}")
         self.total_time_label.config(text=f"总时长: {total_time} 分钟")
 
     def _delete_selected(self):
         """删除选中的任务"""
-        selected = self.tree.selection()
+        selected = self.task_table.selection()
         if not selected:
             messagebox.showwarning("警告", "请先选择要删除的任务！")
             return
 
         if messagebox.askyesno("确认删除", "确定要删除选中的任务吗？"):
-            # 获取选中的索引并删除（从后往前删除避免索引变化）
-            for item in reversed(selected):
-                index = self.tree.index(item)
-                self.task_list.delete(index)
+            # 一次批量删除，只触发一次界面刷新
+            self.task_list.delete_many(selected)
+
+            self._update_stats()
+
+    def _undo(self, event=None):
+        """撤销上一步修改"""
+        if self.history.undo():
+            self._update_stats()
+        else:
+            self.root.bell()
 
-            self._refresh_treeview()
+    def _redo(self, event=None):
+        """重做上一次撤销的修改"""
+        if self.history.redo():
             self._update_stats()
+        else:
+            self.root.bell()
 
     def _clear_all(self):
         """清空所有任务"""
-        if not self.task_list.get_all():
+        if not self.task_list.get_task_count():
             messagebox.showinfo("提示", "任务列表已经是空的！")
             return
 
-        if messagebox.askyesno("确认清空", "确定要清空所有任务吗？此操作不可撤销！"):
+        if messagebox.askyesno("确认清空", "确定要清空所有任务吗？\n之后可以点击“撤销”恢复。"):
             self.task_list.clear()
-            self._refresh_treeview()
             self._update_stats()
 
     def _show_stats(self):
         """显示详细统计信息"""
-        tasks = self.task_list.get_all()
-        total_tasks = len(tasks)
-        total_time = sum(task.minutes for task in tasks)
+        tasks = self.task_list.view()
+        total_tasks = self.task_list.get_task_count()
+        total_time = self.task_list.get_total_time()
 
         if total_tasks == 0:
             messagebox.showinfo("统计信息", "当前没有任务")
@@ -143,13 +159,11 @@ class MainApp:
 
     def _edit_task(self, event=None):  # 添加默认值 None，表示参数是可选的
         """双击编辑任务"""
-        selected = self.tree.selection()
+        selected = self.task_table.selection()
         if selected:
-            item = selected[0]
-            index = self.tree.index(item)
-            tasks = self.task_list.get_all()
-            if 0 <= index < len(tasks):
-                task = tasks[index]
+            index = selected[0]
+            if 0 <= index < self.task_list.get_task_count():
+                task = self.task_list[index]
                 self._open_edit_dialog(index, task)
 
     def _open_edit_dialog(self, index, task):
@@ -184,7 +198,6 @@ class MainApp:
             # 更新任务
             updated_task = Task(name=new_name, minutes=min_var.get())
             self.task_list.update(index, updated_task)
-            self._refresh_treeview()
             self._update_stats()
             dialog.destroy()
 
@@ -204,72 +217,62 @@ class MainApp:
         if not file_path:
             return # 用户取消了选择
 
-        try:
-            with open(file_path, mode='r', encoding='utf-8-sig', newline='') as file:
-                reader = csv.DictReader(file)
-
-                # 验证CSV文件是否包含必要的列
-                required_columns = ['任务名称', '时长(分钟)']
-                if not all(col in reader.fieldnames for col in required_columns):
-                    messagebox.showerror("格式错误", f"CSV文件缺少必要的列！\n需要: {', '.join(required_columns)}", parent=self.root)
-                    return
-
-                imported_tasks = []
-                line_number = 2 # 从第二行开始计算（跳过表头）
-                for row in reader:
-                    task_name = row['任务名称'].strip()
-                    duration_str = row['时长(分钟)'].strip()
-
-                    # 数据验证
-                    if not task_name:
-                        messagebox.showwarning("数据警告", f"第 {line_number} 行：任务名称为空，已跳过。", parent=self.root)
-                        line_number += 1
-                        continue
-                    try:
-                        duration = int(duration_str)
-                        if duration <= 0:
-                            raise ValueError
-                    except ValueError:
-                        messagebox.showwarning("数据警告", f"第 {line_number} 行：时长 '{duration_str}' 不是有效的正整数，已跳过。", parent=self.root)
-                        line_number += 1
-                        continue
-
-                    imported_tasks.append(Task(task_name, duration))
-                    line_number += 1
-
-                if not imported_tasks:
-                    messagebox.showinfo("提示", "CSV文件中没有找到有效可导入的任务。", parent=self.root)
-                    return
-
-                # 询问用户是否清空现有任务
-                if self.task_list.get_all():
-                    if messagebox.askyesno("确认导入", f"即将导入 {len(imported_tasks)} 个任务。\n是否清空当前所有任务？", parent=self.root):
-                        self.task_list.clear()
-                
-                # 添加导入的任务
-                for task in imported_tasks:
-                    self.task_list.add(task)
-                
-                self._refresh_treeview()
-                self._update_stats()
-                messagebox.showinfo("成功", f"成功导入 {len(imported_tasks)} 个任务！", parent=self.root)
+        # 在后台线程中流式解析，界面保持响应并显示进度
+        job = BackgroundJob(stream_tasks, file_path, name="CsvImport")
+        ProgressDialog(self.root, "正在导入CSV", job,
+                       on_done=lambda future: self._on_csv_parsed(file_path, future))
 
+    def _on_csv_parsed(self, file_path, future):
+        """后台解析结束后，在界面线程中汇总错误并一次性提交"""
+        try:
+            result = future.result()
+        except CsvFormatError as e:
+            messagebox.showerror("格式错误", str(e), parent=self.root)
+            return
         except FileNotFoundError:
             messagebox.showerror("错误", f"文件未找到: {file_path}", parent=self.root)
+            return
         except Exception as e:
             messagebox.showerror("导入失败", f"发生未知错误: {e}", parent=self.root)
+            return
+
+        if result.cancelled:
+            messagebox.showinfo("提示", "已取消导入。", parent=self.root)
+            return
+
+        if result.error_count:
+            ErrorReportDialog(self.root, "数据警告",
+                              f"共 {result.error_count} 行数据无效，已跳过"
+                              f"（显示前 {len(result.errors)} 条）：", result.errors)
+
+        imported_tasks = result.tasks
+        if not imported_tasks:
+            messagebox.showinfo("提示", "CSV文件中没有找到有效可导入的任务。", parent=self.root)
+            return
+
+        # 询问用户是否清空现有任务
+        replace = bool(self.task_list.get_task_count()) and messagebox.askyesno(
+            "确认导入", f"即将导入 {len(imported_tasks)} 个任务。\n是否清空当前所有任务？", parent=self.root)
+
+        # 清空与批量添加合并为一步，可以一次撤销
+        with self.history.group():
+            if replace:
+                self.task_list.clear()
+            self.task_list.insert_many(self.task_list.get_task_count(), imported_tasks)
+
+        self._update_stats()
+        messagebox.showinfo("成功", f"成功导入 {len(imported_tasks)} 个任务！", parent=self.root)
 
 #将当前所有任务导出到CSV文件
     def _export_csv(self):
     
-        tasks = self.task_list.get_all()
-        if not tasks:
+        if not self.task_list.get_task_count():
             messagebox.showwarning("提示", "当前没有任务可以导出。", parent=self.root)
             return
 
         file_path = filedialog.asksaveasfilename(
             title="保存任务到CSV文件",
-            filetypes=[("CSV 文件", "*.csv"), ("所有文件", "*.*")],
+            filetypes=[("CSV 文件", "*.csv"), ("GZIP 压缩的 CSV", "*.csv.gz"), ("所有文件", "*.*")],
             defaultextension=".csv",
             initialfile="会议任务导出.csv"
         )
@@ -277,19 +280,20 @@ class MainApp:
         if not file_path:
             return # 用户取消了选择
 
-        try:
-            with open(file_path, mode='w', encoding='utf-8-sig', newline='') as file:
-                fieldnames = ['任务名称', '时长(分钟)']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-
-                writer.writeheader() # 写入表头
-                for task in tasks:
-                    writer.writerow({'任务名称': task.name, '时长(分钟)': task.minutes})
-
-            messagebox.showinfo("成功", f"任务已成功导出到:\n{file_path}", parent=self.root)
+        # 在后台线程中分批写入临时文件，完成后原子替换；.gz 扩展名时直接写入 gzip
+        job = BackgroundJob(write_tasks, file_path, self.task_list.get_all(), name="CsvExport")
+        ProgressDialog(self.root, "正在导出CSV", job, on_done=self._on_csv_exported)
 
+    def _on_csv_exported(self, future):
+        try:
+            result = future.result()
         except Exception as e:
             messagebox.showerror("导出失败", f"发生未知错误: {e}", parent=self.root)
+            return
+        if result.cancelled:
+            messagebox.showinfo("提示", "已取消导出，原文件未改动。", parent=self.root)
+            return
+        messagebox.showinfo("成功", f"任务已成功导出到:\n{result.path}", parent=self.root)
 
 if __name__ == "__main__":
     root = tk.Tk()
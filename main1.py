@@ -1,27 +1,93 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-from task_list import TaskList
-from add_task_dialog import AddTaskDialog
-from task import Task
-from countdown_timer import CountdownTimer
-from voice_service import VoiceService
+# 启动时间线必须在导入其余模块之前开始计时，“导入模块”阶段才能包含它们的导入耗时，
+# 因此下面的导入有意放在第一条语句之后（E402）
+from startup_timeline import StartupTimeline
+timeline = StartupTimeline()
+
+import logging  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+import tkinter as tk  # noqa: E402
+from tkinter import ttk, messagebox  # noqa: E402
+from task_list import TaskList  # noqa: E402
+from add_task_dialog import AddTaskDialog  # noqa: E402
+from task import Task  # noqa: E402
+from virtual_task_table import VirtualTaskTable  # noqa: E402
+from countdown_timer import CountdownTimer  # noqa: E402
+from voice_service import VoiceService  # noqa: E402
+from task_journal import JournalLockedError, TaskJournal, journal_dir  # noqa: E402
+from undo_history import UndoHistory  # noqa: E402
+from render_loop import LatestSlot, RenderLoop  # noqa: E402
+from projector_view import ProjectorView  # noqa: E402
+from idle_monitor import IdleMonitor  # noqa: E402
+from eta_index import EtaIndex  # noqa: E402
+
+timeline.mark("导入模块")
 
 
 class MainApp:
-    def __init__(self, root_window: tk.Tk):
+    def __init__(self, root_window: tk.Tk, task_list=None):
         self.root = root_window
         root_window.title("团队会议倒计时器 - 带语音提醒")
-        root_window.geometry("600x500")
-
-        # 初始化服务
-        self.task_list = TaskList()
-        self.voice_service = VoiceService()
+        root_window.geometry("760x500")
+
+        # 初始化服务（语音引擎在后台初始化，不阻塞窗口显示）
+        self.journal = None
+        if task_list is None:
+            # 自动保存：恢复上次的任务列表，之后的每次修改都追加到日志
+            task_list = TaskList()
+            try:
+                self.journal = TaskJournal(journal_dir("main1"))
+            except JournalLockedError as e:
+                logging.warning(e)
+                messagebox.showwarning("自动保存", "另一个窗口正在使用自动保存，本窗口中的修改不会被保存。")
+            if self.journal is not None:
+                self.journal.recover(task_list)
+                self.journal.attach(task_list)
+            timeline.mark("恢复任务")
+        self.task_list = task_list
+        # 撤销/重做历史：持久化序列记录每个版本，快照 O(1)
+        self.history = UndoHistory(self.task_list)
+        # 任务时长的前缀和索引：预计开始/结束时间只为可见行按需查询，O(log n)
+        self.eta_index = EtaIndex(self.task_list)
+        self.voice_service = VoiceService(background=True)
         self.countdown_timer = CountdownTimer(self.task_list, self.voice_service)
+        timeline.mark("创建服务")
 
         self._create_ui()
+        self._update_stats()
+        timeline.mark("创建界面")
+        root_window.protocol("WM_DELETE_WINDOW", self._on_close)
+        root_window.bind("<Control-z>", self._undo)
+        root_window.bind("<Control-y>", self._redo)
+
+        # 窗口最小化或被完全遮挡时进入空闲模式：暂停显示刷新，计时线程只在任务边界醒来
+        self.idle_monitor = IdleMonitor(root_window, self._on_visibility_changed)
+        self.idle_monitor.add_source("计时线程", lambda: self.countdown_timer.wakeups)
+        self.idle_monitor.add_source("界面刷新", lambda: self.render_loop.wakeups)
 
         # 测试语音功能
         self._test_voice_on_startup()
+        self._schedule_eta_tick()
+        self.root.after_idle(self._on_first_frame)
+
+    def _on_first_frame(self):
+        """首帧绘制完成"""
+        timeline.mark("首帧绘制")
+
+    def _on_visibility_changed(self, visible):
+        """窗口隐藏时暂停显示刷新；重新可见时立即恢复并显示当前剩余时间"""
+        self.countdown_timer.set_display_active(visible)
+        if visible:
+            self.render_loop.resume()
+        else:
+            self.render_loop.pause()
+
+    def _on_close(self):
+        """关闭窗口前提交自动保存日志"""
+        logging.info("唤醒统计:\n%s", self.idle_monitor.report())
+        if self.journal is not None:
+            self.journal.close()
+        self.root.destroy()
 
     def _create_ui(self):
         """创建用户界面"""
@@ -52,6 +118,8 @@ class MainApp:
         ttk.Button(btn_frame, text="+ 添加任务", command=self._open_add_dialog).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="🗑️ 删除选中", command=self._delete_selected).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="🗑️ 清空所有", command=self._clear_all).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="↶ 撤销", command=self._undo).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="↷ 重做", command=self._redo).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="📊 统计信息", command=self._show_stats).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="🔊 测试语音", command=self._test_voice).pack(side="left", padx=5)
 
@@ -65,30 +133,23 @@ class MainApp:
         self.total_time_label = ttk.Label(self.stats_frame, text="总时长: 0 分钟")
         self.total_time_label.pack(side="left", padx=20)
 
+        self.meeting_end_label = ttk.Label(self.stats_frame, text="预计结束: --:--")
+        self.meeting_end_label.pack(side="left", padx=20)
+
         # Treeview
         tree_frame = ttk.Frame(task_frame)
         tree_frame.pack(fill="both", expand=True, pady=5)
 
-        columns = ("#1", "#2", "#3")
-        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=8)
-
-        # 设置列
-        self.tree.heading("#1", text="序号")
-        self.tree.heading("#2", text="任务名称")
-        self.tree.heading("#3", text="时长(分钟)")
-
-        self.tree.column("#1", width=60, anchor="center")
-        self.tree.column("#2", width=250)
-        self.tree.column("#3", width=100, anchor="center")
-
-        # 滚动条
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-
-        self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        # 虚拟滚动表格：只渲染可见行，任务列表变更时自动刷新
+        self.task_table = VirtualTaskTable(
+            tree_frame, self.task_list, height=8,
+            format_row=lambda number, task: (number, task.name, task.minutes,
+                                             self.eta_index.format_eta(number - 1)),
+            columns=VirtualTaskTable.COLUMNS + (("#4", "预计时间", 110, "center"),))
+        self.task_table.pack(fill="both", expand=True)
 
-        self.tree.bind("<Double-1>", self._edit_task)
+        # 绑定双击事件编辑任务
+        self.task_table.bind_rows("<Double-1>", self._edit_task)
 
     def _create_countdown_section(self):
         """创建倒计时显示区域"""
@@ -121,6 +182,11 @@ class MainApp:
         )
         self.progress_label.pack(pady=5)
 
+        # 计时线程只把最新状态写入槽中，界面线程按帧读取并只更新变化的控件
+        self.timer_slot = LatestSlot()
+        self.render_loop = RenderLoop(self.root, self.timer_slot, self._render_countdown)
+        self.projector = None
+
     def _create_control_buttons(self):
         """创建控制按钮区域"""
         control_frame = ttk.Frame(self.root)
@@ -148,10 +214,24 @@ class MainApp:
         ttk.Button(control_frame, text="➕ 加时5分钟",
                    command=lambda: self._add_time(5)).pack(side="left", padx=5)
 
+        ttk.Button(control_frame, text="📽️ 投影模式",
+                   command=self._open_projector).pack(side="left", padx=5)
+
     def _test_voice_on_startup(self):
         """启动时测试语音功能"""
-        # 延迟测试，避免干扰启动
-        self.root.after(1000, self._test_voice_quietly)
+        # 语音引擎在后台初始化，在界面线程中轮询，就绪（或失败）后再测试
+        self.root.after(100, self._wait_voice_ready)
+
+    def _wait_voice_ready(self):
+        """等待后台语音初始化完成"""
+        if not self.voice_service.ready.done():
+            self.root.after(100, self._wait_voice_ready)
+            return
+        for label, duration in self.voice_service.init_timings:
+            timeline.record(f"语音: {label}", duration)
+        timeline.mark("语音初始化完成")
+        timeline.log()
+        self._test_voice_quietly()
 
     def _test_voice_quietly(self):
         """静默测试语音功能"""
@@ -174,57 +254,83 @@ class MainApp:
     def _on_task_added(self, task):
         """任务添加回调"""
         self.task_list.add(task)
-        self._refresh_treeview()
         self._update_stats()
 
-    def _refresh_treeview(self):
-        """刷新Treeview显示"""
-        self.tree.delete(*self.tree.get_children())
-        tasks = self.task_list.get_all()
-
-        for i, task in enumerate(tasks, 1):
-            self.tree.insert("", "end", values=(i, task.name, task.minutes))
-
     def _update_stats(self):
         """更新统计信息"""
-        total_tasks = len(self.task_list.get_all())
-        total_time = sum(task.minutes for task in self.task_list.get_all())
+        total_tasks = self.task_list.get_task_count()
+        total_time = self.task_list.get_total_time()
 
         self.total_tasks_label.config(text=f"总任务数: {total_tasks}")
         self.total_time_label.config(text=f"总时长: {total_time} 分钟")
+        self._update_meeting_end()
+
+    def _update_meeting_end(self):
+        """更新会议预计结束时间"""
+        if self.task_list.get_task_count():
+            end = time.strftime("%H:%M", time.localtime(self.eta_index.meeting_end()))
+        else:
+            end = "--:--"
+        self.meeting_end_label.config(text=f"预计结束: {end}")
+
+    def _refresh_eta(self):
+        """预计时间整体平移后，更新结束时间并重绘表格的可见行"""
+        self._update_meeting_end()
+        self.task_table.refresh()
+
+    def _schedule_eta_tick(self):
+        """在下一个整分钟刷新预计时间（未开会或暂停时预计时间随时间推移）"""
+        self.root.after(int((60 - time.time() % 60) * 1000) + 50, self._eta_tick)
+
+    def _eta_tick(self):
+        progress = self.countdown_timer.progress()
+        if progress.running:
+            self.eta_index.set_progress(progress.task_number - 1, progress.remaining)
+        self._refresh_eta()
+        self._schedule_eta_tick()
 
     def _delete_selected(self):
         """删除选中的任务"""
-        selected = self.tree.selection()
+        selected = self.task_table.selection()
         if not selected:
             messagebox.showwarning("警告", "请先选择要删除的任务！")
             return
 
         if messagebox.askyesno("确认删除", "确定要删除选中的任务吗？"):
-            # 获取选中的索引并删除（从后往前删除避免索引变化）
-            for item in reversed(selected):
-                index = self.tree.index(item)
-                self.task_list.delete(index)
+            # 一次批量删除，只触发一次界面刷新
+            self.task_list.delete_many(selected)
+
+            self._update_stats()
+
+    def _undo(self, event=None):
+        """撤销上一步修改"""
+        if self.history.undo():
+            self._update_stats()
+        else:
+            self.root.bell()
 
-            self._refresh_treeview()
+    def _redo(self, event=None):
+        """重做上一次撤销的修改"""
+        if self.history.redo():
             self._update_stats()
+        else:
+            self.root.bell()
 
     def _clear_all(self):
         """清空所有任务"""
-        if not self.task_list.get_all():
+        if not self.task_list.get_task_count():
             messagebox.showinfo("提示", "任务列表已经是空的！")
             return
 
-        if messagebox.askyesno("确认清空", "确定要清空所有任务吗？此操作不可撤销！"):
+        if messagebox.askyesno("确认清空", "确定要清空所有任务吗？\n之后可以点击“撤销”恢复。"):
             self.task_list.clear()
-            self._refresh_treeview()
             self._update_stats()
 
     def _show_stats(self):
         """显示详细统计信息"""
-        tasks = self.task_list.get_all()
-        total_tasks = len(tasks)
-        total_time = sum(task.minutes for task in tasks)
+        tasks = self.task_list.view()
+        total_tasks = self.task_list.get_task_count()
+        total_time = self.task_list.get_total_time()
 
         if total_tasks == 0:
             messagebox.showinfo("统计信息", "当前没有任务")
@@ -246,13 +352,11 @@ class MainApp:
     def _edit_task(self, event=None):
         """双击编辑任务"""
         # 修复：使用 _ 前缀表示未使用的参数
-        selected = self.tree.selection()
+        selected = self.task_table.selection()
         if selected:
-            item = selected[0]
-            index = self.tree.index(item)
-            tasks = self.task_list.get_all()
-            if 0 <= index < len(tasks):
-                task = tasks[index]
+            index = selected[0]
+            if 0 <= index < self.task_list.get_task_count():
+                task = self.task_list[index]
                 self._open_edit_dialog(index, task)
 
     def _open_edit_dialog(self, index, task):
@@ -287,7 +391,6 @@ class MainApp:
             # 更新任务
             updated_task = Task(name=new_name, minutes=min_var.get())
             self.task_list.update(index, updated_task)
-            self._refresh_treeview()
             self._update_stats()
             dialog.destroy()
 
@@ -298,41 +401,50 @@ class MainApp:
 
     def _start_meeting(self):
         """开始会议"""
-        if not self.task_list.get_all():
+        if not self.task_list.get_task_count():
             messagebox.showwarning("警告", "请先添加任务再开始会议！")
             return
 
+        # 丢弃上一场会议的加时，预计时间按计划时长重新计算
+        self.eta_index.reset()
+        # 先启动渲染循环，计时线程发布的第一个状态不会被当作旧状态跳过
+        self.render_loop.start()
         success = self.countdown_timer.start_meeting(
             on_timer_update=self._on_timer_update,
             on_task_complete=self._on_task_complete,
             on_meeting_end=self._on_meeting_end
         )
 
-        if success:
+        if not success:
+            self.render_loop.stop()
+        else:
             self.start_btn.config(state="disabled")
             self.pause_btn.config(state="normal")
             self.stop_btn.config(state="normal")
 
     def _on_timer_update(self, task_name, minutes, seconds, current_task_num):
-        """定时器更新回调"""
-
-        def update_ui():
-            self.current_task_label.config(text=f"当前任务: {task_name}")
-            self.time_label.config(text=f"{minutes:02d}:{seconds:02d}")
-
-            total_tasks = len(self.task_list.get_all())
-            self.progress_label.config(text=f"任务进度: {current_task_num}/{total_tasks}")
-
-            # 最后1分钟变为红色警告
-            if minutes == 0 and seconds <= 30:
-                self.time_label.config(foreground="red")
-            elif minutes < 2:
-                self.time_label.config(foreground="orange")
-            else:
-                self.time_label.config(foreground="green")
-
-        # 修复：移除多余的参数
-        self.root.after(0, update_ui)
+        """定时器更新回调（计时线程）：只发布最新状态，由渲染循环在界面线程中绘制"""
+        self.timer_slot.publish((task_name, minutes, seconds, current_task_num))
+
+    def _render_countdown(self, state):
+        """把计时状态转换为各控件的显示内容"""
+        task_name, minutes, seconds, current_task_num = state
+        # 最后1分钟变为红色警告
+        if minutes == 0 and seconds <= 30:
+            colour = "red"
+        elif minutes < 2:
+            colour = "orange"
+        else:
+            colour = "green"
+        total_tasks = self.task_list.get_task_count()
+        # 以当前任务的剩余时间为锚点，加时、跳过或超时后整体平移预计时间
+        if self.eta_index.set_progress(current_task_num - 1, minutes * 60 + seconds):
+            self._refresh_eta()
+        return {
+            self.current_task_label: {"text": f"当前任务: {task_name}"},
+            self.time_label: {"text": f"{minutes:02d}:{seconds:02d}", "foreground": colour},
+            self.progress_label: {"text": f"任务进度: {current_task_num}/{total_tasks}"},
+        }
 
     def _on_task_complete(self, task_name):
         """任务完成回调"""
@@ -347,6 +459,9 @@ class MainApp:
         """会议结束回调"""
 
         def update_ui():
+            self.render_loop.stop()
+            self.eta_index.reset()
+            self._refresh_eta()
             total_minutes = total_seconds // 60
             self.current_task_label.config(text="会议结束！")
             self.time_label.config(text="00:00", foreground="blue")
@@ -389,12 +504,24 @@ class MainApp:
     def _add_time(self, minutes):
         """为当前任务增加时间"""
         if self.countdown_timer.add_time_to_current_task(minutes):
+            self.eta_index.extend(self.countdown_timer.current_task_index, minutes * 60)
+            self._refresh_eta()
             messagebox.showinfo("加时", f"已为当前任务增加{minutes}分钟")
         else:
             messagebox.showwarning("加时失败", "当前没有运行中的任务")
 
+    def _open_projector(self):
+        """打开全屏投影倒计时（已打开时切换到前台）"""
+        if self.projector is not None and self.projector.winfo_exists():
+            self.projector.lift()
+            return
+        self.projector = ProjectorView(self.root, self.countdown_timer)
+
     def _reset_timer_ui(self):
         """重置计时器UI"""
+        self.render_loop.stop()
+        self.eta_index.reset()
+        self._refresh_eta()
         self.current_task_label.config(text="当前任务: 未开始")
         self.time_label.config(text="00:00", foreground="red")
         self.progress_label.config(text="任务进度: 0/0")
@@ -406,6 +533,14 @@ class MainApp:
 
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv:
+        logging.basicConfig(level=logging.INFO)
+    task_list = None
+    if "--db" in sys.argv:
+        # 使用 SQLite 数据库保存任务，崩溃后重新打开即可恢复
+        from sqlite_task_list import SqliteTaskList
+        task_list = SqliteTaskList(sys.argv[sys.argv.index("--db") + 1])
     root = tk.Tk()
-    app = MainApp(root)
+    timeline.mark("创建根窗口")
+    app = MainApp(root, task_list)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""命令行会议计时器（无需图形界面）
+
+用法: python -m meeting_cli 议程.csv|议程.agenda [--no-voice]
+
+CSV 格式与图形界面导入/导出一致：表头为 任务名称,时长(分钟)。
+也可以直接传入 .agenda 二进制议程（见 binary_agenda），无需重新解析CSV。
+运行中输入命令并回车：p 暂停，r 继续，s 跳过当前，+ 加时5分钟，q 停止。
+"""
+import argparse
+import sys
+import threading
+from binary_agenda import AGENDA_EXTENSION, AgendaFormatError, MappedAgenda
+from task_csv import CsvFormatError, read_tasks
+from task_list import TaskList
+from countdown_timer import CountdownTimer
+from voice_service import VoiceService
+
+
+def _read_commands(timer: CountdownTimer, done: threading.Event):
+    """读取标准输入中的控制命令"""
+    for line in sys.stdin:
+        command = line.strip()
+        if command == 'p':
+            timer.pause_timer()
+            print("\n已暂停")
+        elif command == 'r':
+            timer.resume_timer()
+            print("\n已继续")
+        elif command == 's':
+            timer.skip_current_task()
+            print("\n已跳过当前任务")
+        elif command == '+':
+            if timer.add_time_to_current_task(5):
+                print("\n已为当前任务增加5分钟")
+        elif command == 'q':
+            timer.stop_timer()
+            done.set()
+            return
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m meeting_cli", description="命令行会议计时器")
+    parser.add_argument("agenda_file", help="议程CSV文件或 .agenda 二进制议程")
+    parser.add_argument("--no-voice", action="store_true", help="关闭语音提醒")
+    args = parser.parse_args(argv)
+
+    if args.agenda_file.endswith(AGENDA_EXTENSION):
+        try:
+            task_list = MappedAgenda(args.agenda_file)
+        except (OSError, AgendaFormatError) as e:
+            print(f"导入失败: {e}", file=sys.stderr)
+            return 1
+        if not task_list.get_task_count():
+            print("议程中没有任务。", file=sys.stderr)
+            return 1
+    else:
+        try:
+            tasks, errors = read_tasks(args.agenda_file)
+        except (OSError, CsvFormatError) as e:
+            print(f"导入失败: {e}", file=sys.stderr)
+            return 1
+        for error in errors:
+            print(error, file=sys.stderr)
+        if not tasks:
+            print("CSV文件中没有找到有效可导入的任务。", file=sys.stderr)
+            return 1
+
+        task_list = TaskList()
+        task_list.insert_many(0, tasks)
+    total = task_list.get_task_count()
+
+    def on_timer_update(task_name, minutes, seconds, current_task_num):
+        sys.stdout.write(f"\r[{current_task_num}/{total}] {task_name}  {minutes:02d}:{seconds:02d}  ")
+        sys.stdout.flush()
+
+    def on_task_complete(task_name):
+        print(f"\n任务 '{task_name}' 已完成！")
+
+    done = threading.Event()
+
+    def on_meeting_end(total_seconds):
+        print(f"\n会议已完成！总用时: {total_seconds // 60}分钟")
+        done.set()
+
+    voice_service = VoiceService(enabled=not args.no_voice)
+    timer = CountdownTimer(task_list, voice_service)
+    if not timer.start_meeting(on_timer_update, on_task_complete, on_meeting_end):
+        return 1
+    threading.Thread(target=_read_commands, args=(timer, done), daemon=True).start()
+    try:
+        done.wait()
+    except KeyboardInterrupt:
+        timer.stop_timer()
+        print("\n会议已停止")
+        voice_service.shutdown()
+        return 0
+    # 语音工作线程是守护线程：退出前播完最后的任务完成和会议结束播报
+    voice_service.shutdown(wait=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+import math
+import threading
+import time
+from typing import List, Optional
+from task_list import TaskList
+from voice_service import MEETING_END_MESSAGE, TASK_BOUNDARY_KEY
+
+
+class TimerEntry:
+    """时间轮中的一个定时项"""
+    __slots__ = ("tick", "due", "callback", "slot")
+
+    def __init__(self, tick: int, due: float, callback):
+        self.tick = tick          # 到期的绝对刻度号
+        self.due = due            # 期望到期时刻（单调时钟）
+        self.callback = callback
+        self.slot = None          # 所在的槽，取消后为 None
+
+
+class TimingWheel:
+    """哈希时间轮：插入和取消都是 O(1)
+
+    每个槽是一个集合，定时项按绝对刻度号落入 tick % size 的槽中；
+    转到某个槽时只触发刻度号已到的项，其余项（下一圈才到期）留在原槽。
+    本类不加锁，由使用方负责同步。
+    """
+
+    def __init__(self, tick_interval: float = 0.05, size: int = 512, origin: Optional[float] = None):
+        self.tick_interval = tick_interval
+        self.size = size
+        self.origin = time.monotonic() if origin is None else origin
+        self.current_tick = 0
+        self.count = 0
+        self._slots = [set() for _ in range(size)]
+
+    def tick_time(self, tick: int) -> float:
+        """第 tick 个刻度对应的时刻"""
+        return self.origin + tick * self.tick_interval
+
+    def schedule(self, due: float, callback) -> TimerEntry:
+        """在 due 时刻（所在刻度）触发 callback(entry)"""
+        if self.count == 0:
+            # 时间轮空闲期间没有推进，插入前先追上当前时刻
+            idle_tick = int((time.monotonic() - self.origin) / self.tick_interval)
+            self.current_tick = max(self.current_tick, idle_tick)
+        tick = max(math.ceil((due - self.origin) / self.tick_interval), self.current_tick + 1)
+        entry = TimerEntry(tick, due, callback)
+        entry.slot = self._slots[tick % self.size]
+        entry.slot.add(entry)
+        self.count += 1
+        return entry
+
+    def cancel(self, entry: TimerEntry):
+        """取消定时项，重复取消无副作用"""
+        if entry.slot is not None:
+            entry.slot.discard(entry)
+            entry.slot = None
+            self.count -= 1
+
+    def advance(self) -> List[TimerEntry]:
+        """推进一个刻度，返回到期的定时项（已从时间轮移除）"""
+        self.current_tick += 1
+        slot = self._slots[self.current_tick % self.size]
+        if not slot:
+            return []
+        expired = [entry for entry in slot if entry.tick <= self.current_tick]
+        for entry in expired:
+            slot.discard(entry)
+            entry.slot = None
+        self.count -= len(expired)
+        return expired
+
+
+class ScheduledMeeting:
+    """由 MeetingScheduler 驱动的一场会议，控制接口与 CountdownTimer 一致"""
+    __slots__ = ("_scheduler", "_tasks", "_on_timer_update", "_on_task_complete", "_on_meeting_end",
+                 "_entry", "_deadline", "_paused_remaining", "_elapsed_base", "_segment_start",
+                 "current_task_index", "is_running", "is_paused")
+
+    def __init__(self, scheduler, tasks, on_timer_update, on_task_complete, on_meeting_end):
+        self._scheduler = scheduler
+        self._tasks = tasks
+        self._on_timer_update = on_timer_update
+        self._on_task_complete = on_task_complete
+        self._on_meeting_end = on_meeting_end
+        self._entry = None
+        self._deadline = 0.0
+        self._paused_remaining = 0.0
+        self._elapsed_base = 0.0
+        self._segment_start = None
+        self.current_task_index = 0
+        self.is_running = False
+        self.is_paused = False
+
+    @property
+    def remaining_time(self) -> int:
+        """当前任务剩余秒数（向上取整）"""
+        with self._scheduler._lock:
+            if not self.is_running:
+                return 0
+            if self.is_paused:
+                return math.ceil(self._paused_remaining)
+            return math.ceil(max(0.0, self._deadline - time.monotonic()))
+
+    @property
+    def total_elapsed_time(self) -> int:
+        """会议实际已用秒数（不含暂停时间）"""
+        with self._scheduler._lock:
+            elapsed = self._elapsed_base
+            if self._segment_start is not None:
+                elapsed += time.monotonic() - self._segment_start
+        return int(elapsed)
+
+    def pause_timer(self):
+        """暂停计时器"""
+        with self._scheduler._lock:
+            if self.is_running and not self.is_paused:
+                now = time.monotonic()
+                self._paused_remaining = max(0.0, self._deadline - now)
+                self._close_segment(now)
+                self._scheduler._cancel(self)
+                self.is_paused = True
+
+    def resume_timer(self):
+        """恢复计时器"""
+        with self._scheduler._lock:
+            if self.is_running and self.is_paused:
+                now = time.monotonic()
+                self._deadline = now + self._paused_remaining
+                self._segment_start = now
+                self.is_paused = False
+                self._scheduler._reschedule(self, now)
+
+    def stop_timer(self):
+        """停止计时器"""
+        with self._scheduler._lock:
+            if self.is_running:
+                self._close_segment(time.monotonic())
+                self._scheduler._cancel(self)
+                self.is_running = False
+                self.is_paused = False
+
+    def add_time_to_current_task(self, minutes: int):
+        """为当前任务增加时间"""
+        with self._scheduler._lock:
+            if self.is_running and not self.is_paused:
+                self._deadline += minutes * 60
+                self._scheduler._reschedule(self, time.monotonic())
+                return True
+        return False
+
+    def skip_current_task(self):
+        """跳过当前任务"""
+        with self._scheduler._lock:
+            if not self.is_running:
+                return False
+            now = time.monotonic()
+            if self.is_paused:
+                self._segment_start = now
+                self.is_paused = False
+            self._scheduler._cancel(self)
+            # 尚未播出的上一条切换播报已经过时
+            voice = self._scheduler.voice_service
+            if voice:
+                voice.discard(TASK_BOUNDARY_KEY)
+            self.current_task_index += 1
+            if self.current_task_index < len(self._tasks):
+                self._deadline = now + self._tasks[self.current_task_index].minutes * 60
+                self._scheduler._reschedule(self, now)
+            else:
+                # 跳过最后一个任务时在下一个刻度结束会议
+                self._deadline = now
+                self._scheduler._reschedule(self, now)
+            return True
+
+    def _close_segment(self, now: float):
+        """结束当前计时段，把其时长计入已用时间（调用方需持有锁）"""
+        if self._segment_start is not None:
+            self._elapsed_base += now - self._segment_start
+            self._segment_start = None
+
+    def _next_wakeup(self, now: float) -> float:
+        """下一次需要唤醒的时刻：显示值变化时或任务截止时"""
+        remaining = self._deadline - now
+        if self._on_timer_update and remaining > 0:
+            return self._deadline - (math.ceil(remaining) - 1)
+        return self._deadline
+
+    def _fire(self, now: float, events: list):
+        """定时项到期时由调度线程调用（持有锁），回调收集到 events 中在锁外执行"""
+        if now >= self._deadline:
+            if self.current_task_index < len(self._tasks):
+                task = self._tasks[self.current_task_index]
+                next_task = None
+                if self.current_task_index + 1 < len(self._tasks):
+                    next_task = self._tasks[self.current_task_index + 1].name
+                voice = self._scheduler.voice_service
+                if voice:
+                    events.append((voice.announce_task_completion, (task.name, next_task)))
+                if self._on_task_complete:
+                    events.append((self._on_task_complete, (task.name,)))
+                self.current_task_index += 1
+
+            if self.current_task_index >= len(self._tasks):
+                self._close_segment(now)
+                self.is_running = False
+                if self._on_meeting_end:
+                    events.append((self._on_meeting_end, (int(self._elapsed_base),)))
+                voice = self._scheduler.voice_service
+                if voice:
+                    events.append((voice.speak, (MEETING_END_MESSAGE,)))
+                return
+            # 紧接上一任务的截止时间开始，调度延迟不会累积
+            self._deadline += self._tasks[self.current_task_index].minutes * 60
+
+        if self._on_timer_update:
+            shown = math.ceil(max(0.0, self._deadline - now))
+            task = self._tasks[self.current_task_index]
+            events.append((self._on_timer_update,
+                           (task.name, shown // 60, shown % 60, self.current_task_index + 1)))
+        self._scheduler._reschedule(self, now)
+
+
+class MeetingScheduler:
+    """在单个线程上用时间轮同时驱动大量会议倒计时
+
+    适用于服务端为每个会议室各跑一个议程的场景：不再是每场会议一个线程，
+    所有会议的下一次唤醒都登记在同一个时间轮里。回调与
+    CountdownTimer.start_meeting 相同，在调度线程上执行。
+    """
+
+    def __init__(self, voice_service=None, tick_interval: float = 0.05, wheel_size: int = 512):
+        self.voice_service = voice_service
+        self._lock = threading.RLock()
+        self._cond = threading.Condition(self._lock)
+        self._wheel = TimingWheel(tick_interval, wheel_size)
+        self._thread = None
+        self._closed = False
+        self._jitter_count = 0
+        self._jitter_total = 0.0
+        self._jitter_max = 0.0
+
+    def start_meeting(self, task_list: TaskList, on_timer_update, on_task_complete,
+                      on_meeting_end) -> Optional[ScheduledMeeting]:
+        """开始一场会议，议程为空时返回 None"""
+        tasks = task_list.get_all()
+        if not tasks:
+            return None
+
+        meeting = ScheduledMeeting(self, tasks, on_timer_update, on_task_complete, on_meeting_end)
+        if self.voice_service:
+            self.voice_service.announce_meeting_start(len(tasks), task_list.get_total_time())
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("调度器已关闭")
+            now = time.monotonic()
+            meeting.is_running = True
+            meeting._segment_start = now
+            meeting._deadline = now + tasks[0].minutes * 60
+            # 立即触发一次以刷新初始显示
+            meeting._entry = self._wheel.schedule(now, meeting)
+            self._cond.notify_all()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="MeetingScheduler", daemon=True)
+                self._thread.start()
+        return meeting
+
+    def shutdown(self):
+        """停止调度线程，未结束的会议不再推进"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def meeting_count(self) -> int:
+        """时间轮中等待触发的会议数（暂停的会议不占定时项）"""
+        with self._lock:
+            return self._wheel.count
+
+    def get_jitter_stats(self) -> dict:
+        """获取定时触发相对期望时刻的延迟统计（秒）"""
+        with self._lock:
+            count = self._jitter_count
+            return {
+                "count": count,
+                "avg": self._jitter_total / count if count else 0.0,
+                "max": self._jitter_max,
+            }
+
+    def _cancel(self, meeting: ScheduledMeeting):
+        """取消会议当前的定时项（调用方需持有锁）"""
+        if meeting._entry is not None:
+            self._wheel.cancel(meeting._entry)
+            meeting._entry = None
+
+    def _reschedule(self, meeting: ScheduledMeeting, now: float):
+        """按会议状态重新登记下一次唤醒（调用方需持有锁）"""
+        self._cancel(meeting)
+        meeting._entry = self._wheel.schedule(meeting._next_wakeup(now), meeting)
+        self._cond.notify_all()
+
+    def _run(self):
+        """调度线程：按绝对刻度时刻推进时间轮，空闲时不占用CPU"""
+        wheel = self._wheel
+        while True:
+            events = []
+            with self._cond:
+                while wheel.count == 0 and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                now = time.monotonic()
+                delay = wheel.tick_time(wheel.current_tick + 1) - now
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                for entry in wheel.advance():
+                    meeting = entry.callback
+                    meeting._entry = None
+                    lateness = max(0.0, now - entry.due)
+                    self._jitter_count += 1
+                    self._jitter_total += lateness
+                    self._jitter_max = max(self._jitter_max, lateness)
+                    meeting._fire(now, events)
+
+            # 回调在锁外执行，回调中可以安全地调用会议控制方法
+            for callback, args in events:
+                callback(*args)
@@ -0,0 +1,179 @@
+"""会议快进模拟
+
+在 VirtualClock 上同步运行 CountdownTimer：等待不阻塞，按脚本在指定的会议时刻投递
+暂停、继续、跳过、加时和停止命令，整场议程以 CPU 允许的最快速度跑完。
+显示回调、任务完成、会议结束、语音播报和脚本命令都按虚拟时刻记录为事件轨迹，
+同样的议程和脚本总是得到同样的轨迹，可以直接比较做回归测试。
+
+用法: python -m meeting_simulation 议程.csv|议程.agenda [--at 秒 命令 [分钟]]... [--display]
+命令为 pause、resume、skip、add_time（需要分钟数）、stop，例如：
+    python -m meeting_simulation 议程.csv --at 600 pause --at 900 resume --at 1200 add_time 5
+"""
+import argparse
+import sys
+import time
+from typing import Callable, List, NamedTuple, Optional
+from binary_agenda import AGENDA_EXTENSION, AgendaFormatError, MappedAgenda
+from clock import VirtualClock
+from countdown_timer import CountdownTimer
+from task_csv import CsvFormatError, read_tasks
+from task_list import TaskList
+from voice_service import VoiceService
+
+# 轨迹事件类型
+UPDATE = "update"       # 显示回调 (任务序号, 分, 秒)
+COMPLETE = "complete"   # 任务完成 (任务名称,)
+END = "end"             # 会议结束 (总用时秒数,)
+VOICE = "voice"         # 语音播报 (方法名, 参数...)
+COMMAND = "command"     # 脚本命令 (命令, 参数, 计时器方法的返回值)
+
+# 脚本命令 -> 计时器方法
+ACTIONS = {
+    "pause": lambda timer, argument: timer.pause_timer(),
+    "resume": lambda timer, argument: timer.resume_timer(),
+    "skip": lambda timer, argument: timer.skip_current_task(),
+    "add_time": lambda timer, minutes: timer.add_time_to_current_task(minutes),
+    "stop": lambda timer, argument: timer.stop_timer(),
+}
+
+
+class TraceEvent(NamedTuple):
+    """轨迹中的一条事件"""
+    at: float      # 虚拟时刻（从会议开始算起的秒数）
+    kind: str
+    detail: tuple
+
+
+class _TracingVoice:
+    """把播报记录到轨迹后转发给真实的 VoiceService（预渲染不记录）"""
+
+    TRACED = ("announce_meeting_start", "announce_task_completion", "speak", "discard")
+
+    def __init__(self, voice_service: VoiceService, record: Callable[[str, tuple], None]):
+        self._voice = voice_service
+        self._record = record
+
+    def __getattr__(self, name):
+        attr = getattr(self._voice, name)
+        if name not in self.TRACED:
+            return attr
+
+        def traced(*args, **kwargs):
+            self._record(VOICE, (name,) + args)
+            return attr(*args, **kwargs)
+        return traced
+
+
+class MeetingSimulation:
+    """按脚本快进运行一场会议，返回事件轨迹
+
+    脚本命令用 at() 添加，时刻相同的命令按添加顺序执行。display=False 时不产生
+    显示回调，轨迹只包含任务边界、播报和命令，长议程的轨迹更短。
+    """
+
+    def __init__(self, task_list, voice_service: Optional[VoiceService] = None, display: bool = True):
+        self.task_list = task_list
+        self.voice_service = voice_service or VoiceService(enabled=False)
+        self.display = display
+        self.script = []  # [(秒, 命令, 参数)]
+        self.timer: Optional[CountdownTimer] = None
+
+    def at(self, seconds: float, action: str, argument=None) -> "MeetingSimulation":
+        """在会议开始后 seconds 秒执行命令，返回自身以便连续添加"""
+        if action not in ACTIONS:
+            raise ValueError(f"未知的命令: {action}")
+        if action == "add_time" and argument is None:
+            raise ValueError("add_time 需要分钟数")
+        self.script.append((seconds, action, argument))
+        return self
+
+    def run(self) -> List[TraceEvent]:
+        """运行整场会议（同步，不阻塞等待），返回按时间排序的事件轨迹"""
+        clock = VirtualClock()
+        trace: List[TraceEvent] = []
+
+        def record(kind: str, detail: tuple):
+            trace.append(TraceEvent(clock.now, kind, detail))
+
+        timer = CountdownTimer(self.task_list, _TracingVoice(self.voice_service, record), clock)
+        timer.set_display_active(self.display)
+        self.timer = timer
+        for seconds, action, argument in self.script:
+            clock.call_at(seconds, self._command(timer, record, action, argument))
+
+        def on_timer_update(task_name, minutes, seconds, current_task_num):
+            record(UPDATE, (current_task_num, minutes, seconds))
+
+        timer.run_meeting(on_timer_update,
+                          lambda task_name: record(COMPLETE, (task_name,)),
+                          lambda total_seconds: record(END, (total_seconds,)))
+        return trace
+
+    @staticmethod
+    def _command(timer: CountdownTimer, record, action: str, argument):
+        def command():
+            record(COMMAND, (action, argument, ACTIONS[action](timer, argument)))
+        return command
+
+
+def format_event(event: TraceEvent) -> str:
+    """一行轨迹文本：H:MM:SS 类型 内容"""
+    seconds = int(event.at)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d} {event.kind} " \
+           + " ".join(str(item) for item in event.detail)
+
+
+def _load_agenda(path: str):
+    """与 meeting_cli 相同：.agenda 内存映射打开，其余按 CSV 读取"""
+    if path.endswith(AGENDA_EXTENSION):
+        return MappedAgenda(path)
+    tasks, errors = read_tasks(path)
+    for error in errors:
+        print(error, file=sys.stderr)
+    task_list = TaskList()
+    task_list.insert_many(0, tasks)
+    return task_list
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m meeting_simulation", description="会议快进模拟")
+    parser.add_argument("agenda_file", help="议程CSV文件或 .agenda 二进制议程")
+    parser.add_argument("--at", nargs="+", action="append", default=[], metavar="秒 命令 [分钟]",
+                        help="在会议开始后指定秒数执行命令，可重复")
+    parser.add_argument("--display", action="store_true", help="在轨迹中包含每秒的显示回调")
+    args = parser.parse_args(argv)
+
+    try:
+        task_list = _load_agenda(args.agenda_file)
+    except (OSError, AgendaFormatError, CsvFormatError) as e:
+        print(f"导入失败: {e}", file=sys.stderr)
+        return 1
+    if not task_list.get_task_count():
+        print("议程中没有任务。", file=sys.stderr)
+        return 1
+
+    simulation = MeetingSimulation(task_list, display=args.display)
+    try:
+        for entry in args.at:
+            seconds, action = float(entry[0]), entry[1] if len(entry) > 1 else ""
+            simulation.at(seconds, action, int(entry[2]) if len(entry) > 2 else None)
+    except ValueError as e:
+        print(f"脚本错误: {e}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    try:
+        trace = simulation.run()
+    except RuntimeError as e:
+        print(f"模拟失败: {e}", file=sys.stderr)
+        return 1
+    wall = time.perf_counter() - start
+    for event in trace:
+        print(format_event(event))
+    print(f"模拟 {trace[-1].at / 3600:.2f} 小时的会议，{len(trace)} 条事件，真实耗时 {wall * 1e3:.1f} ms",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""结构共享的持久化序列
+
+以按位置索引的 AVL 树实现（基于 join 的平衡树），每个节点保存一段最多 CHUNK 个
+元素的元组。每次修改只复制从根到被修改位置的路径（O(log n) 个节点）和一个元组，
+返回新的序列，旧序列保持不变并与新序列共享其余节点。因此保存一个版本只需保存
+根节点引用（O(1)），适合实现撤销/重做历史。
+"""
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# 每个节点最多保存的元素个数；分块后百万级序列只有几万个节点，构建也更快
+CHUNK = 64
+
+
+class _Node:
+    __slots__ = ("left", "chunk", "right", "height", "size")
+
+    def __init__(self, left: Optional["_Node"], chunk: tuple, right: Optional["_Node"]):
+        self.left = left
+        self.chunk = chunk
+        self.right = right
+        lh = left.height if left is not None else 0
+        rh = right.height if right is not None else 0
+        self.height = (lh if lh > rh else rh) + 1
+        self.size = (left.size if left is not None else 0) + (right.size if right is not None else 0) + len(chunk)
+
+
+def _height(node: Optional[_Node]) -> int:
+    return node.height if node is not None else 0
+
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node is not None else 0
+
+
+def _rotate_left(node: _Node) -> _Node:
+    right = node.right
+    return _Node(_Node(node.left, node.chunk, right.left), right.chunk, right.right)
+
+
+def _rotate_right(node: _Node) -> _Node:
+    left = node.left
+    return _Node(left.left, left.chunk, _Node(left.right, node.chunk, node.right))
+
+
+def _join_right(left: _Node, chunk: tuple, right: Optional[_Node]) -> _Node:
+    """left 比 right 高 2 层以上：沿 left 的右侧下降到高度相近处再接入"""
+    inner = left.right
+    if _height(inner) <= _height(right) + 1:
+        joined = _Node(inner, chunk, right)
+        if joined.height <= _height(left.left) + 1:
+            return _Node(left.left, left.chunk, joined)
+        return _rotate_left(_Node(left.left, left.chunk, _rotate_right(joined)))
+    joined = _join_right(inner, chunk, right)
+    node = _Node(left.left, left.chunk, joined)
+    if joined.height <= _height(left.left) + 1:
+        return node
+    return _rotate_left(node)
+
+
+def _join_left(left: Optional[_Node], chunk: tuple, right: _Node) -> _Node:
+    """right 比 left 高 2 层以上：与 _join_right 对称"""
+    inner = right.left
+    if _height(inner) <= _height(left) + 1:
+        joined = _Node(left, chunk, inner)
+        if joined.height <= _height(right.right) + 1:
+            return _Node(joined, right.chunk, right.right)
+        return _rotate_right(_Node(_rotate_left(joined), right.chunk, right.right))
+    joined = _join_left(left, chunk, inner)
+    node = _Node(joined, right.chunk, right.right)
+    if joined.height <= _height(right.right) + 1:
+        return node
+    return _rotate_right(node)
+
+
+def _join(left: Optional[_Node], chunk: tuple, right: Optional[_Node]) -> _Node:
+    """按顺序连接 left、chunk、right，结果保持 AVL 平衡（O(|高度差|)）"""
+    lh, rh = _height(left), _height(right)
+    if lh > rh + 1:
+        return _join_right(left, chunk, right)
+    if rh > lh + 1:
+        return _join_left(left, chunk, right)
+    return _Node(left, chunk, right)
+
+
+def _split(node: Optional[_Node], index: int) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """拆分为前 index 个元素与其余元素（O(log n)），必要时把一个块切成两半"""
+    if node is None:
+        return None, None
+    left_size = _size(node.left)
+    if index <= left_size:
+        first, rest = _split(node.left, index)
+        return first, _join(rest, node.chunk, node.right)
+    offset = index - left_size
+    if offset >= len(node.chunk):
+        first, rest = _split(node.right, offset - len(node.chunk))
+        return _join(node.left, node.chunk, first), rest
+    return (_join(node.left, node.chunk[:offset], None),
+            _join(None, node.chunk[offset:], node.right))
+
+
+def _split_last(node: _Node):
+    """取出最后一个块，返回 (其余部分, 最后一个块)"""
+    if node.right is None:
+        return node.left, node.chunk
+    rest, last = _split_last(node.right)
+    return _join(node.left, node.chunk, rest), last
+
+
+def _concat(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    rest, last = _split_last(left)
+    return _join(rest, last, right)
+
+
+def _build_chunks(chunks: List[tuple], start: int, stop: int) -> Optional[_Node]:
+    """由块列表区间构建完全平衡的树"""
+    if start >= stop:
+        return None
+    mid = (start + stop) // 2
+    return _Node(_build_chunks(chunks, start, mid), chunks[mid], _build_chunks(chunks, mid + 1, stop))
+
+
+def _build(values: List) -> Optional[_Node]:
+    """由列表构建树（O(n)）"""
+    chunks = [tuple(values[i:i + CHUNK]) for i in range(0, len(values), CHUNK)]
+    return _build_chunks(chunks, 0, len(chunks))
+
+
+def _locate(node: _Node, index: int):
+    """返回 (包含第 index 个元素的节点, 块内偏移)"""
+    while True:
+        left_size = _size(node.left)
+        if index < left_size:
+            node = node.left
+            continue
+        index -= left_size
+        if index < len(node.chunk):
+            return node, index
+        index -= len(node.chunk)
+        node = node.right
+
+
+def _replace_chunk(node: _Node, index: int, edit) -> _Node:
+    """复制到第 index 个元素所在节点的路径，用 edit(块, 偏移) 的结果替换该块"""
+    left_size = _size(node.left)
+    if index < left_size:
+        return _Node(_replace_chunk(node.left, index, edit), node.chunk, node.right)
+    offset = index - left_size
+    if offset >= len(node.chunk):
+        return _Node(node.left, node.chunk, _replace_chunk(node.right, offset - len(node.chunk), edit))
+    return _Node(node.left, edit(node.chunk, offset), node.right)
+
+
+def _iter_from(node: Optional[_Node], index: int) -> Iterator:
+    """从第 index 个元素开始按顺序遍历（定位 O(log n)，之后每个元素均摊 O(1)）"""
+    stack = []
+    offset = 0
+    while node is not None:
+        left_size = _size(node.left)
+        if index < left_size:
+            stack.append(node)
+            node = node.left
+            continue
+        index -= left_size
+        if index < len(node.chunk):
+            stack.append(node)
+            offset = index
+            break
+        index -= len(node.chunk)
+        node = node.right
+    while stack:
+        node = stack.pop()
+        chunk = node.chunk
+        if offset:
+            chunk = chunk[offset:]
+            offset = 0
+        yield from chunk
+        node = node.right
+        while node is not None:
+            stack.append(node)
+            node = node.left
+
+
+class PersistentSequence(Sequence):
+    """不可变序列：修改操作返回新的序列，与原序列共享未修改的部分
+
+    按索引读取、插入、删除、修改都是 O(log n)，插入/删除连续的 k 个元素为
+    O(k + log n)。
+    """
+    __slots__ = ("_root",)
+
+    def __init__(self, values: Iterable = ()):
+        self._root = _build(list(values))
+
+    @classmethod
+    def _wrap(cls, root: Optional[_Node]) -> "PersistentSequence":
+        sequence = cls.__new__(cls)
+        sequence._root = root
+        return sequence
+
+    @property
+    def height(self) -> int:
+        """树高，一次修改大约复制这么多个节点"""
+        return _height(self._root)
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def _index(self, index: int) -> int:
+        size = _size(self._root)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("索引超出范围")
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            values = _iter_from(self._root, start)
+            return [next(values) for _ in range(stop - start)]
+        node, offset = _locate(self._root, self._index(index))
+        return node.chunk[offset]
+
+    def __iter__(self) -> Iterator:
+        return _iter_from(self._root, 0)
+
+    # ---- 修改（均返回新序列） ----
+
+    def set(self, index: int, value) -> "PersistentSequence":
+        return self.set_many(((index, value),))
+
+    def set_many(self, updates: Iterable[Tuple[int, object]]) -> "PersistentSequence":
+        root = self._root
+        for index, value in updates:
+            root = _replace_chunk(root, self._index(index),
+                                  lambda chunk, offset: chunk[:offset] + (value,) + chunk[offset + 1:])
+        return self._wrap(root)
+
+    def insert(self, index: int, value) -> "PersistentSequence":
+        return self.insert_many(index, (value,))
+
+    def insert_many(self, index: int, values: Iterable) -> "PersistentSequence":
+        values = tuple(values)
+        if not values:
+            return self
+        size = len(self)
+        index = max(0, min(index, size))
+        if 0 < index and len(values) < CHUNK:
+            # 插入到前一个元素所在的块中，块不超过 CHUNK 时只复制一条路径
+            node, offset = _locate(self._root, index - 1)
+            if len(node.chunk) + len(values) <= CHUNK:
+                return self._wrap(_replace_chunk(self._root, index - 1,
+                                                 lambda chunk, offset: chunk[:offset + 1] + values + chunk[offset + 1:]))
+        first, rest = _split(self._root, index)
+        return self._wrap(_concat(_concat(first, _build(values)), rest))
+
+    def delete_range(self, start: int, stop: int) -> "PersistentSequence":
+        """删除 [start, stop) 区间内的元素"""
+        start, stop = max(0, start), min(stop, len(self))
+        if start >= stop:
+            return self
+        node, offset = _locate(self._root, start)
+        if offset + stop - start < len(node.chunk):
+            # 区间在一个块内部，只复制一条路径
+            count = stop - start
+            return self._wrap(_replace_chunk(self._root, start,
+                                             lambda chunk, offset: chunk[:offset] + chunk[offset + count:]))
+        first, rest = _split(self._root, start)
+        _, rest = _split(rest, stop - start)
+        return self._wrap(_concat(first, rest))
+
+    def delete_many(self, indices: List[int]) -> "PersistentSequence":
+        """删除按升序排列的多个索引；连续区间较少时按区间拆分，否则整体重建"""
+        runs = []
+        for index in indices:
+            if runs and runs[-1][1] == index:
+                runs[-1][1] = index + 1
+            else:
+                runs.append([index, index + 1])
+        size = len(self)
+        if len(runs) * 4 * self.height * CHUNK > size:
+            removed = iter(indices)
+            skip = next(removed, size)
+            kept = []
+            for position, value in enumerate(self):
+                if position == skip:
+                    skip = next(removed, size)
+                else:
+                    kept.append(value)
+            return PersistentSequence(kept)
+        sequence = self
+        for start, stop in reversed(runs):  # 从后往前删，前面的索引不受影响
+            sequence = sequence.delete_range(start, stop)
+        return sequence
+
+    def move(self, index: int, new_index: int) -> "PersistentSequence":
+        value = self[index]
+        return self.delete_range(index, index + 1).insert(new_index, value)
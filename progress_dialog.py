@@ -0,0 +1,81 @@
+import tkinter as tk
+from tkinter import ttk
+from concurrent.futures import Future
+from typing import Callable, List
+from background_job import BackgroundJob
+
+
+class ProgressDialog(tk.Toplevel):
+    """显示后台任务进度的对话框，可取消
+
+    界面线程每隔 POLL_MS 毫秒读取一次任务进度；任务结束后关闭对话框，
+    并在界面线程中调用 on_done(future)。
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, parent, title: str, job: BackgroundJob, on_done: Callable[[Future], None]):
+        super().__init__(parent)
+        self.title(title)
+        self.resizable(False, False)
+        self.job = job
+        self.on_done = on_done
+
+        # 设置对话框属性
+        self.transient(parent)
+        self.grab_set()
+        self.geometry("+%d+%d" % (parent.winfo_rootx() + 50,
+                                  parent.winfo_rooty() + 50))
+        self.protocol("WM_DELETE_WINDOW", self._cancel)
+
+        self.status_var = tk.StringVar(value="准备中...")
+        ttk.Label(self, textvariable=self.status_var, width=40).pack(padx=15, pady=(15, 5))
+        self.progressbar = ttk.Progressbar(self, length=300, mode="determinate", maximum=100)
+        self.progressbar.pack(padx=15, pady=5)
+        self.cancel_button = ttk.Button(self, text="取消", command=self._cancel)
+        self.cancel_button.pack(pady=(5, 15))
+
+        job.start()
+        self.after(self.POLL_MS, self._poll)
+
+    def _cancel(self):
+        self.job.cancel()
+        self.status_var.set("正在取消...")
+        self.cancel_button.state(["disabled"])
+
+    def _poll(self):
+        if self.job.done():
+            self.grab_release()
+            self.destroy()
+            self.on_done(self.job.future)
+            return
+        percent = self.job.fraction() * 100
+        self.progressbar["value"] = percent
+        if not self.job.cancel_event.is_set():
+            self.status_var.set(f"已完成 {percent:.0f}%")
+        self.after(self.POLL_MS, self._poll)
+
+
+class ErrorReportDialog(tk.Toplevel):
+    """一次性列出全部数据错误的报告窗口，代替逐条弹窗"""
+
+    def __init__(self, parent, title: str, summary: str, errors: List[str]):
+        super().__init__(parent)
+        self.title(title)
+        self.transient(parent)
+        self.geometry("+%d+%d" % (parent.winfo_rootx() + 80,
+                                  parent.winfo_rooty() + 80))
+
+        ttk.Label(self, text=summary).pack(anchor="w", padx=10, pady=(10, 5))
+
+        text_frame = ttk.Frame(self)
+        text_frame.pack(fill="both", expand=True, padx=10)
+        text = tk.Text(text_frame, width=70, height=15, wrap="none")
+        scrollbar = ttk.Scrollbar(text_frame, orient="vertical", command=text.yview)
+        text.configure(yscrollcommand=scrollbar.set)
+        text.insert("1.0", "\n".join(errors))
+        text.configure(state="disabled")
+        text.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        ttk.Button(self, text="关闭", command=self.destroy).pack(pady=10)
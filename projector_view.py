@@ -0,0 +1,292 @@
+"""投影仪全屏倒计时视图
+
+数字使用预渲染的七段数码管图像（tk.PhotoImage），每个字符位置是 Canvas 上的一个
+图像项，刷新时只替换发生变化的字符的图像，不需要对大号字体重新排版和光栅化。
+按 10–60 Hz 读取 CountdownTimer.progress() 显示到十分之一秒，并用两段圆弧
+显示当前任务和整场会议的进度。每帧（包括 Tk 的重绘）耗时超过 CPU 预算时自动
+降低刷新率，负载降下来后再逐步恢复。
+
+按键：Esc 关闭，F11 切换全屏。
+"""
+import logging
+import math
+import time
+import tkinter as tk
+from typing import Dict, List, Optional, Tuple
+from countdown_timer import CountdownTimer, TimerProgress
+
+BACKGROUND = "#000000"
+UNLIT = "#1c1c1c"          # 未点亮的数码管段
+TEXT_COLOUR = "#dddddd"
+PAUSED_COLOUR = "#888888"
+TASK_ARC_COLOUR = "#3fa9f5"
+MEETING_ARC_COLOUR = "#9b7bd8"
+
+# 可选的刷新率，超出 CPU 预算时依次降低
+REFRESH_RATES = (60, 30, 20, 15, 10)
+
+# 七段数码管：a 上、b 右上、c 右下、d 下、e 左下、f 左上、g 中
+_SEGMENTS = {
+    "0": "abcdef", "1": "bc", "2": "abdeg", "3": "abcdg", "4": "bcfg",
+    "5": "acdfg", "6": "acdefg", "7": "abc", "8": "abcdefg", "9": "abcdfg",
+    "-": "g",
+}
+
+
+def _countdown_colour(minutes: int, seconds: int) -> str:
+    """与主窗口倒计时相同的颜色规则"""
+    if minutes == 0 and seconds <= 30:
+        return "red"
+    if minutes < 2:
+        return "orange"
+    return "green"
+
+
+class GlyphCache:
+    """按 (字符, 颜色) 缓存的七段数码管字形图像，首次使用时渲染"""
+
+    def __init__(self, master, height: int):
+        self.master = master
+        self.height = height
+        self.digit_width = max(4, int(height * 0.55))
+        self.narrow_width = max(2, int(height * 0.25))   # 冒号与小数点
+        self.thickness = max(2, height // 9)
+        self._images: Dict[Tuple[str, str], tk.PhotoImage] = {}
+
+    def width_of(self, char: str) -> int:
+        return self.narrow_width if char in ":." else self.digit_width
+
+    def get(self, char: str, colour: str) -> tk.PhotoImage:
+        key = (char, colour)
+        image = self._images.get(key)
+        if image is None:
+            image = self._images[key] = self._render(char, colour)
+        return image
+
+    def _render(self, char: str, colour: str) -> tk.PhotoImage:
+        height, t = self.height, self.thickness
+        width = self.width_of(char)
+        image = tk.PhotoImage(master=self.master, width=width, height=height)
+        if char == ":":
+            x = (width - t) // 2
+            for y in (height // 3, 2 * height // 3):
+                image.put(colour, to=(x, y - t // 2, x + t, y - t // 2 + t))
+        elif char == ".":
+            x = (width - t) // 2
+            image.put(colour, to=(x, height - t, x + t, height))
+        else:
+            lit = _SEGMENTS.get(char, "")
+            for segment, rect in self._segment_rects().items():
+                image.put(colour if segment in lit else UNLIT, to=rect)
+        return image
+
+    def _segment_rects(self) -> Dict[str, Tuple[int, int, int, int]]:
+        t = self.thickness
+        pad = max(1, self.digit_width // 10)   # 字符之间的间距
+        gap = max(1, t // 4)                   # 相邻段之间的缝隙
+        left, right = pad, self.digit_width - pad
+        top, bottom = 0, self.height
+        middle = self.height // 2
+        return {
+            "a": (left + t + gap, top, right - t - gap, top + t),
+            "b": (right - t, top + t + gap, right, middle - gap),
+            "c": (right - t, middle + gap, right, bottom - t - gap),
+            "d": (left + t + gap, bottom - t, right - t - gap, bottom),
+            "e": (left, middle + gap, left + t, bottom - t - gap),
+            "f": (left, top + t + gap, left + t, middle - gap),
+            "g": (left + t + gap, middle - t // 2, right - t - gap, middle - t // 2 + t),
+        }
+
+
+class ProjectorView(tk.Toplevel):
+    """全屏投影倒计时窗口
+
+    hz 为期望刷新率（10–60），cpu_budget 为每帧耗时占帧间隔的比例上限。
+    """
+
+    CPU_BUDGET = 0.25
+
+    def __init__(self, master, timer: CountdownTimer, hz: int = 30, cpu_budget: float = CPU_BUDGET):
+        super().__init__(master, background=BACKGROUND)
+        self.title("会议倒计时 - 投影模式")
+        self.timer = timer
+        self.cpu_budget = cpu_budget
+        self.target_hz = min(REFRESH_RATES, key=lambda rate: abs(rate - max(10, min(60, hz))))
+        self.hz = self.target_hz
+
+        self.canvas = tk.Canvas(self, background=BACKGROUND, highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        self.attributes("-fullscreen", True)
+        self.bind("<Escape>", lambda event: self.close())
+        self.bind("<F11>", lambda event: self.attributes("-fullscreen", not self.attributes("-fullscreen")))
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        self._glyphs: Optional[GlyphCache] = None
+        self._cells: List[int] = []                     # 每个字符位置的图像项
+        self._shown: List[Optional[Tuple[str, str]]] = []  # 每个位置当前显示的 (字符, 颜色)
+        self._items: Dict[str, int] = {}
+        self._values: Dict[Tuple[str, str], object] = {}   # (项, 选项) -> 当前值
+        self._layout_size = None
+        self._digits_top = 0
+        self._centre_x = 0
+        self._after_id = None
+
+        self._frames = 0
+        self._glyph_swaps = 0
+        self._cost_total = 0.0
+        self._cost_max = 0.0
+        self._rate_changes = 0
+        self._window_start = time.perf_counter()
+        self._window_cost = 0.0
+
+        self._after_id = self.after(0, self._frame)
+
+    # ---- 布局 ----
+
+    def _on_resize(self, event):
+        if (event.width, event.height) != self._layout_size:
+            self._layout_size = (event.width, event.height)
+            self._layout(event.width, event.height)
+
+    def _layout(self, width: int, height: int):
+        """按窗口大小重新生成字形缓存并放置所有画布项"""
+        canvas = self.canvas
+        canvas.delete("all")
+        self._cells, self._shown, self._items, self._values = [], [], {}, {}
+        digit_height = int(min(height * 0.38, width * 0.9 / 3.6))
+        self._glyphs = GlyphCache(canvas, max(20, digit_height))
+        self._digits_top = int(height * 0.18)
+        self._centre_x = width // 2
+
+        self._items["task"] = canvas.create_text(width // 2, int(height * 0.09), text="", fill=TEXT_COLOUR,
+                                                 font=("Arial", max(12, height // 18), "bold"))
+        ring = int(height * 0.22)
+        ring_top = self._digits_top + self._glyphs.height + int(height * 0.06)
+        width_px = max(4, ring // 8)
+        caption_font = ("Arial", max(10, height // 40))
+        for key, colour, centre_x in (("task_arc", TASK_ARC_COLOUR, width // 3),
+                                      ("meeting_arc", MEETING_ARC_COLOUR, 2 * width // 3)):
+            box = (centre_x - ring // 2, ring_top, centre_x + ring // 2, ring_top + ring)
+            canvas.create_oval(*box, outline=UNLIT, width=width_px)
+            self._items[key] = canvas.create_arc(*box, start=90, extent=0, style="arc",
+                                                 outline=colour, width=width_px)
+            self._items[key + "_caption"] = canvas.create_text(
+                centre_x, ring_top + ring // 2, text="", fill=TEXT_COLOUR, font=caption_font, justify="center")
+
+    def _layout_digits(self, text: str):
+        """字符数变化（例如分钟从两位变为三位）时重新放置字符位置"""
+        canvas, glyphs = self.canvas, self._glyphs
+        for item in self._cells:
+            canvas.delete(item)
+        total = sum(glyphs.width_of(char) for char in text)
+        x = self._centre_x - total // 2
+        self._cells, self._shown = [], []
+        for char in text:
+            self._cells.append(canvas.create_image(x, self._digits_top, anchor="nw"))
+            self._shown.append(None)
+            x += glyphs.width_of(char)
+
+    # ---- 绘制 ----
+
+    def _set(self, key: str, **options):
+        """只在值变化时配置画布项"""
+        changed = {}
+        for option, value in options.items():
+            if self._values.get((key, option)) != value:
+                self._values[(key, option)] = value
+                changed[option] = value
+        if changed:
+            self.canvas.itemconfigure(self._items[key], **changed)
+
+    def _draw(self, progress: TimerProgress):
+        # 向上取整到十分之一秒，与主窗口按整秒向上取整的显示一致
+        tenths = math.ceil(progress.remaining * 10 - 1e-6) if progress.running else 0
+        minutes, seconds, tenth = tenths // 600, tenths // 10 % 60, tenths % 10
+        text = f"{minutes:02d}:{seconds:02d}.{tenth}"
+        if not progress.running or progress.paused:
+            colour = PAUSED_COLOUR
+        else:
+            colour = _countdown_colour(minutes, seconds)
+
+        if len(text) != len(self._cells):
+            self._layout_digits(text)
+        for index, char in enumerate(text):
+            key = (char, colour)
+            if self._shown[index] != key:
+                self._shown[index] = key
+                self.canvas.itemconfigure(self._cells[index], image=self._glyphs.get(char, colour))
+                self._glyph_swaps += 1
+
+        if progress.running:
+            name = f"{progress.task_name}  ({progress.task_number}/{progress.task_count})"
+            if progress.paused:
+                name += "  已暂停"
+        else:
+            name = "未开始"
+        self._set("task", text=name)
+
+        # 圆弧按整度数更新，一圈最多重绘 360 次（Tk 把 360 度当作 0 度，最多画 359 度）
+        task_done = meeting_done = 0.0
+        if progress.running and progress.task_duration:
+            task_done = min(1.0, max(0.0, 1 - progress.remaining / progress.task_duration))
+            meeting_total = progress.meeting_elapsed + progress.meeting_remaining
+            meeting_done = min(1.0, progress.meeting_elapsed / meeting_total)
+        self._set("task_arc", extent=-min(359, round(360 * task_done)))
+        self._set("meeting_arc", extent=-min(359, round(360 * meeting_done)))
+        self._set("task_arc_caption", text=f"本任务\n{task_done * 100:.0f}%")
+        left = math.ceil(progress.meeting_remaining) if progress.running else 0
+        self._set("meeting_arc_caption",
+                  text=f"全场剩余\n{left // 3600:d}:{left // 60 % 60:02d}:{left % 60:02d}")
+
+    def _frame(self):
+        start = time.perf_counter()
+        if self._glyphs is not None:
+            self._draw(self.timer.progress())
+            self.canvas.update_idletasks()  # 把 Tk 的重绘也计入本帧耗时
+        cost = time.perf_counter() - start
+        self._frames += 1
+        self._cost_total += cost
+        self._cost_max = max(self._cost_max, cost)
+        self._window_cost += cost
+        self._adapt_rate(start + cost)
+        delay = max(1, round(1000 / self.hz - cost * 1000))
+        self._after_id = self.after(delay, self._frame)
+
+    def _adapt_rate(self, now: float):
+        """每秒检查一次渲染负载，超出预算时降低刷新率，负载很低时逐步恢复"""
+        elapsed = now - self._window_start
+        if elapsed < 1.0:
+            return
+        load = self._window_cost / elapsed
+        self._window_start, self._window_cost = now, 0.0
+        index = REFRESH_RATES.index(self.hz)
+        if load > self.cpu_budget and index + 1 < len(REFRESH_RATES):
+            self.hz = REFRESH_RATES[index + 1]
+        elif load < self.cpu_budget / 3 and self.hz < self.target_hz:
+            self.hz = REFRESH_RATES[index - 1]
+        else:
+            return
+        self._rate_changes += 1
+        logging.info("投影模式渲染负载 %.0f%%，刷新率调整为 %d Hz", load * 100, self.hz)
+
+    def get_stats(self) -> dict:
+        """渲染统计：耗时为秒"""
+        frames = self._frames
+        return {
+            "frames": frames,
+            "glyph_swaps": self._glyph_swaps,
+            "hz": self.hz,
+            "rate_changes": self._rate_changes,
+            "avg": self._cost_total / frames if frames else 0.0,
+            "max": self._cost_max,
+        }
+
+    def close(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        stats = self.get_stats()
+        logging.info("投影模式: %d 帧，替换字形 %d 次，每帧平均 %.0f µs、最长 %.0f µs，最终刷新率 %d Hz",
+                     stats["frames"], stats["glyph_swaps"], stats["avg"] * 1e6, stats["max"] * 1e6, stats["hz"])
+        self.destroy()
@@ -0,0 +1,180 @@
+"""界面线程中的合并渲染循环
+
+后台线程只把最新状态写入 LatestSlot（替换一个元组，无锁，新值覆盖旧值）。
+槽从“已读”变为“有新值”时通知 RenderLoop 调度一次渲染，之后到被读取之前的发布
+不再调度，因此界面线程只在有新状态时醒来，且同一时刻最多排队一个渲染回调：
+Tk 卡顿时不会像逐次 after(0, ...) 那样积压回调、恢复后集中重放，没有新状态时也不轮询。
+两帧之间至少间隔 frame_ms，其间发布的多个状态只渲染最后一个。
+渲染函数把状态转换为 {控件: {选项: 值}}，RenderLoop 与上一次实际设置的值比较，
+只对发生变化的选项调用 configure。
+"""
+import logging
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+
+class LatestSlot:
+    """单写者的最新值槽：写入方发布，读取方随时取最新值，中间值被覆盖
+
+    listener 在槽从已读变为有新值时（于发布线程中）被调用一次，直到 take() 读取后才会再次调用。
+    """
+    __slots__ = ("_item", "_fresh", "listener")
+
+    def __init__(self, listener: Optional[Callable[[], None]] = None):
+        # (序号, 状态) 作为一个元组整体替换，读取方总能看到一致的一对
+        self._item: Tuple[int, object] = (0, None)
+        self._fresh = False
+        self.listener = listener
+
+    def publish(self, state):
+        # 先写入新值再检查标志：读取方清除标志后读到的总是不旧于本次发布的值
+        self._item = (self._item[0] + 1, state)
+        if not self._fresh:
+            self._fresh = True
+            listener = self.listener
+            if listener is not None:
+                listener()
+
+    def latest(self) -> Tuple[int, object]:
+        """返回 (序号, 状态)，序号每次发布加 1；不改变已读状态"""
+        return self._item
+
+    def take(self) -> Tuple[int, object]:
+        """读取最新值并标记为已读，之后的发布会再次通知 listener"""
+        self._fresh = False
+        return self._item
+
+
+class RenderLoop:
+    """有新状态时读取 LatestSlot 并增量更新控件
+
+    render(state) 返回 {控件: {选项: 值}}；只有与上次设置的值不同的选项才会被 configure。
+    每帧的渲染耗时、被合并丢弃的过期状态数和省掉的 configure 次数可通过 get_stats() 获取。
+    """
+
+    FRAME_MS = 50
+
+    def __init__(self, widget, slot: LatestSlot, render: Callable[[object], Dict[object, dict]],
+                 frame_ms: int = FRAME_MS):
+        self.widget = widget  # 用于 after 调度
+        self.slot = slot
+        self.render = render
+        self.frame_ms = frame_ms
+        self._shown: Dict[Tuple[object, str], object] = {}  # (控件, 选项) -> 当前显示的值
+        self._seen = 0
+        self._after_id: Optional[str] = None
+        self._active = False
+        self._paused = False
+        self._last_tick = 0.0
+        self.wakeups = 0  # 累计醒来次数，不随 start() 清零
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._ticks = 0
+        self._frames = 0
+        self._dropped = 0
+        self._configures = 0
+        self._unchanged = 0
+        self._over_budget = 0
+        self._cost_total = 0.0
+        self._cost_max = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._active
+
+    def start(self):
+        """开始渲染；在发布者开始发布之前调用，之前留在槽中的旧状态不会被渲染"""
+        if not self._active:
+            self._seen = self.slot.take()[0]
+            self._reset_stats()
+            self._paused = False
+            self._active = True
+            self.slot.listener = self._on_publish
+
+    def _on_publish(self):
+        """发布线程中调用：调度一次渲染，与上一帧的间隔不小于 frame_ms"""
+        if self._active and not self._paused:
+            wait = self.frame_ms - (time.perf_counter() - self._last_tick) * 1000
+            if wait > 0:
+                self._after_id = self.widget.after(int(wait) + 1, self._tick)
+            else:
+                self._after_id = self.widget.after_idle(self._tick)
+
+    def _cancel(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def pause(self):
+        """暂停渲染（窗口不可见时），期间的发布不唤醒界面线程"""
+        if self._active and not self._paused:
+            self._paused = True
+            self._cancel()
+
+    def resume(self):
+        """恢复渲染，并立即渲染槽中的最新状态"""
+        if self._paused:
+            self._paused = False
+            self._tick()
+
+    def stop(self):
+        """停止渲染并记录统计；之后控件可能被直接修改，缓存的显示值随之作废"""
+        if self._active:
+            self._active = False
+            self._paused = False
+            self.slot.listener = None
+            self._cancel()
+            stats = self.get_stats()
+            logging.info("渲染循环: %d 帧（醒来 %d 次），丢弃过期状态 %d 个，configure %d 次、省略 %d 次，"
+                         "每帧平均 %.0f µs、最长 %.0f µs，超出帧预算 %d 帧",
+                         stats["frames"], stats["ticks"], stats["dropped"], stats["configures"],
+                         stats["unchanged"], stats["avg"] * 1e6, stats["max"] * 1e6, stats["over_budget"])
+        self._shown.clear()
+
+    def _tick(self):
+        self._after_id = None
+        if not self._active or self._paused:
+            return  # 停止或暂停之前已经排队的回调
+        self._ticks += 1
+        self.wakeups += 1
+        self._last_tick = time.perf_counter()
+        seq, state = self.slot.take()
+        if seq != self._seen:
+            self._dropped += seq - self._seen - 1  # 两帧之间被覆盖、不再渲染的状态
+            self._seen = seq
+            start = time.perf_counter()
+            self._apply(self.render(state))
+            cost = time.perf_counter() - start
+            self._frames += 1
+            self._cost_total += cost
+            self._cost_max = max(self._cost_max, cost)
+            if cost * 1000 > self.frame_ms:
+                self._over_budget += 1
+
+    def _apply(self, frame: Dict[object, dict]):
+        shown = self._shown
+        for widget, options in frame.items():
+            changed = {}
+            for option, value in options.items():
+                if shown.get((widget, option)) != value:
+                    shown[(widget, option)] = value
+                    changed[option] = value
+            self._unchanged += len(options) - len(changed)
+            if changed:
+                widget.configure(**changed)
+                self._configures += 1
+
+    def get_stats(self) -> dict:
+        """渲染统计：耗时为秒"""
+        frames = self._frames
+        return {
+            "ticks": self._ticks,
+            "frames": frames,
+            "dropped": self._dropped,
+            "configures": self._configures,
+            "unchanged": self._unchanged,
+            "over_budget": self._over_budget,
+            "avg": self._cost_total / frames if frames else 0.0,
+            "max": self._cost_max,
+        }
@@ -0,0 +1,289 @@
+import sqlite3
+import threading
+from array import array
+from collections.abc import Sequence
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Tuple
+from task import Task
+from task_list import INSERTED, MOVED, REMOVED, RESET, UPDATED, ChangeNotifier, _kept_runs, _valid_indices
+
+# 排序键的初始间隔；在两个相邻任务之间插入时取中点，间隔用尽时整体重排
+POSITION_GAP = 1 << 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id       INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name     TEXT    NOT NULL,
+    minutes  INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_position ON tasks(position);
+CREATE INDEX IF NOT EXISTS idx_tasks_name ON tasks(name);
+CREATE INDEX IF NOT EXISTS idx_tasks_minutes ON tasks(minutes);
+"""
+
+
+class SqliteTaskListView(Sequence):
+    """SqliteTaskList 的只读视图，访问时才查询数据库"""
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: "SqliteTaskList"):
+        self._owner = owner
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._owner._fetch_range(*index.indices(len(self)))
+        return self._owner[index]
+
+    def __len__(self) -> int:
+        return len(self._owner)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._owner)
+
+
+class SqliteTaskList(ChangeNotifier):
+    """以 SQLite 数据库存储的 TaskList，接口与 TaskList 相同
+
+    任务顺序由 position 列决定，数据库开启 WAL 模式，每次修改在事务中提交，
+    进程崩溃后重新打开即可恢复。内存中只保存按顺序排列的行 id（每个任务 8 字节）
+    和总时长，按索引读取任务是一次主键查询。批量操作在同一个事务中完成，
+    也可以用 batch() 把多次修改合并为一个事务。
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        super().__init__()
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._depth = 0
+        self._load()
+
+    def _load(self):
+        """从数据库读取任务顺序与总时长"""
+        self._ids = array('q', (row[0] for row in
+                                self._conn.execute("SELECT id FROM tasks ORDER BY position")))
+        self._total_minutes = self._conn.execute("SELECT COALESCE(SUM(minutes), 0) FROM tasks").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def batch(self):
+        """把多次修改合并到一个事务中，嵌套调用只在最外层提交"""
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                    self._load()  # 回滚后内存中的顺序与总时长需要重新读取
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("COMMIT")
+
+    # ---- 排序键 ----
+
+    def _position(self, index: int) -> int:
+        return self._conn.execute("SELECT position FROM tasks WHERE id = ?", (self._ids[index],)).fetchone()[0]
+
+    def _positions_between(self, index: int, count: int) -> List[int]:
+        """为插入到 index 处的 count 个任务分配排序键，必要时先整体重排"""
+        before = self._position(index - 1) if index > 0 else None
+        after = self._position(index) if index < len(self._ids) else None
+        if after is None:
+            start = POSITION_GAP if before is None else before + POSITION_GAP
+            return [start + i * POSITION_GAP for i in range(count)]
+        if before is None:
+            before = after - (count + 1) * POSITION_GAP
+        step = (after - before) // (count + 1)
+        if step == 0:
+            self._renumber()
+            return self._positions_between(index, count)
+        return [before + (i + 1) * step for i in range(count)]
+
+    def _renumber(self):
+        """按当前顺序重新分配等间隔的排序键"""
+        # 先整体平移到新旧排序键都不会用到的负数区间（低于原最小值且小于 0），
+        # 平移不改变相对顺序，更新过程中唯一索引不会冲突；
+        # 头部插入会产生负的排序键（可能全部为负），不能简单取相反数
+        low, high = self._conn.execute("SELECT MIN(position), MAX(position) FROM tasks").fetchone()
+        if low is None:
+            return
+        self._conn.execute("UPDATE tasks SET position = position - ?", (high - low + 1 + max(high, 0),))
+        self._conn.executemany("UPDATE tasks SET position = ? WHERE id = ?",
+                               ((i * POSITION_GAP, task_id) for i, task_id in enumerate(self._ids, 1)))
+
+    # ---- 修改 ----
+
+    def add(self, task: Task):
+        self.insert(len(self._ids), task)
+
+    def insert(self, index: int, task: Task):
+        """在指定位置插入任务"""
+        self.insert_many(index, [task])
+
+    def insert_many(self, index: int, tasks: Iterable[Task]):
+        """在指定位置一次插入多个任务（一个事务），只发出一次通知"""
+        tasks = list(tasks)
+        if not tasks:
+            return
+        with self.batch():
+            index = max(0, min(index, len(self._ids)))
+            positions = self._positions_between(index, len(tasks))
+            first = self._conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM tasks").fetchone()[0]
+            new_ids = array('q', range(first, first + len(tasks)))
+            self._conn.executemany("INSERT INTO tasks (id, position, name, minutes) VALUES (?, ?, ?, ?)",
+                                   ((task_id, position, task.name, task.minutes)
+                                    for task_id, position, task in zip(new_ids, positions, tasks)))
+            self._ids[index:index] = new_ids
+            self._total_minutes += sum(task.minutes for task in tasks)
+        self._notify(INSERTED, index, len(tasks))
+
+    def move(self, index: int, new_index: int):
+        """把任务从 index 移动到 new_index（只更新一行的排序键）"""
+        size = len(self._ids)
+        if 0 <= index < size and 0 <= new_index < size and index != new_index:
+            with self.batch():
+                task_id = self._ids.pop(index)
+                position = self._positions_between(new_index, 1)[0]
+                self._conn.execute("UPDATE tasks SET position = ? WHERE id = ?", (position, task_id))
+                self._ids.insert(new_index, task_id)
+            self._notify(MOVED, index, 1, new_index)
+
+    def delete(self, index: int):
+        """删除指定索引的任务"""
+        if 0 <= index < len(self._ids):
+            self._remove([index])
+            self._notify(REMOVED, index)
+
+    def delete_many(self, indices: Iterable[int]):
+        """一次删除多个任务（一个事务），只发出一次通知"""
+        indices = _valid_indices(indices, len(self._ids))
+        if indices:
+            self._remove(indices)
+            self._notify(REMOVED, indices[0], len(indices), indices=tuple(indices))
+
+    def _remove(self, indices: List[int]):
+        """在一个事务中删除升序排列的索引对应的任务"""
+        with self.batch():
+            removed = [self._ids[i] for i in indices]
+            conn = self._conn
+            for start in range(0, len(removed), 500):
+                chunk = removed[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                self._total_minutes -= conn.execute(
+                    f"SELECT COALESCE(SUM(minutes), 0) FROM tasks WHERE id IN ({marks})", chunk).fetchone()[0]
+                conn.execute(f"DELETE FROM tasks WHERE id IN ({marks})", chunk)
+            ids = array('q')
+            for start, end in _kept_runs(indices, len(self._ids)):
+                ids += self._ids[start:end]
+            self._ids = ids
+
+    def clear(self):
+        """清空所有任务"""
+        with self.batch():
+            self._conn.execute("DELETE FROM tasks")
+            self._ids = array('q')
+            self._total_minutes = 0
+        self._notify(RESET)
+
+    def update(self, index: int, updated_task: Task):
+        """更新指定索引的任务"""
+        if 0 <= index < len(self._ids):
+            self._replace({index: updated_task})
+            self._notify(UPDATED, index)
+
+    def update_many(self, updates: Iterable[Tuple[int, Task]]):
+        """一次修改多个任务（一个事务），只发出一次通知"""
+        size = len(self._ids)
+        changed = {}
+        for index, task in updates:
+            if 0 <= index < size:
+                changed[index] = task
+        if changed:
+            self._replace(changed)
+            indices = tuple(sorted(changed))
+            self._notify(UPDATED, indices[0], len(indices), indices=indices)
+
+    def _replace(self, changed: Dict[int, Task]):
+        """在一个事务中替换指定索引的任务"""
+        with self.batch():
+            for index, task in changed.items():
+                task_id = self._ids[index]
+                old = self._conn.execute("SELECT minutes FROM tasks WHERE id = ?", (task_id,)).fetchone()[0]
+                self._conn.execute("UPDATE tasks SET name = ?, minutes = ? WHERE id = ?",
+                                   (task.name, task.minutes, task_id))
+                self._total_minutes += task.minutes - old
+
+    # ---- 读取 ----
+
+    def get_all(self) -> List[Task]:
+        return [Task(name, minutes) for name, minutes in
+                self._conn.execute("SELECT name, minutes FROM tasks ORDER BY position")]
+
+    def view(self) -> SqliteTaskListView:
+        """返回只读视图（不复制），随列表变化而变化"""
+        return SqliteTaskListView(self)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self.get_all())
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index: int) -> Task:
+        task_id = self._ids[index]
+        name, minutes = self._conn.execute("SELECT name, minutes FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return Task(name, minutes)
+
+    def _fetch_range(self, start: int, stop: int, step: int = 1) -> List[Task]:
+        """按索引区间读取任务（连续区间用一次范围查询）"""
+        if step != 1 or start >= stop:
+            return [self[i] for i in range(start, stop, step)]
+        low = self._position(start)
+        return [Task(name, minutes) for name, minutes in self._conn.execute(
+            "SELECT name, minutes FROM tasks WHERE position >= ? ORDER BY position LIMIT ?",
+            (low, stop - start))]
+
+    def get_total_time(self) -> int:
+        """获取总时长（O(1)）"""
+        return self._total_minutes
+
+    def get_task_count(self) -> int:
+        """获取任务数量（O(1)）"""
+        return len(self._ids)
+
+    def find_by_name(self, prefix: str) -> List[Task]:
+        """按名称前缀查找任务（名称索引上的范围查询）"""
+        return [Task(name, minutes) for name, minutes in self._conn.execute(
+            "SELECT name, minutes FROM tasks WHERE name >= ? AND name < ? ORDER BY position",
+            (prefix, prefix + "\U0010ffff"))]
+
+    def find_by_minutes(self, low: int, high: int) -> List[Task]:
+        """查找时长在 [low, high] 之间的任务（使用时长索引）"""
+        return [Task(name, minutes) for name, minutes in self._conn.execute(
+            "SELECT name, minutes FROM tasks WHERE minutes BETWEEN ? AND ? ORDER BY position", (low, high))]
+
+    def export_to_list(self) -> List[dict]:
+        """导出为字典列表（用于CSV导出）"""
+        return [{"name": task.name, "minutes": task.minutes} for task in self.get_all()]
+
+    def import_from_list(self, data: List[dict]):
+        """从字典列表导入（一个事务）"""
+        with self.batch():
+            self._conn.execute("DELETE FROM tasks")
+            self._conn.executemany("INSERT INTO tasks (id, position, name, minutes) VALUES (?, ?, ?, ?)",
+                                   ((i, i * POSITION_GAP, item["name"], item["minutes"])
+                                    for i, item in enumerate(data, 1)))
+            self._load()
+        self._notify(RESET)
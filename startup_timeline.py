@@ -0,0 +1,38 @@
+import logging
+import threading
+import time
+from typing import List, Tuple
+
+
+class StartupTimeline:
+    """记录启动过程中各阶段的耗时，用于分析窗口出现前时间花在哪里"""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._last = self._start
+        self._lock = threading.Lock()
+        self.entries: List[Tuple[str, float, float]] = []  # (阶段, 阶段耗时, 距启动时刻)
+
+    def mark(self, label: str):
+        """标记一个阶段结束，耗时从上一个标记算起"""
+        with self._lock:
+            now = time.perf_counter()
+            self.entries.append((label, now - self._last, now - self._start))
+            self._last = now
+
+    def record(self, label: str, duration: float):
+        """记录一个在其他线程中完成、已知耗时的步骤（不影响主线程的阶段划分）"""
+        with self._lock:
+            self.entries.append((label, duration, time.perf_counter() - self._start))
+
+    def report(self) -> str:
+        """生成按时间排序的启动时间线"""
+        with self._lock:
+            entries = sorted(self.entries, key=lambda entry: entry[2])
+        lines = [f"{'阶段':<24}{'耗时(ms)':>10}{'累计(ms)':>10}"]
+        for label, duration, at in entries:
+            lines.append(f"{label:<24}{duration * 1e3:>10.1f}{at * 1e3:>10.1f}")
+        return "\n".join(lines)
+
+    def log(self):
+        logging.info("启动时间线:\n%s", self.report())
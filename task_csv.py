@@ -0,0 +1,160 @@
+import csv
+import gzip
+import os
+import threading
+from operator import attrgetter
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+from task import Task
+
+# CSV 表头（与 main.py 导入/导出使用的格式一致）
+NAME_COLUMN = '任务名称'
+MINUTES_COLUMN = '时长(分钟)'
+NOTES_COLUMN = '笔记'
+REQUIRED_COLUMNS = [NAME_COLUMN, MINUTES_COLUMN]
+
+# 错误报告中最多保留的条目数，其余只计数
+MAX_REPORTED_ERRORS = 1000
+
+
+class CsvFormatError(ValueError):
+    """CSV 文件缺少必要的列"""
+
+
+class ImportResult(NamedTuple):
+    """一次 CSV 导入的结果"""
+    tasks: list
+    errors: List[str]       # 错误信息（最多 max_errors 条）
+    error_count: int        # 无效行总数
+    rows: int               # 已读取的数据行数
+    cancelled: bool = False
+
+
+class ExportResult(NamedTuple):
+    """一次 CSV 导出的结果"""
+    path: str
+    rows: int               # 已写入的数据行数
+    cancelled: bool = False
+
+
+def stream_tasks(file_path: str, task_factory: Callable[..., object] = Task,
+                 extra_columns: Sequence[str] = (), chunk_size: int = 10000,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 cancel_event: Optional[threading.Event] = None,
+                 max_errors: Optional[int] = MAX_REPORTED_ERRORS) -> ImportResult:
+    """流式解析CSV文件中的任务，适合在后台线程中运行
+
+    每处理 chunk_size 行调用一次 progress(已读字节数, 文件总字节数)，
+    并检查 cancel_event，被取消时返回 cancelled=True 的结果。
+    任务由 task_factory(名称, 时长, *额外列) 构造，额外列缺失时为空字符串。
+    无效行不弹窗，错误信息汇总在结果中；max_errors 为 None 时保留全部错误。
+    """
+    total_bytes = os.path.getsize(file_path)
+    tasks = []
+    errors = []
+    error_count = 0
+    rows = 0
+    with open(file_path, mode='r', encoding='utf-8-sig', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if not header or not all(col in header for col in REQUIRED_COLUMNS):
+            raise CsvFormatError(f"CSV文件缺少必要的列！需要: {', '.join(REQUIRED_COLUMNS)}")
+        name_at = header.index(NAME_COLUMN)
+        minutes_at = header.index(MINUTES_COLUMN)
+        extra_at = [header.index(col) if col in header else None for col in extra_columns]
+        needed = max(name_at, minutes_at) + 1
+        append = tasks.append
+        next_check = chunk_size
+
+        for line_number, row in enumerate(reader, 2):  # 从第二行开始计算（跳过表头）
+            rows += 1
+            if rows == next_check:
+                next_check += chunk_size
+                if cancel_event is not None and cancel_event.is_set():
+                    return ImportResult(tasks, errors, error_count, rows, cancelled=True)
+                if progress is not None:
+                    progress(file.buffer.tell(), total_bytes)
+            if not row:
+                continue  # 空行，与 DictReader 的行为一致
+            if len(row) < needed:
+                row = row + [''] * (needed - len(row))
+            task_name = row[name_at].strip()
+            duration_str = row[minutes_at].strip()
+            if not task_name:
+                message = f"第 {line_number} 行：任务名称为空，已跳过。"
+            else:
+                try:
+                    duration = int(duration_str)
+                    if duration <= 0:
+                        raise ValueError
+                except ValueError:
+                    message = f"第 {line_number} 行：时长 '{duration_str}' 不是有效的正整数，已跳过。"
+                else:
+                    if extra_at:
+                        extras = [row[i].strip() if i is not None and i < len(row) else '' for i in extra_at]
+                        append(task_factory(task_name, duration, *extras))
+                    else:
+                        append(task_factory(task_name, duration))
+                    continue
+            error_count += 1
+            if max_errors is None or len(errors) < max_errors:
+                errors.append(message)
+
+    if progress is not None:
+        progress(total_bytes, total_bytes)
+    return ImportResult(tasks, errors, error_count, rows)
+
+
+def read_tasks(file_path: str) -> Tuple[List[Task], List[str]]:
+    """从CSV文件读取任务
+
+    Returns:
+        (有效任务列表, 错误信息列表)；无效行被跳过并记录到错误信息中，
+        不弹窗，由调用方决定如何汇总展示
+    """
+    result = stream_tasks(file_path, max_errors=None)
+    return result.tasks, result.errors
+
+
+def write_tasks(file_path: str, tasks: Sequence, columns: Sequence[str] = REQUIRED_COLUMNS,
+                row: Callable[[object], tuple] = attrgetter("name", "minutes"),
+                compress: Optional[bool] = None, chunk_size: int = 10000,
+                progress: Optional[Callable[[int, int], None]] = None,
+                cancel_event: Optional[threading.Event] = None) -> ExportResult:
+    """把任务写入CSV文件，适合在后台线程中运行
+
+    按 chunk_size 行一批调用 writerows，每批之后报告 progress(已写行数, 总行数)
+    并检查 cancel_event。先写入同目录下的临时文件，全部完成后再原子替换目标文件，
+    中途失败或取消时目标文件保持不变。compress 为 None 时按 .gz 扩展名决定是否 gzip 压缩。
+    """
+    if compress is None:
+        compress = file_path.endswith(".gz")
+    temp_path = file_path + ".tmp"
+    total = len(tasks)
+    written = 0
+    if compress:
+        file = gzip.open(temp_path, mode='wt', encoding='utf-8-sig', newline='', compresslevel=6)
+    else:
+        file = open(temp_path, mode='w', encoding='utf-8-sig', newline='')
+    try:
+        with file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            for start in range(0, total, chunk_size):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                end = min(start + chunk_size, total)
+                writer.writerows(map(row, tasks[start:end]))
+                written = end
+                if progress is not None:
+                    progress(written, total)
+        if written < total:
+            os.remove(temp_path)
+            return ExportResult(file_path, written, cancelled=True)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return ExportResult(file_path, written)
@@ -0,0 +1,381 @@
+"""任务列表的追加式自动保存日志
+
+每次 TaskList 修改都编码为一条紧凑的二进制记录追加到日志中，后台线程按
+COMMIT_INTERVAL 把一段时间内的记录合并为一次 write + fsync（组提交），
+编辑本身只做编码和内存追加。日志累计 snapshot_every 条记录后生成压缩快照
+（binary_agenda 格式），并切换到新一代日志，启动时只需加载最新快照并重放
+之后的日志，恢复时间有上限。
+
+每个程序使用 ~/.meeting_timer/journal/<程序名> 下自己的日志目录，打开时独占目录中的
+锁文件：同一目录同时只能被一个实例写入，否则记录会交错、旧一代文件会被对方清理。
+
+文件（均在日志目录中）：
+    lock                   独占锁，进程退出（包括崩溃）时由操作系统释放
+    snapshot-<代>.agenda   第 <代> 代开始时的完整任务列表
+    journal-<代>.log       第 <代> 代的修改记录
+快照写完之前旧一代的日志不会被删除，任意时刻崩溃都能恢复到最后一次提交的状态。
+
+记录格式：uint32 负载长度 + uint32 CRC32 + 负载（首字节为操作码），小端序；
+末尾不完整或校验失败的记录在恢复时被丢弃。
+"""
+import logging
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from typing import List, Optional, Tuple
+from binary_agenda import AgendaFormatError, MappedAgenda, write_agenda
+from task import Task
+from task_list import INSERTED, MOVED, REMOVED, RESET, UPDATED, TaskListChange
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+JOURNAL_ROOT = os.path.join(os.path.expanduser("~"), ".meeting_timer", "journal")
+
+JOURNAL_MAGIC = b"MTJRNL01"
+_FILE_HEADER = struct.Struct("<8sQ")     # 魔数、代号
+_RECORD_HEADER = struct.Struct("<II")    # 负载长度、CRC32
+_U32 = struct.Struct("<I")
+_PAIR = struct.Struct("<II")
+_TRIPLE = struct.Struct("<III")
+
+# 操作码
+OP_INSERT = 1          # index, count, count × (minutes, 名称长度, 名称)
+OP_REMOVE_RANGE = 2    # index, count
+OP_REMOVE_INDICES = 3  # n, n × index
+OP_UPDATE = 4          # n, n × (index, minutes, 名称长度, 名称)
+OP_MOVE = 5            # index, new_index
+OP_CLEAR = 6
+
+LOCK_FILE = "lock"
+
+_FILE_PATTERN = re.compile(r"^(journal|snapshot)-(\d+)\.(log|agenda)$")
+
+
+class JournalLockedError(OSError):
+    """日志目录已被另一个实例占用"""
+
+
+def journal_dir(app: str) -> str:
+    """程序 app 的日志目录"""
+    return os.path.join(JOURNAL_ROOT, app)
+
+
+def _lock(file):
+    """对打开的锁文件加非阻塞的独占锁，已被占用时抛出 OSError"""
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+
+
+def _encode_tasks(parts: List[bytes], tasks):
+    for task in tasks:
+        name = task.name.encode("utf-8")
+        parts.append(_PAIR.pack(task.minutes, len(name)))
+        parts.append(name)
+
+
+def encode_change(change: TaskListChange, task_list) -> bytes:
+    """把一次变更编码为日志负载（变更通知是同步的，任务内容直接从列表读取）"""
+    if change.kind == INSERTED:
+        parts = [bytes((OP_INSERT,)), _PAIR.pack(change.index, change.count)]
+        _encode_tasks(parts, (task_list[i] for i in range(change.index, change.index + change.count)))
+    elif change.kind == REMOVED and change.indices:
+        parts = [bytes((OP_REMOVE_INDICES,)), _U32.pack(len(change.indices)),
+                 struct.pack(f"<{len(change.indices)}I", *change.indices)]
+    elif change.kind == REMOVED:
+        parts = [bytes((OP_REMOVE_RANGE,)), _PAIR.pack(change.index, change.count)]
+    elif change.kind == UPDATED:
+        indices = change.indices or range(change.index, change.index + change.count)
+        parts = [bytes((OP_UPDATE,)), _U32.pack(len(indices))]
+        for index in indices:
+            task = task_list[index]
+            name = task.name.encode("utf-8")
+            parts.append(_TRIPLE.pack(index, task.minutes, len(name)))
+            parts.append(name)
+    elif change.kind == MOVED:
+        parts = [bytes((OP_MOVE,)), _PAIR.pack(change.index, change.new_index)]
+    else:
+        parts = [bytes((OP_CLEAR,))]
+    return b"".join(parts)
+
+
+def _decode_name(payload: bytes, pos: int, length: int) -> Tuple[str, int]:
+    return payload[pos:pos + length].decode("utf-8"), pos + length
+
+
+def apply_record(payload: bytes, task_list):
+    """把一条日志负载重放到任务列表上"""
+    op = payload[0]
+    if op == OP_INSERT:
+        index, count = _PAIR.unpack_from(payload, 1)
+        pos = 1 + _PAIR.size
+        tasks = []
+        for _ in range(count):
+            minutes, length = _PAIR.unpack_from(payload, pos)
+            name, pos = _decode_name(payload, pos + _PAIR.size, length)
+            tasks.append(Task(name, minutes))
+        task_list.insert_many(index, tasks)
+    elif op == OP_REMOVE_RANGE:
+        index, count = _PAIR.unpack_from(payload, 1)
+        task_list.delete_many(range(index, index + count))
+    elif op == OP_REMOVE_INDICES:
+        (count,) = _U32.unpack_from(payload, 1)
+        task_list.delete_many(struct.unpack_from(f"<{count}I", payload, 1 + _U32.size))
+    elif op == OP_UPDATE:
+        (count,) = _U32.unpack_from(payload, 1)
+        pos = 1 + _U32.size
+        updates = []
+        for _ in range(count):
+            index, minutes, length = _TRIPLE.unpack_from(payload, pos)
+            name, pos = _decode_name(payload, pos + _TRIPLE.size, length)
+            updates.append((index, Task(name, minutes)))
+        task_list.update_many(updates)
+    elif op == OP_MOVE:
+        index, new_index = _PAIR.unpack_from(payload, 1)
+        task_list.move(index, new_index)
+    elif op == OP_CLEAR:
+        task_list.clear()
+    else:
+        raise ValueError(f"未知的日志操作码: {op}")
+
+
+def read_records(path: str) -> Tuple[int, List[bytes], int]:
+    """读取日志文件，返回 (代号, 完整记录的负载列表, 最后一条完整记录的结束位置)"""
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < _FILE_HEADER.size:
+        return -1, [], 0
+    magic, generation = _FILE_HEADER.unpack_from(data, 0)
+    if magic != JOURNAL_MAGIC:
+        return -1, [], 0
+    records = []
+    pos = _FILE_HEADER.size
+    while pos + _RECORD_HEADER.size <= len(data):
+        length, crc = _RECORD_HEADER.unpack_from(data, pos)
+        start = pos + _RECORD_HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or length == 0 or zlib.crc32(payload) != crc:
+            break  # 崩溃时写了一半的记录
+        records.append(payload)
+        pos = start + length
+    return generation, records, pos
+
+
+class TaskJournal:
+    """TaskList 的自动保存日志：先 recover() 恢复任务，再 attach() 开始记录"""
+
+    # 组提交间隔：第一条未提交记录最多等待这么久就写盘并 fsync
+    COMMIT_INTERVAL = 0.05
+
+    def __init__(self, directory: str, snapshot_every: int = 100_000,
+                 commit_interval: Optional[float] = None):
+        """打开日志目录并独占其锁文件，目录已被另一个实例占用时抛出 JournalLockedError"""
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.commit_interval = self.COMMIT_INTERVAL if commit_interval is None else commit_interval
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = open(os.path.join(directory, LOCK_FILE), "a+b")
+        try:
+            _lock(self._lock_file)
+        except OSError as e:
+            self._lock_file.close()
+            raise JournalLockedError(f"自动保存目录正被另一个实例使用: {directory}") from e
+
+        self._cond = threading.Condition()
+        self._queue = deque()          # 待写入的记录（bytes）或快照请求（元组）
+        self._generation = 0
+        self._since_snapshot = 0
+        self._task_list = None
+        self._file = None
+        self._closed = False
+        self._writing = False          # 后台线程正在写盘
+        self._worker = None
+
+        # 统计
+        self.records = 0
+        self.bytes_written = 0
+        self.fsyncs = 0
+        self.snapshots = 0
+
+    # ---- 恢复 ----
+
+    def _files(self, kind: str) -> List[Tuple[int, str]]:
+        found = []
+        for name in os.listdir(self.directory):
+            match = _FILE_PATTERN.match(name)
+            if match and match.group(1) == kind:
+                found.append((int(match.group(2)), os.path.join(self.directory, name)))
+        return sorted(found)
+
+    def recover(self, task_list) -> int:
+        """加载最新快照并重放之后的日志，返回重放的记录数"""
+        base = 0
+        for generation, path in reversed(self._files("snapshot")):
+            try:
+                with MappedAgenda(path) as agenda:
+                    task_list.insert_many(0, agenda)
+                base = generation
+                break
+            except (OSError, AgendaFormatError) as e:
+                logging.warning(f"快照无法读取，尝试更早的快照: {e}")
+
+        replayed = 0
+        last = base
+        for generation, path in self._files("journal"):
+            if generation < base:
+                continue
+            file_generation, records, end = read_records(path)
+            if file_generation != generation:
+                logging.warning(f"日志文件头无效，已跳过: {path}")
+                continue
+            for payload in records:
+                apply_record(payload, task_list)
+            replayed += len(records)
+            last = generation
+            if end < os.path.getsize(path):
+                logging.warning(f"日志末尾有不完整的记录，已截断: {path}")
+                with open(path, "r+b") as file:
+                    file.truncate(end)
+        self._generation = last
+        self._since_snapshot = replayed
+        self._remove_older_than(base)
+        return replayed
+
+    def _remove_older_than(self, generation: int):
+        for kind in ("journal", "snapshot"):
+            for file_generation, path in self._files(kind):
+                if file_generation < generation:
+                    try:
+                        os.remove(path)
+                    except OSError as e:
+                        logging.warning(f"旧日志清理失败: {e}")
+
+    # ---- 记录 ----
+
+    def attach(self, task_list):
+        """开始记录 task_list 的修改"""
+        self._task_list = task_list
+        self._open_journal(self._generation)
+        self._worker = threading.Thread(target=self._flush_loop, name="TaskJournal", daemon=True)
+        self._worker.start()
+        task_list.add_listener(self._on_change)
+
+    def _open_journal(self, generation: int):
+        path = os.path.join(self.directory, f"journal-{generation:08d}.log")
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "ab")
+        if new:
+            self._file.write(_FILE_HEADER.pack(JOURNAL_MAGIC, generation))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _on_change(self, change: TaskListChange):
+        if change.kind == RESET and len(self._task_list):
+            # 整体替换（导入）时直接生成快照，比逐条记录更紧凑
+            self.snapshot()
+            return
+        payload = encode_change(change, self._task_list)
+        record = _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._cond:
+            self._queue.append(record)
+            self.records += 1
+            self._since_snapshot += 1
+            self._cond.notify()
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """切换到新一代日志，并在后台写入当前任务列表的快照"""
+        tasks = self._task_list.get_all()
+        with self._cond:
+            self._generation += 1
+            self._since_snapshot = 0
+            self._queue.append((self._generation, tasks))
+            self._cond.notify()
+
+    def sync(self):
+        """等待此前的所有记录写盘"""
+        with self._cond:
+            self._cond.notify()
+            while (self._queue or self._writing) and self._worker is not None and self._worker.is_alive():
+                self._cond.wait(0.01)
+
+    def close(self):
+        """提交剩余记录并停止后台线程"""
+        if self._task_list is not None:
+            self._task_list.remove_listener(self._on_change)
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._worker is not None:
+            self._worker.join()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._lock_file is not None:
+            self._lock_file.close()  # 关闭文件即释放锁
+            self._lock_file = None
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue and self._closed:
+                    return
+            # 等待一个提交间隔，把这段时间内的编辑合并为一次 fsync
+            if not self._closed:
+                time.sleep(self.commit_interval)
+            with self._cond:
+                items = list(self._queue)
+                self._queue.clear()
+                self._writing = True
+            try:
+                self._write(items)
+            except OSError as e:
+                logging.error(f"自动保存日志写入失败: {e}")
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+    def _write(self, items):
+        chunk = []
+        for item in items:
+            if isinstance(item, bytes):
+                chunk.append(item)
+                continue
+            self._commit(chunk)
+            chunk = []
+            generation, tasks = item
+            self._file.close()
+            self._open_journal(generation)
+            self._write_snapshot(generation, tasks)
+        self._commit(chunk)
+
+    def _commit(self, chunk: List[bytes]):
+        if not chunk:
+            return
+        data = b"".join(chunk)
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.bytes_written += len(data)
+        self.fsyncs += 1
+
+    def _write_snapshot(self, generation: int, tasks: List[Task]):
+        path = os.path.join(self.directory, f"snapshot-{generation:08d}.agenda")
+        write_agenda(path, tasks, row=lambda task: (task.name, task.minutes))
+        with open(path, "rb") as file:
+            os.fsync(file.fileno())
+        self.snapshots += 1
+        # 快照落盘后，之前各代的快照和日志都不再需要
+        self._remove_older_than(generation)
@@ -1,36 +1,189 @@
-from typing import List, Optional
+from collections.abc import Sequence
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Tuple
 from task import Task
 
-class TaskList:
+# 变更通知类型
+INSERTED = "inserted"   # 在 index 处插入了 count 个任务
+REMOVED = "removed"     # 从 index 开始删除了 count 个任务
+UPDATED = "updated"     # 从 index 开始的 count 个任务被修改
+MOVED = "moved"         # index 处的任务移动到了 new_index
+RESET = "reset"         # 列表整体被替换（清空、导入），需要全量刷新
+
+
+class TaskListChange(NamedTuple):
+    """一次 TaskList 变更的描述
+
+    批量删除/修改不连续的任务时，indices 给出按升序排列的全部索引
+    （删除时为删除前的位置），此时 index 为第一个索引、count 为总数。
+    """
+    kind: str
+    index: int = 0
+    count: int = 1
+    new_index: int = -1
+    indices: Tuple[int, ...] = ()
+
+
+def _valid_indices(indices: Iterable[int], size: int) -> List[int]:
+    """去重、排序并丢弃越界的索引"""
+    return sorted({i for i in indices if 0 <= i < size})
+
+
+def _kept_runs(removed: List[int], size: int) -> Iterator[Tuple[int, int]]:
+    """按升序删除索引，给出删除后保留下来的连续区间 [start, end)"""
+    start = 0
+    for index in removed:
+        if index > start:
+            yield start, index
+        start = index + 1
+    if start < size:
+        yield start, size
+
+
+class ChangeNotifier:
+    """变更通知：订阅者在每次修改后同步收到 TaskListChange"""
+
     def __init__(self):
+        self._listeners: List[Callable[[TaskListChange], None]] = []
+
+    def add_listener(self, listener: Callable[[TaskListChange], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[TaskListChange], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, kind: str, index: int = 0, count: int = 1, new_index: int = -1,
+                indices: Tuple[int, ...] = ()):
+        if self._listeners:
+            change = TaskListChange(kind, index, count, new_index, indices)
+            for listener in list(self._listeners):
+                listener(change)
+
+
+class TaskListView(Sequence):
+    """TaskList 的只读视图，直接引用内部列表，不复制"""
+    __slots__ = ("_tasks",)
+
+    def __init__(self, tasks: List[Task]):
+        self._tasks = tasks
+
+    def __getitem__(self, index):
+        return self._tasks[index]
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._tasks)
+
+
+class TaskList(ChangeNotifier):
+    def __init__(self):
+        super().__init__()
         self._tasks: List[Task] = []
+        # 增量维护的聚合值，统计信息无需遍历整个列表
+        self._total_minutes = 0
 
     def add(self, task: Task):
         self._tasks.append(task)
+        self._total_minutes += task.minutes
+        self._notify(INSERTED, len(self._tasks) - 1)
+
+    def insert(self, index: int, task: Task):
+        """在指定位置插入任务"""
+        index = max(0, min(index, len(self._tasks)))
+        self._tasks.insert(index, task)
+        self._total_minutes += task.minutes
+        self._notify(INSERTED, index)
+
+    def insert_many(self, index: int, tasks: Iterable[Task]):
+        """在指定位置一次插入多个任务，只发出一次通知"""
+        tasks = list(tasks)
+        if not tasks:
+            return
+        index = max(0, min(index, len(self._tasks)))
+        self._tasks[index:index] = tasks
+        self._total_minutes += sum(task.minutes for task in tasks)
+        self._notify(INSERTED, index, len(tasks))
+
+    def move(self, index: int, new_index: int):
+        """把任务从 index 移动到 new_index"""
+        if 0 <= index < len(self._tasks) and 0 <= new_index < len(self._tasks) and index != new_index:
+            self._tasks.insert(new_index, self._tasks.pop(index))
+            self._notify(MOVED, index, 1, new_index)
 
     def get_all(self) -> List[Task]:
         return self._tasks.copy()  # 返回副本避免外部修改
 
+    def view(self) -> TaskListView:
+        """返回只读视图（不复制），随列表变化而变化"""
+        return TaskListView(self._tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._tasks)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __getitem__(self, index: int) -> Task:
+        return self._tasks[index]
+
     def delete(self, index: int):
         """删除指定索引的任务"""
         if 0 <= index < len(self._tasks):
-            self._tasks.pop(index)
+            self._total_minutes -= self._tasks.pop(index).minutes
+            self._notify(REMOVED, index)
+
+    def delete_many(self, indices: Iterable[int]):
+        """一次删除多个任务（O(n)），只发出一次通知"""
+        indices = _valid_indices(indices, len(self._tasks))
+        if not indices:
+            return
+        self._total_minutes -= sum(self._tasks[i].minutes for i in indices)
+        first, last = indices[0], indices[-1]
+        if last - first + 1 == len(indices):
+            del self._tasks[first:last + 1]  # 连续区间直接切片删除
+        else:
+            kept = []
+            for start, end in _kept_runs(indices, len(self._tasks)):
+                kept += self._tasks[start:end]
+            self._tasks[:] = kept
+        self._notify(REMOVED, indices[0], len(indices), indices=tuple(indices))
 
     def clear(self):
         """清空所有任务"""
         self._tasks.clear()
+        self._total_minutes = 0
+        self._notify(RESET)
 
     def update(self, index: int, updated_task: Task):
         """更新指定索引的任务"""
         if 0 <= index < len(self._tasks):
+            self._total_minutes += updated_task.minutes - self._tasks[index].minutes
             self._tasks[index] = updated_task
+            self._notify(UPDATED, index)
+
+    def update_many(self, updates: Iterable[Tuple[int, Task]]):
+        """一次修改多个任务，updates 为 (索引, 新任务) 序列，只发出一次通知"""
+        size = len(self._tasks)
+        changed = {}
+        for index, task in updates:
+            if 0 <= index < size:
+                changed[index] = task
+        if not changed:
+            return
+        for index, task in changed.items():
+            self._total_minutes += task.minutes - self._tasks[index].minutes
+            self._tasks[index] = task
+        indices = tuple(sorted(changed))
+        self._notify(UPDATED, indices[0], len(indices), indices=indices)
 
     def get_total_time(self) -> int:
-        """获取总时长"""
-        return sum(task.minutes for task in self._tasks)
+        """获取总时长（O(1)）"""
+        return self._total_minutes
 
     def get_task_count(self) -> int:
-        """获取任务数量"""
+        """获取任务数量（O(1)）"""
         return len(self._tasks)
 
     def export_to_list(self) -> List[dict]:
@@ -39,4 +192,7 @@ class TaskList:
 
     def import_from_list(self, data: List[dict]):
         """从字典列表导入"""
-        self._tasks = [Task(name=item["name"], minutes=item["minutes"]) for item in data]
\ No newline at end of file
+        # 原地替换，保持 view() 等持有的列表对象不变
+        self._tasks[:] = [Task(name=item["name"], minutes=item["minutes"]) for item in data]
+        self._total_minutes = sum(task.minutes for task in self._tasks)
+        self._notify(RESET)
@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sqlite_task_list import SqliteTaskList  # noqa: E402
+from task import Task  # noqa: E402
+
+
+class RenumberTest(unittest.TestCase):
+    """头部插入产生负排序键后，间隔用尽时的整体重排"""
+
+    def setUp(self):
+        self.task_list = SqliteTaskList()
+        self.addCleanup(self.task_list.close)
+
+    def test_insert_into_exhausted_gap_after_head_inserts(self):
+        task_list = self.task_list
+        task_list.add(Task("A", 1))
+        task_list.add(Task("B", 1))
+        task_list.insert(0, Task("头1", 1))
+        task_list.insert(0, Task("头2", 1))
+        # 反复插入到 A 之前，间隔约 20 次后用尽并触发重排
+        for i in range(60):
+            task_list.insert(len(task_list) - 2, Task(f"x{i}", 1))
+
+        names = [task.name for task in task_list]
+        self.assertEqual(names, ["头2", "头1"] + [f"x{i}" for i in range(60)] + ["A", "B"])
+        reopened = [row[0] for row in task_list._conn.execute("SELECT name FROM tasks ORDER BY position")]
+        self.assertEqual(reopened, names)
+
+    def test_renumber_with_only_negative_positions(self):
+        task_list = self.task_list
+        task_list.add(Task("A", 1))
+        for i in range(30):
+            task_list.insert(0, Task(f"h{i}", 1))
+            task_list.insert(1, Task(f"m{i}", 1))
+        task_list._renumber()
+        names = [row[0] for row in task_list._conn.execute("SELECT name FROM tasks ORDER BY position")]
+        self.assertEqual(names, [task.name for task in task_list])
+
+    def test_renumber_with_all_positions_negative(self):
+        task_list = self.task_list
+        task_list.add(Task("A", 1))
+        task_list.add(Task("B", 1))
+        # 反复头部插入后删掉正数尾部时，剩下的排序键全部为负，例如 -3、-1
+        conn = task_list._conn
+        for position, task_id in zip((-1, -3), task_list._ids):
+            conn.execute("UPDATE tasks SET position = ? WHERE id = ?", (position, task_id))
+        task_list._load()
+        task_list._renumber()
+        names = [row[0] for row in conn.execute("SELECT name FROM tasks ORDER BY position")]
+        self.assertEqual(names, ["B", "A"])
+        self.assertEqual(names, [task.name for task in task_list])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,220 @@
+"""任务列表的撤销/重做历史
+
+UndoHistory 订阅 TaskList 的变更通知，用 PersistentSequence 维护一份与列表
+同步的持久化副本：每次修改只更新 O(log n) 个节点，修改前后的版本都只是一个
+根节点引用（O(1) 快照），不需要复制整个列表。撤销时根据变更类型和修改前的版本
+生成逆操作（删除的任务从旧版本中取回），通过 TaskList 的公开接口执行，
+界面、自动保存日志等其他订阅者照常收到通知。
+
+历史按步数（max_steps）和估算的节点数（max_cost）限制内存：清空或导入会让整个
+旧版本由历史独占，计为旧列表的长度；其他修改计为变更的任务数加树高。超出时
+丢弃最早的步骤，但始终保留最近一步。
+"""
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import List, NamedTuple
+from persistent_sequence import PersistentSequence
+from task_list import INSERTED, MOVED, REMOVED, RESET, UPDATED, TaskListChange
+
+# 撤销批量删除时最多逐段插回的区间数，超过则整体恢复删除前的版本
+MAX_REINSERT_RUNS = 16
+
+
+class _Edit(NamedTuple):
+    """一次变更及其前后版本"""
+    change: TaskListChange
+    before: PersistentSequence
+    after: PersistentSequence
+    cost: int
+
+
+def _changed_indices(change: TaskListChange):
+    return change.indices or range(change.index, change.index + change.count)
+
+
+def _runs(indices):
+    """把升序索引合并为连续区间 [start, end)"""
+    runs = []
+    for index in indices:
+        if runs and runs[-1][1] == index:
+            runs[-1][1] = index + 1
+        else:
+            runs.append([index, index + 1])
+    return runs
+
+
+class UndoHistory:
+    """TaskList 的撤销/重做历史，一步可以包含多次修改（见 group()）"""
+
+    def __init__(self, task_list, max_steps: int = 100, max_cost: int = 1_000_000):
+        self.task_list = task_list
+        self.max_steps = max_steps
+        self.max_cost = max_cost
+        self._state = PersistentSequence(task_list.view())
+        self._undo = deque()   # 每一步是 List[_Edit]
+        self._redo = []
+        self._cost = 0         # 撤销与重做栈的总估算节点数
+        self._group = None
+        self._group_depth = 0
+        self._applying = False
+        task_list.add_listener(self._on_change)
+
+    def detach(self):
+        """停止记录并丢弃历史"""
+        self.task_list.remove_listener(self._on_change)
+        self.clear()
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._cost = 0
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @contextmanager
+    def group(self):
+        """把其中的多次修改合并为一步（例如导入时先清空再插入）"""
+        if self._group_depth == 0:
+            self._group = []
+        self._group_depth += 1
+        try:
+            yield self
+        finally:
+            self._group_depth -= 1
+            if self._group_depth == 0:
+                edits, self._group = self._group, None
+                if edits:
+                    self._push(edits)
+
+    # ---- 记录 ----
+
+    def _on_change(self, change: TaskListChange):
+        if self._applying:
+            return  # 撤销/重做自身引起的通知，结束后直接切换版本
+        before = self._state
+        self._state = after = self._advance(before, change)
+        cost = len(before) if change.kind == RESET else change.count + before.height
+        edit = _Edit(change, before, after, cost)
+        if self._group is not None:
+            self._group.append(edit)
+        else:
+            self._push([edit])
+
+    def _advance(self, state: PersistentSequence, change: TaskListChange) -> PersistentSequence:
+        """把一次变更应用到持久化副本上（O(k log n)）"""
+        kind = change.kind
+        if kind == INSERTED:
+            return state.insert_many(change.index,
+                                     self.task_list.view()[change.index:change.index + change.count])
+        if kind == REMOVED:
+            if change.indices:
+                return state.delete_many(change.indices)
+            return state.delete_range(change.index, change.index + change.count)
+        if kind == UPDATED:
+            return state.set_many((i, self.task_list[i]) for i in _changed_indices(change))
+        if kind == MOVED:
+            return state.move(change.index, change.new_index)
+        return PersistentSequence(self.task_list.view())
+
+    def _push(self, edits: List[_Edit]):
+        self._cost += sum(edit.cost for edit in edits)
+        for step in self._redo:
+            self._cost -= sum(edit.cost for edit in step)
+        self._redo.clear()
+        self._undo.append(edits)
+        while len(self._undo) > 1 and (len(self._undo) > self.max_steps or self._cost > self.max_cost):
+            self._cost -= sum(edit.cost for edit in self._undo.popleft())
+
+    # ---- 撤销/重做 ----
+
+    def undo(self) -> bool:
+        """撤销最近一步，没有可撤销的步骤时返回 False"""
+        if not self._undo:
+            return False
+        edits = self._undo.pop()
+        self._apply(self._revert, reversed(edits), edits[0].before)
+        self._redo.append(edits)
+        return True
+
+    def redo(self) -> bool:
+        """重做最近撤销的一步，没有可重做的步骤时返回 False"""
+        if not self._redo:
+            return False
+        edits = self._redo.pop()
+        self._apply(self._replay, edits, edits[-1].after)
+        self._undo.append(edits)
+        return True
+
+    def _apply(self, operation, edits, state: PersistentSequence):
+        self._applying = True
+        try:
+            for edit in edits:
+                operation(edit)
+        except Exception:
+            # 列表已处于未知状态：以当前内容为准重新开始记录
+            logging.exception("撤销/重做失败，已清空历史")
+            self._state = PersistentSequence(self.task_list.view())
+            self.clear()
+            raise
+        finally:
+            self._applying = False
+        self._state = state
+
+    def _revert(self, edit: _Edit):
+        """执行 edit 的逆操作"""
+        change, before, task_list = edit.change, edit.before, self.task_list
+        kind = change.kind
+        if kind == INSERTED:
+            if change.count == 1:
+                task_list.delete(change.index)
+            else:
+                task_list.delete_many(range(change.index, change.index + change.count))
+        elif kind == REMOVED:
+            runs = _runs(_changed_indices(change))
+            if len(runs) > MAX_REINSERT_RUNS:
+                self._restore(before)  # 每次插回都是 O(n)，分散的区间太多时整体替换更快
+                return
+            # 按升序在原位置插回，后面的区间位置不受前面插入的影响
+            for start, end in runs:
+                task_list.insert_many(start, before[start:end])
+        elif kind == UPDATED:
+            if change.indices:
+                task_list.update_many((i, before[i]) for i in change.indices)
+            else:
+                task_list.update(change.index, before[change.index])
+        elif kind == MOVED:
+            task_list.move(change.new_index, change.index)
+        else:
+            self._restore(before)
+
+    def _replay(self, edit: _Edit):
+        """重新执行 edit"""
+        change, after, task_list = edit.change, edit.after, self.task_list
+        kind = change.kind
+        if kind == INSERTED:
+            task_list.insert_many(change.index, after[change.index:change.index + change.count])
+        elif kind == REMOVED:
+            if change.count == 1 and not change.indices:
+                task_list.delete(change.index)
+            else:
+                task_list.delete_many(_changed_indices(change))
+        elif kind == UPDATED:
+            if change.indices:
+                task_list.update_many((i, after[i]) for i in change.indices)
+            else:
+                task_list.update(change.index, after[change.index])
+        elif kind == MOVED:
+            task_list.move(change.index, change.new_index)
+        else:
+            self._restore(after)
+
+    def _restore(self, state: PersistentSequence):
+        """整体替换为 state 的内容（撤销清空/导入）"""
+        self.task_list.clear()
+        if len(state):
+            self.task_list.insert_many(0, state)
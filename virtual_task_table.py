@@ -0,0 +1,246 @@
+from bisect import bisect_left
+from tkinter import ttk
+from typing import Callable, List
+from task import Task
+from task_list import INSERTED, MOVED, REMOVED, RESET, TaskListChange
+
+# 事件修饰键位
+_SHIFT_MASK = 0x0001
+_CONTROL_MASK = 0x0004
+
+
+def default_row(number: int, task: Task) -> tuple:
+    """默认的行内容：序号、任务名称、时长"""
+    return number, task.name, task.minutes
+
+
+def _contains(sorted_indices, index: int) -> bool:
+    """在升序序列中二分查找"""
+    pos = bisect_left(sorted_indices, index)
+    return pos < len(sorted_indices) and sorted_indices[pos] == index
+
+
+class VirtualTaskTable(ttk.Frame):
+    """虚拟滚动的任务表格，只为可见窗口内的行创建 Treeview 条目
+
+    Treeview 中的条目数量等于可见行数，滚动时只改写这些条目的内容，
+    因此无论任务列表有多长，Tk 端的内存与滚动开销都保持不变。
+    选中状态以任务索引保存在表格中，滚出可见区域后仍然保留。
+    """
+
+    COLUMNS = (("#1", "序号", 60, "center"),
+               ("#2", "任务名称", 250, "w"),
+               ("#3", "时长(分钟)", 100, "center"))
+
+    def __init__(self, master, task_list, height: int = 12,
+                 format_row: Callable[[int, Task], tuple] = default_row, columns=COLUMNS):
+        super().__init__(master)
+        self.task_list = task_list
+        self.format_row = format_row
+        self._top = 0                # 可见窗口第一行的任务索引
+        self._rows = height          # 可见行数，随控件大小调整
+        self._items: List[str] = []  # 可见行对应的 Treeview 条目
+        self._selected = set()       # 选中的任务索引
+        self._anchor = 0             # Shift 范围选择的起点
+        self._render_job = None
+
+        # columns 为 (列, 标题, 宽度, 对齐) 序列，与 format_row 返回的值一一对应
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in columns], show="headings",
+                                 height=height, selectmode="none")
+        for column, text, width, anchor in columns:
+            self.tree.heading(column, text=text)
+            self.tree.column(column, width=width, anchor=anchor)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self._move_cursor(-1, e))
+        self.tree.bind("<Down>", lambda e: self._move_cursor(1, e))
+        self.tree.bind("<Prior>", lambda e: self._move_cursor(-self._rows, e))
+        self.tree.bind("<Next>", lambda e: self._move_cursor(self._rows, e))
+        self.tree.bind("<Control-a>", self._select_all)
+        self.tree.bind("<Configure>", self._on_configure)
+
+        task_list.add_listener(self._on_change)
+        self.render()
+
+    def bind_rows(self, sequence: str, func):
+        """为表格行绑定事件（如 <Double-1>）"""
+        self.tree.bind(sequence, func, add="+")
+
+    def selection(self) -> List[int]:
+        """按顺序返回选中的任务索引"""
+        return sorted(self._selected)
+
+    def selection_set(self, indices):
+        self._selected = {i for i in indices if 0 <= i < len(self.task_list)}
+        self._schedule_render()
+
+    def see(self, index: int):
+        """滚动使指定任务可见"""
+        if index < self._top:
+            self._set_top(index)
+        elif index >= self._top + self._rows:
+            self._set_top(index - self._rows + 1)
+
+    def detach(self):
+        """停止跟随任务列表的变化"""
+        self.task_list.remove_listener(self._on_change)
+        if self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._render_job = None
+
+    def destroy(self):
+        self.detach()
+        super().destroy()
+
+    # ---- 渲染 ----
+
+    def render(self):
+        """把可见窗口内的任务写入 Treeview 条目"""
+        self._render_job = None
+        total = len(self.task_list)
+        self._top = max(0, min(self._top, total - self._rows))
+        needed = max(0, min(self._rows, total - self._top))
+        while len(self._items) < needed:
+            self._items.append(self.tree.insert("", "end"))
+        if len(self._items) > needed:
+            self.tree.delete(*self._items[needed:])
+            del self._items[needed:]
+
+        task_list = self.task_list
+        visible_selected = []
+        for offset, item in enumerate(self._items):
+            index = self._top + offset
+            self.tree.item(item, values=self.format_row(index + 1, task_list[index]))
+            if index in self._selected:
+                visible_selected.append(item)
+        self.tree.selection_set(visible_selected)
+
+        if total:
+            self.scrollbar.set(self._top / total, min(1.0, (self._top + self._rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def refresh(self):
+        """任务之外的显示内容（如预计时间）变化后，在空闲时重绘可见行"""
+        self._schedule_render()
+
+    def _schedule_render(self):
+        if self._render_job is None:
+            self._render_job = self.after_idle(self.render)
+
+    def _set_top(self, top: int):
+        top = max(0, min(top, len(self.task_list) - self._rows))
+        if top != self._top:
+            self._top = top
+            self._schedule_render()
+
+    def _on_change(self, change: TaskListChange):
+        """随任务列表变化调整选中索引，并重绘可见窗口"""
+        if change.kind == INSERTED:
+            end = change.index
+            self._selected = {i if i < end else i + change.count for i in self._selected}
+        elif change.kind == REMOVED and change.indices:
+            removed = change.indices
+            self._selected = {i - bisect_left(removed, i) for i in self._selected
+                              if not _contains(removed, i)}
+        elif change.kind == REMOVED:
+            start, end = change.index, change.index + change.count
+            self._selected = {i if i < start else i - change.count
+                              for i in self._selected if not start <= i < end}
+        elif change.kind == MOVED:
+            old, new = change.index, change.new_index
+            remapped = set()
+            for i in self._selected:
+                if i == old:
+                    i = new
+                elif old < i <= new:
+                    i -= 1
+                elif new <= i < old:
+                    i += 1
+                remapped.add(i)
+            self._selected = remapped
+        elif change.kind == RESET:
+            self._selected.clear()
+            self._top = 0
+        self._schedule_render()
+
+    # ---- 滚动 ----
+
+    def _on_configure(self, event):
+        """控件大小变化时重新计算可见行数"""
+        bbox = self.tree.bbox(self._items[0]) if self._items else ""
+        if bbox:
+            header, row_height = bbox[1], bbox[3]
+        else:
+            header, row_height = 25, 20
+        rows = max(1, (event.height - header) // max(1, row_height))
+        if rows != self._rows:
+            self._rows = rows
+            self._schedule_render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._set_top(int(float(amount) * len(self.task_list)))
+        elif action == "scroll":
+            step = self._rows if unit == "pages" else 1
+            self._scroll_by(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        # Windows 每格为 120，macOS 为 1
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self._scroll_by(-3 * delta)
+        return "break"
+
+    def _scroll_by(self, rows: int):
+        self._set_top(self._top + rows)
+        return "break"
+
+    # ---- 选择 ----
+
+    def _on_click(self, event):
+        if self.tree.identify_region(event.x, event.y) not in ("cell", "tree"):
+            return None
+        item = self.tree.identify_row(event.y)
+        if not item or item not in self._items:
+            return None
+        index = self._top + self._items.index(item)
+        self._select(index, event.state)
+        self.tree.focus_set()
+        return None
+
+    def _select(self, index: int, state: int = 0):
+        """按修饰键处理单选、Ctrl 多选与 Shift 范围选择"""
+        if state & _SHIFT_MASK:
+            low, high = sorted((self._anchor, index))
+            if not state & _CONTROL_MASK:
+                self._selected.clear()
+            self._selected.update(range(low, high + 1))
+        elif state & _CONTROL_MASK:
+            self._selected.symmetric_difference_update((index,))
+            self._anchor = index
+        else:
+            self._selected = {index}
+            self._anchor = index
+        self.see(index)
+        self._schedule_render()
+
+    def _move_cursor(self, step: int, event):
+        total = len(self.task_list)
+        if not total:
+            return "break"
+        current = max(self._selected) if step > 0 and self._selected else \
+            min(self._selected) if self._selected else self._top - step
+        index = max(0, min(total - 1, current + step))
+        self._select(index, event.state & _SHIFT_MASK)
+        return "break"
+
+    def _select_all(self, event=None):
+        self._selected = set(range(len(self.task_list)))
+        self._schedule_render()
+        return "break"
@@ -1,74 +1,394 @@
-import pyttsx3
+import heapq
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
 import threading
 import logging
-from typing import Optional
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Optional
+from announcement_cache import DEFAULT_AUDIO_CACHE_DIR, AnnouncementCache
+
+if TYPE_CHECKING:
+    import pyttsx3
+
+# 选中的语音 id 缓存在磁盘上，之后启动时无需再扫描所有已安装语音
+DEFAULT_VOICE_CACHE = os.path.join(os.path.expanduser("~"), ".meeting_timer", "voice.json")
+
+
+# 播报优先级：数值越小越先播
+PRIORITY_HIGH = 0      # 会议开始/结束、任务切换
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2       # 测试语音等
+PRIORITY_PRERENDER = 3 # 后台预渲染，只在空闲时进行
+
+# 任务切换播报的合并键：新的切换播报会取代尚未播出的旧播报
+TASK_BOUNDARY_KEY = "task_boundary"
+
+MEETING_END_MESSAGE = "会议已结束，辛苦了！"
+
+
+class _Utterance:
+    """排队等待合成的一条播报"""
+    __slots__ = ("priority", "seq", "text", "key", "enqueued", "done", "cancelled", "render")
+
+    def __init__(self, priority: int, seq: int, text: str, key: Optional[str], render: bool = False):
+        self.render = render      # True 表示只渲染到缓存，不播放
+        self.priority = priority
+        self.seq = seq
+        self.text = text
+        self.key = key
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
 
 
 class VoiceService:
-    def __init__(self):
-        self.engine: Optional[pyttsx3.Engine] = None
-        self._initialize_engine()
+    def __init__(self, enabled: bool = True, background: bool = False,
+                 cache_path: Optional[str] = DEFAULT_VOICE_CACHE,
+                 audio_cache_dir: Optional[str] = DEFAULT_AUDIO_CACHE_DIR,
+                 audio_cache_bytes: int = 50 * 1024 * 1024):
+        """
+        Args:
+            enabled: 是否启用语音，关闭时所有播报静默忽略
+            background: 是否不等待引擎就绪即返回（不阻塞界面启动）
+            cache_path: 语音 id 缓存文件路径，None 表示不缓存
+            audio_cache_dir: 预渲染播报音频的缓存目录，None 表示不预渲染
+            audio_cache_bytes: 音频缓存的大小上限，超出时淘汰最久未用的文件
+        """
+        self.enabled = enabled
+        self.engine: Optional["pyttsx3.Engine"] = None
+        self.cache_path = cache_path
+        self.rate = 150
+        self.volume = 0.8
+        self.voice_id = None
+        self.audio_cache: Optional[AnnouncementCache] = None
+        self._audio_cache_dir = audio_cache_dir
+        self._audio_cache_bytes = audio_cache_bytes
+        self._player = None
+        self._prerender_queued = set()   # 已排队等待预渲染的文本
+        self.init_timings = []           # 初始化各步骤耗时 [(步骤, 秒)]
+        # 引擎就绪时结果为 True，初始化失败或未启用时为 False
+        self.ready: Future = Future()
+
+        # 唯一的语音工作线程独占引擎，按优先级消费播报队列，
+        # 避免多个线程同时调用 runAndWait 造成播报互相冲突或丢失
+        self._cond = threading.Condition()
+        self._queue = []                 # _Utterance 小顶堆，被取代的项惰性删除
+        self._keyed = {}                 # 合并键 -> 尚未播出的播报
+        self._seq = itertools.count()
+        self._closed = False
+        self._worker = None
+        self._depth = 0                  # 有效排队数（不含已被取代的项）
+        self._max_depth = 0
+        self._coalesced = 0
+        self._spoken = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._synth_total = 0.0
+        self._synth_max = 0.0
+
+        if not enabled:
+            self.ready.set_result(False)
+            return
+        self._worker = threading.Thread(target=self._worker_loop, name="VoiceWorker", daemon=True)
+        self._worker.start()
+        if not background:
+            self.ready.result()
 
     def _initialize_engine(self):
         """初始化语音引擎"""
+        step_start = time.perf_counter()
+
+        def step(label):
+            nonlocal step_start
+            now = time.perf_counter()
+            self.init_timings.append((label, now - step_start))
+            step_start = now
+
         try:
-            self.engine = pyttsx3.init()
-            # 设置语音属性
-            voices = self.engine.getProperty('voices')
-            if voices:
-                # 尝试使用中文语音（如果可用）
-                for voice in voices:
-                    if 'chinese' in voice.name.lower() or 'zh' in voice.id.lower():
-                        self.engine.setProperty('voice', voice.id)
-                        break
-                else:
-                    # 如果没有中文语音，使用第一个可用语音
-                    self.engine.setProperty('voice', voices[0].id)
+            # 延迟导入：无声卡或未安装 pyttsx3 的主机上也能导入本模块
+            import pyttsx3
+            step("导入 pyttsx3")
+            engine = pyttsx3.init()
+            step("pyttsx3.init")
+
+            # 设置语音属性：优先使用缓存的语音 id，失败时再扫描
+            if not self._apply_cached_voice(engine):
+                self._select_voice(engine)
+            step("选择语音")
 
             # 设置语速和音量
-            self.engine.setProperty('rate', 150)  # 语速
-            self.engine.setProperty('volume', 0.8)  # 音量
+            engine.setProperty('rate', self.rate)  # 语速
+            engine.setProperty('volume', self.volume)  # 音量
+            self.voice_id = engine.getProperty('voice')
 
+            self.engine = engine
+            self._setup_audio_cache()
             logging.info("语音服务初始化成功")
+            self.ready.set_result(True)
 
         except Exception as e:
             logging.error(f"语音服务初始化失败: {e}")
             self.engine = None
+            self.ready.set_result(False)
+
+    def _apply_cached_voice(self, engine) -> bool:
+        """应用磁盘缓存中的语音 id，成功返回 True"""
+        if not self.cache_path:
+            return False
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                voice_id = json.load(f)["voice_id"]
+            engine.setProperty('voice', voice_id)
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        except Exception as e:
+            logging.warning(f"缓存的语音不可用，重新扫描: {e}")
+            return False
 
-    def speak(self, text: str, async_mode: bool = True):
+    def _select_voice(self, engine):
+        """扫描已安装的语音，选中后写入缓存"""
+        voices = engine.getProperty('voices')
+        if not voices:
+            return
+        # 尝试使用中文语音（如果可用）
+        for voice in voices:
+            if 'chinese' in voice.name.lower() or 'zh' in voice.id.lower():
+                voice_id = voice.id
+                break
+        else:
+            # 如果没有中文语音，使用第一个可用语音
+            voice_id = voices[0].id
+        engine.setProperty('voice', voice_id)
+
+        if self.cache_path:
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                with open(self.cache_path, 'w', encoding='utf-8') as f:
+                    json.dump({"voice_id": voice_id}, f)
+            except OSError as e:
+                logging.warning(f"语音缓存写入失败: {e}")
+
+    def _setup_audio_cache(self):
+        """找到可用的音频播放方式后启用预渲染缓存，找不到时始终实时合成"""
+        if not self._audio_cache_dir:
+            return
+        if sys.platform == "win32":
+            self._player = "winsound"
+        else:
+            self._player = next((cmd for cmd in ("afplay", "paplay", "aplay") if shutil.which(cmd)), None)
+        if self._player is None:
+            logging.info("未找到音频播放程序，播报不使用预渲染缓存")
+            return
+        try:
+            # macOS 的 NSSpeechSynthesizer 只能输出 AIFF
+            extension = ".aiff" if sys.platform == "darwin" else ".wav"
+            self.audio_cache = AnnouncementCache(self._audio_cache_dir, self._audio_cache_bytes, extension)
+        except OSError as e:
+            logging.warning(f"播报缓存目录不可用: {e}")
+
+    def _audio_key(self, text: str) -> str:
+        return AnnouncementCache.make_key(text, self.voice_id, self.rate, self.volume)
+
+    def _render(self, text: str):
+        """把文本渲染成音频文件放入缓存（仅在语音工作线程中调用）"""
+        key = self._audio_key(text)
+        if self.audio_cache.contains(key):
+            return
+        temp_path = self.audio_cache.temp_path(key)
+        try:
+            self.engine.save_to_file(text, temp_path)
+            self.engine.runAndWait()
+            self.audio_cache.put(key, temp_path)
+        except Exception as e:
+            logging.warning(f"播报预渲染失败: {e}")
+
+    def _play_file(self, path: str) -> bool:
+        """播放缓存的音频文件，失败时返回 False 由调用方改为实时合成"""
+        try:
+            if self._player == "winsound":
+                import winsound
+                winsound.PlaySound(path, winsound.SND_FILENAME)
+            else:
+                subprocess.run([self._player, path], check=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return True
+        except Exception as e:
+            logging.warning(f"播放缓存音频失败，改为实时合成: {e}")
+            return False
+
+    def prerender(self, text: str):
+        """在后台把文本预渲染到音频缓存，之后播报这段文本时几乎没有延迟"""
+        if not self.enabled or (self.ready.done() and self.audio_cache is None):
+            return
+        with self._cond:
+            if self._closed or text in self._prerender_queued:
+                return
+            self._prerender_queued.add(text)
+            heapq.heappush(self._queue, _Utterance(PRIORITY_PRERENDER, next(self._seq), text, None, True))
+            self._cond.notify()
+
+    def prerender_task_completion(self, task_name: str, next_task_name: str = None):
+        """预渲染一条任务完成播报"""
+        self.prerender(self.task_completion_message(task_name, next_task_name))
+
+    def speak(self, text: str, async_mode: bool = True, priority: int = PRIORITY_NORMAL,
+              key: Optional[str] = None):
         """
         朗读文本
 
         Args:
             text: 要朗读的文本
             async_mode: 是否异步执行（不阻塞主线程）
+            priority: 播报优先级，数值越小越先播
+            key: 合并键，相同键的新播报会取代尚未播出的旧播报
         """
-        if not self.engine:
+        if not self.enabled:
+            return
+        if self.ready.done() and not self.engine:
             logging.warning("语音引擎未初始化，无法朗读")
             return
 
-        def _speak():
-            try:
-                self.engine.say(text)
-                self.engine.runAndWait()
-            except Exception as e:
-                logging.error(f"语音朗读失败: {e}")
-
-        if async_mode:
-            # 在新线程中执行，避免阻塞UI
-            thread = threading.Thread(target=_speak, daemon=True)
-            thread.start()
-        else:
-            _speak()
+        with self._cond:
+            if self._closed:
+                return
+            utterance = _Utterance(priority, next(self._seq), text, key)
+            if key is not None:
+                stale = self._keyed.get(key)
+                if stale is not None:
+                    stale.cancelled = True
+                    stale.done.set()
+                    self._depth -= 1
+                    self._coalesced += 1
+                self._keyed[key] = utterance
+            heapq.heappush(self._queue, utterance)
+            self._depth += 1
+            self._max_depth = max(self._max_depth, self._depth)
+            self._cond.notify()
+
+        if not async_mode:
+            utterance.done.wait()
+
+    def discard(self, key: str):
+        """丢弃指定合并键下尚未播出的播报"""
+        with self._cond:
+            stale = self._keyed.pop(key, None)
+            if stale is not None:
+                stale.cancelled = True
+                stale.done.set()
+                self._depth -= 1
+                self._coalesced += 1
+
+    def get_metrics(self) -> dict:
+        """获取播报队列指标（时间单位：秒）"""
+        with self._cond:
+            spoken = self._spoken
+            return {
+                "queue_depth": self._depth,
+                "max_queue_depth": self._max_depth,
+                "spoken": spoken,
+                "coalesced": self._coalesced,
+                "avg_wait": self._wait_total / spoken if spoken else 0.0,
+                "max_wait": self._wait_max,
+                "avg_synthesis": self._synth_total / spoken if spoken else 0.0,
+                "max_synthesis": self._synth_max,
+                "cache_hits": self.audio_cache.hits if self.audio_cache else 0,
+                "cache_misses": self.audio_cache.misses if self.audio_cache else 0,
+            }
+
+    def shutdown(self, wait: bool = False):
+        """停止语音工作线程
+
+        Args:
+            wait: False 时丢弃尚未播出的播报；True 时先播完已排队的播报（预渲染项丢弃），
+                并等待工作线程退出。工作线程是守护线程，进程退出前需要 wait=True 才能播完。
+        """
+        with self._cond:
+            self._closed = True
+            for utterance in self._queue:
+                if not wait or utterance.render:
+                    utterance.cancelled = True
+                    utterance.done.set()
+            if not wait:
+                self._queue.clear()
+                self._keyed.clear()
+                self._depth = 0
+            self._prerender_queued.clear()
+            self._cond.notify()
+        if wait and self._worker is not None and self._worker is not threading.current_thread():
+            self._worker.join()
+
+    def _worker_loop(self):
+        """语音工作线程：在本线程内初始化引擎，然后逐条合成播报"""
+        self._initialize_engine()
+        while True:
+            with self._cond:
+                while not self._closed and not self._queue:
+                    self._cond.wait()
+                if not self._queue:
+                    return  # 已关闭且队列已排空
+                utterance = heapq.heappop(self._queue)
+                if utterance.cancelled:
+                    continue
+                if utterance.render:
+                    # 预渲染项不计入播报队列深度
+                    self._prerender_queued.discard(utterance.text)
+                else:
+                    self._depth -= 1
+                if utterance.key is not None and self._keyed.get(utterance.key) is utterance:
+                    del self._keyed[utterance.key]
+
+            if utterance.render:
+                if self.engine and self.audio_cache is not None:
+                    self._render(utterance.text)
+                continue
+
+            started = time.perf_counter()
+            if self.engine:
+                cached = None
+                if self.audio_cache is not None:
+                    cached = self.audio_cache.get(self._audio_key(utterance.text))
+                if cached is None or not self._play_file(cached):
+                    try:
+                        self.engine.say(utterance.text)
+                        self.engine.runAndWait()
+                    except Exception as e:
+                        logging.error(f"语音朗读失败: {e}")
+            else:
+                logging.warning("语音引擎未初始化，无法朗读")
+            finished = time.perf_counter()
+            utterance.done.set()
+
+            with self._cond:
+                wait = started - utterance.enqueued
+                synthesis = finished - started
+                self._spoken += 1
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+                self._synth_total += synthesis
+                self._synth_max = max(self._synth_max, synthesis)
+
+    @staticmethod
+    def task_completion_message(task_name: str, next_task_name: str = None) -> str:
+        """任务完成播报的文本"""
+        if next_task_name:
+            return f"任务 {task_name} 已完成。接下来进行：{next_task_name}"
+        return f"任务 {task_name} 已完成。会议结束！"
 
     def announce_task_completion(self, task_name: str, next_task_name: str = None):
         """播报任务完成通知"""
-        if next_task_name:
-            message = f"任务 {task_name} 已完成。接下来进行：{next_task_name}"
-        else:
-            message = f"任务 {task_name} 已完成。会议结束！"
+        message = self.task_completion_message(task_name, next_task_name)
 
-        self.speak(message)
+        # 尚未播出的上一条切换播报已经过时，由本条取代
+        self.speak(message, priority=PRIORITY_HIGH, key=TASK_BOUNDARY_KEY)
         logging.info(f"语音提醒: {message}")
 
     def announce_meeting_start(self, total_tasks: int, total_minutes: int):
@@ -82,7 +402,7 @@ class VoiceService:
             time_str = f"{minutes}分钟"
 
         message = f"会议开始！本次会议共有{total_tasks}个任务，总时长{time_str}。"
-        self.speak(message)
+        self.speak(message, priority=PRIORITY_HIGH)
         logging.info(f"会议开始提醒: {message}")
 
     def announce_break_time(self, break_minutes: int):
@@ -93,7 +413,7 @@ class VoiceService:
     def test_voice(self):
         """测试语音功能"""
         if self.engine:
-            self.speak("语音提醒功能测试成功！")
+            self.speak("语音提醒功能测试成功！", priority=PRIORITY_LOW)
             return True
         else:
             logging.error("语音引擎未就绪")